@@ -23,6 +23,8 @@ class HookListDoc(Directive):
             returned.append(section)
             section.append(nodes.title(text="shakedown.hooks.{0}".format(hook_name)))
             section.append(nodes.paragraph(text=hook.doc))
+            if hook.get_argument_names():
+                section.append(nodes.paragraph(text="Arguments: {0}".format(", ".join(sorted(hook.get_argument_names())))))
         return returned
 
 def setup(app):
@@ -11,7 +11,7 @@ with open(_in_same_dir("shakedown", "__version__.py")) as version_file:
 
 install_requires = [
     "confetti>=2.0.0.dev2",
-    "requests>=1.1.0",
+    "requests>=2.4.0",
     "six",
 ]
 
@@ -1,34 +1,73 @@
+import sys as _sys
 from .__version__ import __version__
-from . import parameters
-from .cleanups import add_cleanup
-from .conf import config
-from .ctx import context
-from .ctx import fixture
-from .runnable_test_factory import RunnableTestFactory
-from .runnable_test import RunnableTest
-# assertions
-from .should import (
-    assert_contains,
-    assert_equal,
-    assert_equals,
-    assert_false,
-    assert_in,
-    assert_is,
-    assert_is_none,
-    assert_is_not,
-    assert_is_not_none,
-    assert_isinstance,
-    assert_not_contain,
-    assert_not_contains,
-    assert_not_equal,
-    assert_not_equals,
-    assert_not_in,
-    assert_not_isinstance,
-    assert_raises,
-    assert_true,
-    )
-from .test import Test
-from .utils import skip_test, skipped
-from .test import abstract_test_class
-import logbook
-logger = logbook.Logger(__name__)
+
+# Public names are resolved on first access, so that ``import shakedown`` (and thus ``shake``) starts quickly.
+# Each name maps to the (relative) module defining it
+_LAZY_ATTRIBUTES = {
+    "add_cleanup" : ".cleanups",
+    "config" : ".conf",
+    "context" : ".ctx",
+    "fixture" : ".ctx",
+    "RunnableTestFactory" : ".runnable_test_factory",
+    "RunnableTest" : ".runnable_test",
+    "run_session" : ".api",
+    # assertions
+    "assert_contains" : ".should",
+    "assert_equal" : ".should",
+    "assert_equals" : ".should",
+    "assert_false" : ".should",
+    "assert_in" : ".should",
+    "assert_is" : ".should",
+    "assert_is_none" : ".should",
+    "assert_is_not" : ".should",
+    "assert_is_not_none" : ".should",
+    "assert_isinstance" : ".should",
+    "assert_not_contain" : ".should",
+    "assert_not_contains" : ".should",
+    "assert_not_equal" : ".should",
+    "assert_not_equals" : ".should",
+    "assert_not_in" : ".should",
+    "assert_not_isinstance" : ".should",
+    "assert_raises" : ".should",
+    "assert_true" : ".should",
+    "Test" : ".test",
+    "abstract_test_class" : ".test",
+    "skip_test" : ".utils",
+    "skipped" : ".utils",
+    "timeout" : ".utils",
+    "uses_resource" : ".utils",
+}
+
+_LAZY_SUBMODULES = frozenset([
+    "api", "checkpoints", "cleanups", "conf", "ctx", "distributed", "exception_handling", "exceptions", "hooks",
+    "loader", "log", "metadata", "parameters", "plugins", "resource_usage", "result", "runner", "scheduling",
+    "session", "should", "site", "test", "time_budget", "timeouts", "utils",
+])
+
+# star-imports export what the package exported before its names were resolved lazily
+__all__ = sorted(_LAZY_ATTRIBUTES) + ["logger", "parameters"]
+
+def __getattr__(name):
+    if name == "logger":
+        import logbook # pylint: disable=F0401
+        returned = logbook.Logger(__name__)
+    elif name in _LAZY_SUBMODULES:
+        returned = _import_relative("." + name)
+    elif name in _LAZY_ATTRIBUTES:
+        returned = getattr(_import_relative(_LAZY_ATTRIBUTES[name]), name)
+    else:
+        raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+    globals()[name] = returned
+    return returned
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | _LAZY_SUBMODULES | set(["logger"]))
+
+def _import_relative(module_name):
+    return __import__(__name__ + module_name, fromlist=[""])
+
+if _sys.version_info < (3, 7):
+    # module-level __getattr__ is not supported, resolve everything up front
+    for _name in sorted(_LAZY_ATTRIBUTES) + ["logger"]:
+        __getattr__(_name)
+    del _name
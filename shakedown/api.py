@@ -0,0 +1,29 @@
+from . import hooks
+from .loader import Loader
+from .runner import run_tests
+from .session import Session
+from .utils import cli_utils
+from .utils.imports import ImportNamespace
+from .utils.reporter import Reporter
+import itertools
+
+def run_session(paths, argv=(), report_stream=None):
+    """
+    Runs the tests found in ``paths`` in a new session, and returns the session once it ended. ``argv`` may contain
+    further command-line options, as accepted by ``shake run`` (e.g. ``["-x", "--with-junit"]``), which only apply
+    to this session. If ``report_stream`` is given, the session's report is written to it.
+
+    Nothing a session loads outlives it: test files are imported into an :class:`ImportNamespace` which is removed
+    from ``sys.modules`` once the session ends, and configuration changes and plugin (de)activations are undone, so
+    that a process can run any number of sessions. Unlike ``shake run``, the site customization is not loaded and
+    plugins are not discovered -- this is left to the embedding process, which should do it once.
+    """
+    with cli_utils.get_cli_environment_context(argv=list(argv)):
+        with ImportNamespace() as namespace:
+            test_loader = Loader(namespace=namespace)
+            with Session() as session:
+                run_tests(itertools.chain.from_iterable(test_loader.iter_runnable_tests(path) for path in paths))
+                hooks.result_summary(session=session)
+        if report_stream is not None:
+            Reporter(report_stream).report_session(session)
+    return session
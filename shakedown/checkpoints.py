@@ -0,0 +1,139 @@
+from .conf import config
+from .metadata import Metadata, get_test_key
+from .result import Result
+from .utils.exception_info import ExceptionInfo
+from .utils.path import ensure_directory
+import json
+import logbook # pylint: disable=F0401
+import os
+
+_logger = logbook.Logger(__name__)
+
+_JOURNAL_FILENAME = "journal"
+
+class Journal(object):
+    """
+    An append-only file recording the outcome of each test of a session as it completes, one JSON object per line.
+    Every line is flushed once written, so the journal survives the session's process being killed
+    """
+    def __init__(self, path, session_id):
+        super(Journal, self).__init__()
+        is_new = not os.path.exists(path)
+        self._file = open(path, "ab+")
+        if is_new:
+            self._write({"session_id" : session_id})
+        elif not self._ends_with_newline():
+            # the process writing the journal was killed in the middle of a line, which must not swallow the next one
+            self._file.write(b"\n")
+            self._file.flush()
+
+    def add(self, result):
+        self._write(summarize_result(result))
+
+    def close(self):
+        self._file.close()
+
+    def _ends_with_newline(self):
+        self._file.seek(0, os.SEEK_END)
+        if self._file.tell() == 0:
+            return True
+        self._file.seek(-1, os.SEEK_END)
+        return self._file.read(1) == b"\n"
+
+    def _write(self, record):
+        self._file.write((json.dumps(record, sort_keys=True) + "\n").encode("utf-8"))
+        self._file.flush()
+
+def get_session_dir(session_id):
+    """
+    Returns the directory in which a session keeps its checkpoint, or None if ``checkpoints.root`` is not set
+    """
+    root = config.root.checkpoints.root
+    if root is None:
+        return None
+    return os.path.join(os.path.expanduser(root), session_id)
+
+def open_journal(session_dir, session_id):
+    ensure_directory(session_dir)
+    return Journal(os.path.join(session_dir, _JOURNAL_FILENAME), session_id)
+
+def read_journal(session_dir):
+    """
+    Returns the id of the session journaled in ``session_dir``, and the latest record of each test, in the order the
+    tests started. A line cut short by the process being killed is ignored
+    """
+    session_id = None
+    records = {}
+    with open(os.path.join(session_dir, _JOURNAL_FILENAME), "rb") as f:
+        for line in f:
+            try:
+                record = json.loads(line.decode("utf-8"))
+            except ValueError:
+                _logger.debug("Ignoring partial journal line {0!r}", line)
+                continue
+            if "session_id" in record:
+                session_id = record["session_id"]
+            else:
+                # tests retried at the end of the session are journaled again
+                records[record["id"]] = record
+    if session_id is None:
+        raise ValueError("No session found in {0}".format(session_dir))
+    return session_id, sorted(records.values(), key=_get_id_index)
+
+def resume_session(session_dir):
+    """
+    Creates a session continuing the one journaled in ``session_dir``: it has the same id, already contains the
+    results of the tests which completed, and does not run them again
+    """
+    from .session import Session
+    session_id, records = read_journal(session_dir)
+    returned = Session(session_id=session_id, checkpoint_dir=session_dir)
+    for record in records:
+        if record["status"] == "incomplete":
+            continue
+        returned.add_resumed_result(get_test_key(record["file"], record["name"]), restore_result(record))
+    returned.id_space.skip_to(max([_get_id_index(record) for record in records] or [0]))
+    return returned
+
+def summarize_result(result):
+    """
+    Returns a JSON-serializable summary of the outcome of a test, from which :func:`restore_result` recreates its
+    result. Tracebacks are not kept
+    """
+    metadata = result.test_metadata
+    return {
+        "id" : metadata.id,
+        "name" : metadata.canonical_name,
+        "file" : metadata.file_path,
+        "status" : result.get_status(),
+        "start_time" : result.start_time,
+        "end_time" : result.end_time,
+        "errors" : [_summarize_exception(info) for info in result.get_errors()],
+        "failures" : [_summarize_exception(info) for info in result.get_failures()],
+        "skips" : [str(reason) for reason in result.get_skips()],
+    }
+
+def restore_result(record):
+    returned = Result(Metadata.restore(record["name"], record["id"], file_path=record["file"]))
+    returned.start_time = record["start_time"]
+    for summary in record["errors"]:
+        returned.add_error(_restore_exception(summary))
+    for summary in record["failures"]:
+        returned.add_failure(_restore_exception(summary))
+    for reason in record["skips"]:
+        returned.add_skip(reason)
+    returned.mark_finished()
+    returned.end_time = record["end_time"]
+    return returned
+
+def _summarize_exception(exception_info):
+    return {"type" : exception_info.exception_type, "message" : exception_info.message,
+            "fingerprint" : exception_info.fingerprint}
+
+def _restore_exception(summary):
+    exception_type = summary["type"]
+    exception_type_name = None if exception_type is None else exception_type.rsplit(".", 1)[-1]
+    return ExceptionInfo(exception_type, exception_type_name, summary["message"], [], summary["fingerprint"])
+
+def _get_id_index(record):
+    return int(record["id"].rsplit(":", 1)[-1])
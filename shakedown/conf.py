@@ -1,6 +1,6 @@
 import logbook
 from confetti import Config
-from .utils.conf_utils import Doc, Cmdline
+from .utils.conf_utils import Doc, Cmdline, parse_duration
 
 __all__ = ["config"]
 
@@ -16,19 +16,84 @@ config = Config({
     },
     "run" : {
         "stop_on_error" : False // Doc("Stop execution when a test doesn't succeed") // Cmdline(on="-x"),
+        "default_timeout_seconds" : None // Doc("Timeout for tests which do not specify their own. Tests running longer are interrupted and marked as errors") // Cmdline(arg="--timeout", arg_type=float),
+        "isolate" : False // Doc("Run each test in a process forked from the session's process") // Cmdline(on="--isolate"),
+        "isolation_batch_size" : 1 // Doc("Number of tests run by each forked process when isolating tests") // Cmdline(arg="--isolation-batch-size", arg_type=int),
+        "concurrency" : 1 // Doc("Number of tests run at once, each in a process forked from the session's process. Tests using the same resources are never run at once beyond the resources' capacities (see shakedown.uses_resource)") // Cmdline(arg="--concurrency", arg_type=int),
+        "retries" : 0 // Doc("Number of times to rerun a test which failed or errored") // Cmdline(arg="--retries", arg_type=int),
+        "retry_at_end" : False // Doc("Rerun failed tests after all other tests ran, rather than immediately") // Cmdline(on="--retry-at-end"),
+        "watch_interval_seconds" : 0.5 // Doc("Time between checks for changed test files in ``shake run --watch``"),
+    },
+    "checkpoints" : {
+        "root" : None // Doc("Directory under which sessions journal their completed tests, each in a subdirectory named after the session id, so that they can be resumed with ``shake run --resume``") // Cmdline(arg="--checkpoint-root"),
+    },
+    "time_budget" : {
+        "seconds" : None // Doc("Only run the tests expected to fit in this time, chosen by their past durations and failure rates (see ``time_budget.history_path``). Tests not started once it is exhausted are skipped. On the command line, accepts durations such as ``90s``, ``10m`` or ``1h``") // Cmdline(arg="--time-budget", arg_type=parse_duration),
+        "history_path" : "~/.shakedown/test_history.json" // Doc("File in which the durations and outcomes of tests are recorded at the end of sessions, for choosing tests under a time budget"),
+        "record_history" : False // Doc("Record the results of every session in ``time_budget.history_path``. Sessions run with a time budget always record their results") // Cmdline(on="--record-history"),
+    },
+    "resource_usage" : {
+        "enabled" : False // Doc("Measure the CPU time, memory, open file descriptors and threads of each test, and report the heaviest tests and the ones leaking resources") // Cmdline(on="--monitor-resources"),
+        "max_fd_growth" : 0 // Doc("Number of file descriptors a test may leave open before it is reported as leaking them"),
+        "max_thread_growth" : 0 // Doc("Number of threads a test may leave running before it is reported as leaking them"),
+        "max_rss_growth_mb" : 100 // Doc("Growth of the resident set size over a test, in megabytes, above which the test is reported as leaking memory"),
+    },
+    "progress" : {
+        "enabled" : True // Doc("Display the progress of the run while tests are running") // Cmdline(off="--no-progress"),
+        "update_interval_seconds" : 0.1 // Doc("Minimum time between progress display updates on a terminal"),
+        "plain_interval_seconds" : 30 // Doc("Time between progress lines when the output is not a terminal"),
+    },
+    "result_files" : {
+        "junit_path" : "shakedown-results.xml" // Doc("File to which the junit plugin writes results"),
+        "json_path" : "shakedown-results.jsonl" // Doc("File to which the json_results plugin writes results, one JSON object per line"),
+    },
+    "results_history" : {
+        "path" : "~/.shakedown/results.db" // Doc("SQLite database in which the results_history plugin records results"),
+        "batch_size" : 1000 // Doc("Number of results the results_history plugin inserts to the database at once"),
+    },
+    "server" : {
+        "socket_path" : "~/.shakedown/server.sock" // Doc("Unix socket on which ``shake serve`` listens, and to which ``shake client`` connects"),
+        "preload_modules" : [] // Doc("Modules imported by ``shake serve`` when it starts, so that runs it serves do not have to import them"),
+    },
+    "distributed" : {
+        "address" : "localhost:7611" // Doc("Address (HOST:PORT) on which ``shake coordinator`` listens, and to which ``shake worker`` connects"),
+        "batch_size" : 5 // Doc("Number of tests handed to a worker at a time"),
+        "max_worker_deaths" : 2 // Doc("Number of workers which may die while running a test before it is recorded as an error, rather than handed to another worker"),
     },
     "notifications" : {
         "prowl_api_key" : None,
         "nma_api_key" : None,
+        "timeout_seconds" : 5 // Doc("Timeout for each request to a notification service"),
+        "max_retries" : 3 // Doc("Number of times to retry sending a notification when the service is unavailable"),
+        "retry_backoff_seconds" : 0.5 // Doc("Delay before the first retry of a notification, doubled for each further retry"),
+        "flush_timeout_seconds" : 10 // Doc("How long to wait for pending notifications to be sent when exiting"),
+    },
+    "tracebacks" : {
+        "capture_locals" : False // Doc("Keep the reprs of local variables in the tracebacks of errors and failures") // Cmdline(on="--capture-locals"),
+        "max_repr_length" : 200 // Doc("Reprs of local variables longer than this are truncated"),
+        "max_locals_size" : 8 * 1024 // Doc("Maximum total length of the local variable reprs kept for each traceback"),
+        "in_report" : True // Doc("Print the traceback of the first exception of each failure group in the report at the end of the run") // Cmdline(off="--no-report-tracebacks"),
     },
     "sentry" : {
         "dsn" : None // Doc("Possible DSN for a sentry service to log swallowed exceptions. "
                             "See http://getsentry.com for details"),
+        "max_reports_per_exception" : 1 // Doc("How many times identical exceptions (same type and origin) are reported to sentry in a session"),
+        "max_reports_per_session" : 100 // Doc("Maximum number of exceptions reported to sentry in a session"),
     },
     "hooks" : {
         "swallow_exceptions" : False // Doc("If set, exceptions inside hooks will be re-raised"),
+        "measure_latency" : False // Doc("Measure the time spent in each plugin's hook callbacks, and include it in the report") // Cmdline(on="--hook-latency"),
+    },
+    "site" : {
+        "cache_dir" : "~/.shakedown/site_cache" // Doc("Directory in which site files loaded from URLs are cached"),
+        "cache_ttl_seconds" : 5 * 60 // Doc("Cached site files younger than this are used without contacting the server"),
+        "connect_timeout_seconds" : 2 // Doc("Timeout for connecting to servers serving site files"),
+        "read_timeout_seconds" : 10 // Doc("Timeout for reading site files from servers"),
     },
     "plugins" : {
         "search_paths" : [] // Doc("List of paths in which to search for plugin modules"),
+        "manifest_cache_path" : "~/.shakedown/plugin_manifests.json" // Doc(
+            "File caching the descriptions of plugins found in search paths, so that they are only imported "
+            "when activated. Set to None to disable caching"),
     },
 })
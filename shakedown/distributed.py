@@ -0,0 +1,289 @@
+from . import hooks
+from .checkpoints import restore_result, summarize_result
+from .loader import Loader
+from .metadata import ensure_shakedown_metadata, get_test_key
+from .runner import run_tests
+from .session import Session
+import collections
+import errno
+import json
+import logbook # pylint: disable=F0401
+import os
+import select
+import socket
+import struct
+
+_logger = logbook.Logger(__name__)
+
+# every message is a JSON object, preceded by its length
+_HEADER = struct.Struct(">I")
+_READ_SIZE = 64 * 1024
+
+_HOOK_IDENTIFIER = "shakedown-distributed-worker"
+
+class DistributedError(Exception):
+    pass
+
+class Coordinator(object):
+    """
+    Hands out tests to :class:`Worker` processes connecting over TCP, in batches of ``batch_size``, and gathers the
+    results they report. Workers load the tests themselves, from the same ``paths`` relative to their working
+    directory, so tests are identified by their file (relative to the working directory) and name.
+
+    Tests a worker did not report when it disconnected are handed to other workers. The test it was running (i.e. the
+    first unreported one) is recorded as an error once workers died running it ``max_worker_deaths`` times
+    """
+    def __init__(self, address, paths, batch_size=5, max_worker_deaths=2):
+        super(Coordinator, self).__init__()
+        self.address = address
+        self._paths = [os.path.relpath(path) if os.path.isabs(path) else path for path in paths]
+        self._batch_size = batch_size
+        self._max_worker_deaths = max_worker_deaths
+        self._listener = None
+
+    def listen(self):
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind(self.address)
+        self._listener.listen(64)
+        # the actual port, if port 0 was given
+        self.address = self._listener.getsockname()[:2]
+
+    def close(self):
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+
+    def iter_results(self, test_results):
+        """
+        Runs the tests of ``(test, result)`` pairs on workers, and yields ``((test, result), received result, None)``
+        tuples as workers report them, or ``((test, result), None, description)`` for tests which could not be run.
+        Tests are handed out by key (see :func:`shakedown.metadata.get_test_key`), so of several tests sharing a key
+        only the first is run
+        """
+        if self._listener is None:
+            self.listen()
+        queue = collections.deque()
+        queued_keys = set()
+        for test, result in test_results:
+            key = _get_key(result.test_metadata)
+            if key in queued_keys:
+                # workers only know tests by their keys, so they could not tell the two apart
+                yield (test, result), None, "Another test has the same key ({0})".format(key)
+                continue
+            queued_keys.add(key)
+            queue.append((key, (test, result)))
+        deaths = collections.defaultdict(int)
+        connections = {}
+        try:
+            while queue or any(conn.batch for conn in connections.values()):
+                if not connections:
+                    _logger.info("Waiting for workers on {0[0]}:{0[1]}...", self.address)
+                for fd in _select_readable([self._listener.fileno()] + list(connections)):
+                    if fd == self._listener.fileno():
+                        sock, peer = self._listener.accept()
+                        _logger.debug("Worker connected from {0[0]}:{0[1]}", peer)
+                        conn = _Connection(sock, name="{0[0]}:{0[1]}".format(peer))
+                        connections[conn.fileno()] = conn
+                        continue
+                    conn = connections[fd]
+                    try:
+                        messages = conn.receive_available()
+                    except DistributedError:
+                        del connections[fd]
+                        conn.close()
+                        for returned in self._handle_death(conn, queue, deaths):
+                            yield returned
+                        continue
+                    for message in messages:
+                        for returned in self._handle_message(conn, message):
+                            yield returned
+                for conn in connections.values():
+                    if conn.waiting and queue:
+                        self._assign(conn, queue)
+            for conn in connections.values():
+                conn.try_send({"type" : "done"})
+        finally:
+            for conn in connections.values():
+                conn.close()
+
+    def _handle_message(self, conn, message):
+        message_type = message["type"]
+        if message_type == "hello":
+            conn.name = message["name"]
+            conn.try_send({"type" : "setup", "paths" : self._paths})
+        elif message_type == "request":
+            conn.waiting = True
+        elif message_type == "result":
+            key = message["key"]
+            conn.reported.add(key)
+            yield conn.batch[key], restore_result(message["result"]), None
+        elif message_type == "batch_done":
+            batch, reported = conn.batch, conn.reported
+            conn.batch, conn.reported = None, set()
+            for key, test_result in batch.items():
+                if key not in reported:
+                    yield test_result, None, "Worker {0} did not run the test".format(conn.name)
+        else:
+            raise DistributedError("Unexpected message type from worker {0}: {1!r}".format(conn.name, message_type))
+
+    def _assign(self, conn, queue):
+        batch = collections.OrderedDict(queue.popleft() for _ in range(min(self._batch_size, len(queue))))
+        _logger.debug("Handing {0} tests to worker {1}", len(batch), conn.name)
+        conn.batch = batch
+        conn.waiting = False
+        conn.try_send({"type" : "batch", "keys" : list(batch)})
+
+    def _handle_death(self, conn, queue, deaths):
+        if not conn.batch:
+            _logger.debug("Worker {0} disconnected", conn.name)
+            return
+        unreported = [(key, test_result) for key, test_result in conn.batch.items() if key not in conn.reported]
+        _logger.warning("Worker {0} disconnected, handing {1} of its tests to other workers", conn.name, len(unreported))
+        if unreported:
+            key, test_result = unreported[0]
+            deaths[key] += 1
+            if deaths[key] >= self._max_worker_deaths:
+                unreported.pop(0)
+                yield test_result, None, "Worker {0} died while running the test".format(conn.name)
+        queue.extendleft(reversed(unreported))
+
+class Worker(object):
+    """
+    Runs tests handed out by a :class:`Coordinator`, in a session of its own, reporting each result as the test ends
+    """
+    def __init__(self, address, name=None):
+        super(Worker, self).__init__()
+        self.address = address
+        self.name = name or "{0}:{1}".format(socket.gethostname(), os.getpid())
+
+    def run(self):
+        """
+        Runs tests until the coordinator has no more, and returns the worker's session
+        """
+        try:
+            sock = socket.create_connection(self.address)
+        except socket.error as e:
+            raise DistributedError("Could not connect to a coordinator on {0[0]}:{0[1]}: {1}".format(self.address, e))
+        conn = _Connection(sock, name="coordinator")
+        try:
+            conn.send({"type" : "hello", "name" : self.name})
+            tests = _load_tests(conn.receive()["paths"])
+            with Session() as session:
+                hooks.test_end.register(lambda result: conn.send({
+                    "type" : "result", "key" : _get_key(result.test_metadata), "result" : summarize_result(result)
+                }), _HOOK_IDENTIFIER)
+                try:
+                    self._run_batches(conn, tests)
+                finally:
+                    hooks.test_end.unregister_by_identifier(_HOOK_IDENTIFIER)
+            return session
+        finally:
+            conn.close()
+
+    def _run_batches(self, conn, tests):
+        while True:
+            conn.send({"type" : "request"})
+            message = conn.receive()
+            if message["type"] == "done":
+                return
+            keys = message["keys"]
+            _logger.debug("Running a batch of {0} tests", len(keys))
+            # tests not found here are reported by the coordinator once the batch is done
+            run_tests([tests[key] for key in keys if key in tests])
+            conn.send({"type" : "batch_done"})
+
+def parse_address(address):
+    """
+    Parses a ``HOST:PORT`` string into a ``(host, port)`` tuple
+    """
+    host, sep, port = address.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError("Invalid address (expected HOST:PORT): {0!r}".format(address))
+    return host or "localhost", int(port)
+
+def _load_tests(paths):
+    returned = {}
+    test_loader = Loader()
+    for path in paths:
+        for test in test_loader.iter_runnable_tests(path):
+            key = _get_key(ensure_shakedown_metadata(test))
+            if key in returned:
+                _logger.debug("Ignoring {0}, loaded already as {1}", test, returned[key])
+                continue
+            returned[key] = test
+    return returned
+
+def _get_key(metadata):
+    # absolute paths differ between hosts, while paths relative to the working directory (e.g. a checkout) do not
+    file_path = None if metadata.file_path is None else os.path.relpath(metadata.file_path)
+    return get_test_key(file_path, metadata.canonical_name)
+
+class _Connection(object):
+    def __init__(self, sock, name):
+        super(_Connection, self).__init__()
+        self.name = name
+        self.waiting = False
+        #: maps keys of the tests handed to the worker to their (test, result) pairs
+        self.batch = None
+        self.reported = set()
+        self._socket = sock
+        self._buffer = b""
+        self._messages = collections.deque()
+
+    def fileno(self):
+        return self._socket.fileno()
+
+    def send(self, message):
+        data = json.dumps(message).encode("utf-8")
+        self._socket.sendall(_HEADER.pack(len(data)) + data)
+
+    def try_send(self, message):
+        # a peer which went away is noticed when reading from it
+        try:
+            self.send(message)
+        except socket.error as e:
+            _logger.debug("Could not send to {0}: {1}", self.name, e)
+
+    def receive(self):
+        while not self._messages:
+            self._read()
+        return self._messages.popleft()
+
+    def receive_available(self):
+        """
+        Reads what the peer sent so far, and returns the complete messages received. Raises :class:`DistributedError`
+        if the peer disconnected
+        """
+        self._read()
+        returned = list(self._messages)
+        self._messages.clear()
+        return returned
+
+    def _read(self):
+        try:
+            data = self._socket.recv(_READ_SIZE)
+        except socket.error as e:
+            if e.errno == errno.EINTR:
+                return
+            data = None
+        if not data:
+            raise DistributedError("Connection to {0} was lost".format(self.name))
+        self._buffer += data
+        while len(self._buffer) >= _HEADER.size:
+            length = _HEADER.unpack(self._buffer[:_HEADER.size])[0]
+            if len(self._buffer) < _HEADER.size + length:
+                break
+            self._messages.append(json.loads(self._buffer[_HEADER.size:_HEADER.size + length].decode("utf-8")))
+            self._buffer = self._buffer[_HEADER.size + length:]
+
+    def close(self):
+        self._socket.close()
+
+def _select_readable(fds):
+    while True:
+        try:
+            return select.select(fds, [], [])[0]
+        except select.error as e:
+            if e.args[0] != errno.EINTR:
+                raise
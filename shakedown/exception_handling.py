@@ -2,20 +2,17 @@ from contextlib import contextmanager
 from .utils.debug import debug_if_needed
 from . import hooks as trigger_hook
 from .conf import config
+from .ctx import context
 import functools
 import logbook
-try:
-    import raven # pylint: disable=F0401
-except ImportError:
-    raven = None
 import sys
 
 _logger = logbook.Logger(__name__)
 
-def trigger_hooks_before_debugger(_):
-    trigger_hook.exception_caught_before_debugger()
-def trigger_hooks_after_debugger(_):
-    trigger_hook.exception_caught_after_debugger()
+def trigger_hooks_before_debugger(exc_info):
+    trigger_hook.exception_caught_before_debugger(exc_info=exc_info)
+def trigger_hooks_after_debugger(exc_info):
+    trigger_hook.exception_caught_after_debugger(exc_info=exc_info)
 
 _EXCEPTION_HANDLERS = [
     trigger_hooks_before_debugger,
@@ -108,11 +105,94 @@ def disable_exception_swallowing(func_or_exception):
             raise
     return func
 
-def capture_sentry_exception():
+def capture_sentry_exception(exc_info=None):
+    """
+    Reports an exception (by default the one currently handled) to Sentry, if configured.
+
+    Within a session, identical exceptions (same type, raised from the same place) are only reported
+    ``sentry.max_reports_per_exception`` times, and at most ``sentry.max_reports_per_session`` exceptions are reported
+    overall.
+    """
+    if exc_info is None:
+        exc_info = sys.exc_info()
     client = get_sentry_client()
-    if client is not None:
-        client.captureException()
+    if client is None:
+        return
+    if not _report_throttle.should_report(context.session, exc_info):
+        _logger.debug("Not reporting exception to sentry (throttled)")
+        return
+    client.captureException(exc_info=exc_info)
+
+_sentry_clients = {}
+_NOT_CREATED = object()
 
 def get_sentry_client():
-    if raven is not None:
-        return raven.Client(config.root.sentry.dsn)
+    """
+    Returns a sentry client for the configured DSN, or None if raven is not installed. Clients are created once per DSN
+    """
+    dsn = config.root.sentry.dsn
+    returned = _sentry_clients.get(dsn, _NOT_CREATED)
+    if returned is _NOT_CREATED:
+        returned = _sentry_clients[dsn] = _create_sentry_client(dsn)
+    return returned
+
+def _create_sentry_client(dsn):
+    raven = _get_raven_module()
+    if raven is None:
+        return None
+    try:
+        from raven.transport.threaded import ThreadedHTTPTransport # pylint: disable=F0401
+    except ImportError:
+        return raven.Client(dsn)
+    # events are queued and sent from a background thread, so reporting does not block the run
+    return raven.Client(dsn, transport=ThreadedHTTPTransport)
+
+_NOT_IMPORTED = object()
+_raven = _NOT_IMPORTED
+
+def _get_raven_module():
+    global _raven # pylint: disable=W0603
+    if _raven is _NOT_IMPORTED:
+        try:
+            import raven # pylint: disable=F0401
+        except ImportError:
+            raven = None
+        _raven = raven
+    return _raven
+
+class _ReportThrottle(object):
+    """
+    Counts the exceptions reported in the current session. Only the counts of a single session are kept
+    """
+    def __init__(self):
+        super(_ReportThrottle, self).__init__()
+        self._session_id = None
+        self._num_reported = 0
+        self._num_reported_by_key = {}
+
+    def should_report(self, session, exc_info):
+        session_id = None if session is None else session.id
+        if session_id != self._session_id:
+            self._session_id = session_id
+            self._num_reported = 0
+            self._num_reported_by_key.clear()
+        sentry_config = config.root.sentry
+        if self._num_reported >= sentry_config.max_reports_per_session:
+            return False
+        key = _get_exception_key(exc_info)
+        num_reported = self._num_reported_by_key.get(key, 0)
+        if num_reported >= sentry_config.max_reports_per_exception:
+            return False
+        self._num_reported_by_key[key] = num_reported + 1
+        self._num_reported += 1
+        return True
+
+_report_throttle = _ReportThrottle()
+
+def _get_exception_key(exc_info):
+    exc_type, _, tb = exc_info
+    location = None
+    while tb is not None:
+        location = (tb.tb_frame.f_code.co_filename, tb.tb_lineno)
+        tb = tb.tb_next
+    return (exc_type, location)
@@ -16,3 +16,17 @@ class SkipTest(Exception):
     def __init__(self, reason="Test skipped"):
         super(SkipTest, self).__init__(reason)
         self.reason = reason
+
+class TestTimedOut(BaseException):
+    """
+    Raised in a test which ran longer than its timeout. It derives from ``BaseException``, so that it is not swallowed
+    by ``except Exception`` clauses in the code being tested
+    """
+    pass
+
+class TestProcessDied(Exception):
+    """
+    Recorded as the error of a test whose process exited or crashed while running it (see ``run.isolate``), or which
+    a distributed worker failed to run (see :mod:`shakedown.distributed`)
+    """
+    pass
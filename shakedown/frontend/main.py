@@ -6,6 +6,11 @@ import sys
 
 _COMMANDS = {
     "run" : "shakedown.frontend.shake_run:shake_run",
+    "results" : "shakedown.frontend.shake_results:shake_results",
+    "serve" : "shakedown.frontend.shake_serve:shake_serve",
+    "client" : "shakedown.frontend.shake_client:shake_client",
+    "coordinator" : "shakedown.frontend.shake_coordinator:shake_coordinator",
+    "worker" : "shakedown.frontend.shake_worker:shake_worker",
     }
 
 parser = argparse.ArgumentParser(
@@ -0,0 +1,32 @@
+from ..conf import config
+from ..utils.server import run_remote, ServerError
+import os
+import sys
+
+_USAGE = """usage: shake client [--socket PATH] [--] ARGS...
+
+Runs ``shake run ARGS...`` on the server started by ``shake serve``
+"""
+
+def shake_client(args):
+    args = list(args)
+    socket_path = config.root.server.socket_path
+    if args[:1] == ["--socket"]:
+        if len(args) < 2:
+            return _usage_error("--socket requires an argument")
+        socket_path = args[1]
+        args = args[2:]
+    if args[:1] == ["--"]:
+        args = args[1:]
+    elif args[:1] in (["-h"], ["--help"]):
+        sys.stdout.write(_USAGE)
+        return 0
+    try:
+        return run_remote(os.path.expanduser(socket_path), args)
+    except ServerError as e:
+        sys.stderr.write("shake client: error: {0}\n".format(e))
+        return 1
+
+def _usage_error(message):
+    sys.stderr.write("{0}\nshake client: error: {1}\n".format(_USAGE, message))
+    return 2
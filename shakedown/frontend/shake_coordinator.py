@@ -0,0 +1,54 @@
+from .. import hooks as trigger_hook
+from .. import plugins
+from .. import site
+from ..conf import config
+from ..distributed import Coordinator, parse_address
+from ..loader import Loader
+from ..runner import run_tests
+from ..session import Session
+from ..utils import cli_utils
+from ..utils.reporter import Reporter
+import itertools
+import sys
+
+def shake_coordinator(args, report_stream=sys.stderr):
+    site.load()
+    plugins.manager.discover()
+    parser = _build_parser()
+    with cli_utils.get_cli_environment_context(argv=args, parser=parser) as args:
+        if not args.paths:
+            parser.error("No tests specified")
+        distributed_config = config.root.distributed
+        try:
+            address = parse_address(args.address or distributed_config.address)
+        except ValueError as e:
+            parser.error(str(e))
+        batch_size = args.batch_size or distributed_config.batch_size
+        coordinator = Coordinator(address, args.paths, batch_size=batch_size,
+                                  max_worker_deaths=distributed_config.max_worker_deaths)
+        coordinator.listen()
+        report_stream.write("Coordinating on {0[0]}:{0[1]}\n".format(coordinator.address))
+        report_stream.flush()
+        try:
+            with Session() as session:
+                test_loader = Loader()
+                run_tests(itertools.chain.from_iterable(test_loader.iter_runnable_tests(path) for path in args.paths),
+                          coordinator=coordinator)
+                trigger_hook.result_summary(session=session)
+        finally:
+            coordinator.close()
+        Reporter(report_stream).report_session(session)
+        if session.result.is_success():
+            return 0
+        return -1
+
+def _build_parser():
+    returned = cli_utils.PluginAwareArgumentParser("shake coordinator",
+                                                   description="Run tests on workers started by ``shake worker``")
+    returned.add_argument("--address", default=None, metavar="HOST:PORT",
+                          help="Address to listen on (default: distributed.address)")
+    returned.add_argument("--batch-size", default=None, type=int,
+                          help="Number of tests handed to a worker at a time (default: distributed.batch_size)")
+    returned.add_argument("paths", metavar="TEST", nargs="*",
+                          help="Test file or directory to run, relative to the working directory of the workers")
+    return returned
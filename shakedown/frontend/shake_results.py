@@ -0,0 +1,67 @@
+from ..conf import config
+from ..utils.formatter import Formatter
+from ..utils.results_db import ResultsDatabase
+import argparse
+import datetime
+import sys
+import time
+
+_SECONDS_PER_DAY = 24 * 60 * 60
+
+def shake_results(args, report_stream=sys.stdout):
+    parser = _build_parser()
+    args = parser.parse_args(args)
+    db = ResultsDatabase(args.db or config.root.results_history.path)
+    try:
+        formatter = Formatter(report_stream)
+        args.func(db, args, formatter)
+        formatter.flush()
+    finally:
+        db.close()
+    return 0
+
+def _show_slower(db, args, formatter):
+    since = time.time() - args.days * _SECONDS_PER_DAY
+    rows = db.get_slower_tests(since, since - args.days * _SECONDS_PER_DAY, limit=args.limit)
+    formatter.writeln("Tests which got slower in the last {0} days:".format(args.days))
+    with formatter.indented(2):
+        for name, previous, recent in rows:
+            formatter.writeln("{0}: {1:.3f}s -> {2:.3f}s".format(name, previous, recent))
+
+def _show_flaky(db, args, formatter):
+    rows = db.get_flaky_tests(time.time() - args.days * _SECONDS_PER_DAY, limit=args.limit)
+    formatter.writeln("Tests which both succeeded and failed in the last {0} days:".format(args.days))
+    with formatter.indented(2):
+        for name, runs, unsuccessful in rows:
+            formatter.writeln("{0}: {1} of {2} runs unsuccessful".format(name, unsuccessful, runs))
+
+def _show_history(db, args, formatter):
+    formatter.writeln("Latest runs of {0}:".format(args.name))
+    with formatter.indented(2):
+        for session_id, status, start_time, duration, _ in db.get_test_history(args.name, limit=args.limit):
+            formatter.writeln("{0} {1} {2} {3}".format(
+                _format_time(start_time), session_id, status, "-" if duration is None else "{0:.3f}s".format(duration)))
+
+def _format_time(timestamp):
+    if timestamp is None:
+        return "-"
+    return datetime.datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+def _build_parser():
+    returned = argparse.ArgumentParser("shake results")
+    returned.add_argument("--db", default=None, help="Results database to query (default: results_history.path)")
+    subparsers = returned.add_subparsers(dest="query")
+    subparsers.required = True
+    for name, func, help_text in [
+            ("slower", _show_slower, "Tests whose average duration grew, compared to the preceding period"),
+            ("flaky", _show_flaky, "Tests which both succeeded and failed"),
+    ]:
+        subparser = subparsers.add_parser(name, help=help_text)
+        subparser.add_argument("--days", type=int, default=30, help="Length of the period to look at")
+        subparser.add_argument("--limit", type=int, default=20, help="Maximum number of tests to show")
+        subparser.set_defaults(func=func)
+    history_parser = subparsers.add_parser("history", help="Latest runs of a test")
+    history_parser.add_argument("name", help="Canonical name of the test")
+    history_parser.add_argument("--limit", type=int, default=20, help="Maximum number of runs to show")
+    history_parser.set_defaults(func=_show_history)
+    return returned
@@ -1,11 +1,20 @@
 from .. import hooks as trigger_hook
+from .. import plugins
 from .. import site
+from ..checkpoints import resume_session
+from ..conf import config
 from ..loader import Loader
 from ..runner import run_tests
 from ..session import Session
+from ..time_budget import RunHistory, TimeBudget
 from ..utils import cli_utils
+from ..utils.imports import unload_file
 from ..utils.interactive import start_interactive_shell
+from ..utils.progress import ProgressReporter
 from ..utils.reporter import Reporter
+from ..utils.watch import FileWatcher
+from contextlib import contextmanager
+import itertools
 import logbook
 import sys
 
@@ -13,26 +22,98 @@ _logger = logbook.Logger(__name__)
 
 def shake_run(args, report_stream=sys.stderr):
     site.load()
+    plugins.manager.discover()
+    return shake_run_preloaded(args, report_stream=report_stream)
+
+def shake_run_preloaded(args, report_stream=None):
+    """
+    Like :func:`shake_run`, for processes which already loaded the site customization and discovered plugins
+    """
+    if report_stream is None:
+        report_stream = sys.stderr
     parser = _build_parser()
     with cli_utils.get_cli_environment_context(argv=args, parser=parser) as args:
+        if not args.paths and not args.interactive:
+            parser.error("No tests specified")
+        if args.watch and not args.paths:
+            parser.error("No paths to watch")
         test_loader = Loader()
-        with Session() as session:
-            if not args.paths and not args.interactive:
-                parser.error("No tests specified")
-            if args.interactive:
-                start_interactive_shell()
-            for path in args.paths:
-                run_tests(test_loader.iter_runnable_tests(path))
-            trigger_hook.result_summary()
-        Reporter(report_stream).report_session(session)
+        session = _run_session(test_loader, args.paths, report_stream, interactive=args.interactive,
+                               resume_dir=args.resume)
+        if args.watch:
+            session = _watch(test_loader, args.paths, report_stream) or session
         if session.result.is_success():
             return 0
         return -1
 
+def _run_session(test_loader, paths, report_stream, interactive=False, resume_dir=None):
+    session = Session() if resume_dir is None else resume_session(resume_dir)
+    budget_config = config.root.time_budget
+    history = time_budget = None
+    if budget_config.seconds is not None or budget_config.record_history:
+        history = RunHistory(budget_config.history_path)
+    if budget_config.seconds is not None:
+        time_budget = TimeBudget(budget_config.seconds, history)
+    with session:
+        if interactive:
+            start_interactive_shell()
+        # tests are run as they are collected, so the total is only known when selecting tests for a time budget
+        tests = itertools.chain.from_iterable(test_loader.iter_runnable_tests(path) for path in paths)
+        total = None
+        if time_budget is not None:
+            tests = time_budget.select(tests)
+            total = len(tests)
+        with _get_progress_context(report_stream, total):
+            run_tests(tests if time_budget is None else time_budget.iter_within_budget(tests))
+        trigger_hook.result_summary(session=session)
+    if history is not None:
+        history.update(session.iter_results())
+        history.save()
+    Reporter(report_stream).report_session(session, time_budget=time_budget)
+    return session
+
+def _watch(test_loader, paths, report_stream):
+    """
+    Reruns the tests of each file changed under ``paths`` in a new session, until interrupted. Only the changed files
+    are reimported, all other modules stay loaded. Returns the last session run, if any
+    """
+    returned = None
+    watcher = FileWatcher(paths, interval=config.root.run.watch_interval_seconds)
+    report_stream.write("Watching for changes...\n")
+    try:
+        for changed_paths in watcher.iter_changes():
+            for path in changed_paths:
+                unload_file(path)
+            try:
+                returned = _run_session(test_loader, changed_paths, report_stream)
+            except Exception: # pylint: disable=W0703
+                # e.g. a syntax error in a file being edited
+                _logger.error("Could not run tests of {0}", ", ".join(changed_paths), exc_info=sys.exc_info())
+            report_stream.write("Watching for changes...\n")
+    except KeyboardInterrupt:
+        pass
+    return returned
+
+def _get_progress_context(stream, total):
+    progress_config = config.root.progress
+    if not progress_config.enabled:
+        return _null_context()
+    return ProgressReporter(stream, total=total, update_interval=progress_config.update_interval_seconds,
+                            plain_interval=progress_config.plain_interval_seconds)
+
+@contextmanager
+def _null_context():
+    yield
+
 def _build_parser():
     returned = cli_utils.PluginAwareArgumentParser("shake run")
     returned.add_argument("-i", "--interactive", help="Enter an interactive shell before running tests",
                           action="store_true", default=False)
+    returned.add_argument("-w", "--watch", help="Keep running, and rerun the tests of test files once they change",
+                          action="store_true", default=False)
+    returned.add_argument("--resume", metavar="SESSION_DIR", default=None,
+                          help="Continue the session checkpointed in SESSION_DIR (see checkpoints.root), "
+                          "skipping the tests it already completed")
     returned.add_argument("paths", metavar="TEST", nargs="*",
                           help="Test name to run. This can be either a file or a test FQDN. "
                           "See documentation for details")
@@ -0,0 +1,46 @@
+from .. import plugins
+from .. import site
+from ..conf import config
+from ..utils.server import Server
+from .shake_run import shake_run_preloaded
+import argparse
+import logbook
+import os
+import signal
+import sys
+
+_logger = logbook.Logger(__name__)
+
+def shake_serve(args, report_stream=sys.stderr):
+    parser = _build_parser()
+    args = parser.parse_args(args)
+    site.load()
+    plugins.manager.discover()
+    for module_name in list(config.root.server.preload_modules) + args.preload:
+        _logger.debug("Preloading {0}", module_name)
+        __import__(module_name)
+    socket_path = os.path.expanduser(args.socket or config.root.server.socket_path)
+    socket_dir = os.path.dirname(socket_path)
+    if socket_dir and not os.path.isdir(socket_dir):
+        os.makedirs(socket_dir)
+    server = Server(socket_path, shake_run_preloaded)
+    server.listen()
+    signal.signal(signal.SIGTERM, _exit_on_signal)
+    report_stream.write("Serving on {0}\n".format(socket_path))
+    report_stream.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+def _exit_on_signal(*_):
+    sys.exit(0)
+
+def _build_parser():
+    returned = argparse.ArgumentParser("shake serve", description="Serve run requests sent by ``shake client``")
+    returned.add_argument("--socket", default=None, help="Unix socket to listen on (default: server.socket_path)")
+    returned.add_argument("--preload", action="append", default=[], metavar="MODULE",
+                          help="Module to import on startup, in addition to server.preload_modules. "
+                          "Can be specified multiple times")
+    return returned
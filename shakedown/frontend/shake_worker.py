@@ -0,0 +1,29 @@
+from .. import plugins
+from .. import site
+from ..conf import config
+from ..distributed import DistributedError, parse_address, Worker
+from ..utils import cli_utils
+import sys
+
+def shake_worker(args, report_stream=sys.stderr):
+    site.load()
+    plugins.manager.discover()
+    parser = _build_parser()
+    with cli_utils.get_cli_environment_context(argv=args, parser=parser) as args:
+        try:
+            address = parse_address(args.address or config.root.distributed.address)
+        except ValueError as e:
+            parser.error(str(e))
+        try:
+            Worker(address).run()
+        except DistributedError as e:
+            report_stream.write("shake worker: error: {0}\n".format(e))
+            return 1
+        return 0
+
+def _build_parser():
+    returned = cli_utils.PluginAwareArgumentParser("shake worker",
+                                                   description="Run tests handed out by ``shake coordinator``")
+    returned.add_argument("--address", default=None, metavar="HOST:PORT",
+                          help="Address of the coordinator (default: distributed.address)")
+    return returned
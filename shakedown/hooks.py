@@ -1,22 +1,24 @@
 from .utils.callback import Callback
 import six
 
-session_start = Callback(doc="Called right after session starts")
-session_end   = Callback(doc="Called right before the session ends, regardless of the reason for termination")
+session_start = Callback(["session"], doc="Called right after session starts")
+session_end   = Callback(["session"], doc="Called right before the session ends, regardless of the reason for termination")
 
-test_start   = Callback(doc="Called right after a test starts")
-test_end     = Callback(doc="Called right before a test ends, regardless of the reason for termination")
-test_success = Callback(doc="Called on test success")
-test_error   = Callback(doc="Called on test error")
-test_failure = Callback(doc="Called on test failure")
-test_skip    = Callback(doc="Called on test skip")
+test_start   = Callback(["test", "result"], doc="Called right after a test starts")
+test_end     = Callback(["test", "result"], doc="Called right before a test ends, regardless of the reason for termination")
+test_success = Callback(["test", "result"], doc="Called on test success")
+test_error   = Callback(["test", "result"], doc="Called on test error")
+test_failure = Callback(["test", "result"], doc="Called on test failure")
+test_skip    = Callback(["test", "result"], doc="Called on test skip")
 
-result_summary = Callback(doc="Called at the end of the execution, when printing results")
+result_summary = Callback(["session"], doc="Called at the end of the execution, when printing results")
 
 exception_caught_before_debugger = Callback(
+    ["exc_info"],
     doc="Called whenever an exception is caught, but a debugger hasn't been entered yet"
 )
 exception_caught_after_debugger = Callback(
+    ["exc_info"],
     doc="Called whenever an exception is caught, and a debugger has already been run"
 )
 
@@ -25,3 +27,18 @@ def get_all_hooks():
         if not isinstance(callback, Callback):
             continue
         yield name, callback
+
+def get_latencies():
+    """
+    Returns a dict mapping (hook name, identifier) pairs to the :class:`shakedown.utils.callback.HookLatency` of the
+    callbacks registered under that identifier. For plugins, the identifier is the plugin name.
+    """
+    returned = {}
+    for hook_name, hook in get_all_hooks():
+        for identifier, latency in six.iteritems(hook.get_latencies()):
+            returned[hook_name, identifier] = latency
+    return returned
+
+def reset_latencies():
+    for _, hook in get_all_hooks():
+        hook.reset_latencies()
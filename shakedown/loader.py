@@ -8,15 +8,20 @@ _logger = Logger(__name__)
 
 class Loader(object):
     """
-    A class responsible for finding runnable tests in a path
+    A class responsible for finding runnable tests in a path. Test files are imported into ``namespace`` (see
+    :class:`shakedown.utils.imports.ImportNamespace`), if given
     """
+    def __init__(self, namespace=None):
+        super(Loader, self).__init__()
+        self._namespace = namespace
+
     def iter_runnable_tests(self, path):
         for file_path in _walk(path):
             _logger.debug("Checking {0}", file_path)
             if not self._is_file_wanted(file_path):
                 _logger.debug("{0} is not wanted. Skipping...", file_path)
                 continue
-            module = import_file(file_path)
+            module = import_file(file_path, namespace=self._namespace)
             for runnable in self._iter_runnable_tests_in_module(module):
                 yield runnable
 
@@ -20,15 +20,26 @@ def get_session_logging_context():
         with _get_console_handler():
             yield
 
+def get_test_log_path():
+    """
+    Returns the path of the current test's log file, or None if logs are not written to files
+    """
+    return _get_log_path(config.root.log.subpath)
+
+def _get_log_path(subpath):
+    root_path = config.root.log.root
+    if root_path is None:
+        return None
+    return os.path.join(root_path, subpath.format(context=context))
+
 def _get_console_handler():
     return logbook.StreamHandler(sys.stderr, bubble=True, level=config.root.log.console_level)
 
 def _get_file_log_handler(subpath):
-    root_path = config.root.log.root
-    if root_path is None:
+    log_path = _get_log_path(subpath)
+    if log_path is None:
         handler = logbook.NullHandler(bubble=False)
     else:
-        log_path = os.path.join(root_path, subpath.format(context=context))
         ensure_containing_directory(log_path)
         handler = logbook.FileHandler(log_path, bubble=False)
     return handler
@@ -1,14 +1,49 @@
+import os
+import re
+import sys
+
+# test modules are imported into synthetic packages (see shakedown.utils.imports), whose names differ between runs
+_SYNTHETIC_PACKAGE_PREFIX = re.compile(r"^_\d+\.")
+
 class Metadata(object):
     def __init__(self, test):
         super(Metadata, self).__init__()
         # we don't keep a copy of the test itself. The metadata should be preserved
         # separately, saving memory for very large runs
         self.canonical_name = test.get_canonical_name()
+        self.file_path = _get_test_file_path(test)
+    @classmethod
+    def restore(cls, canonical_name, id, file_path=None): # pylint: disable=W0622
+        """
+        Recreates the metadata of a test which ran in another process (see :func:`shakedown.checkpoints.resume_session`)
+        """
+        returned = cls.__new__(cls)
+        returned.canonical_name = canonical_name
+        returned.file_path = file_path
+        returned.id = id # pylint: disable=W0201
+        return returned
+    def get_key(self):
+        return get_test_key(self.file_path, self.canonical_name)
     def __repr__(self):
         return self.canonical_name
 
+def get_test_key(file_path, canonical_name):
+    """
+    Returns a key identifying a test across processes, unlike its canonical name which includes the name of the
+    synthetic package its module was imported into
+    """
+    return "{0}:{1}".format(file_path, _SYNTHETIC_PACKAGE_PREFIX.sub("", canonical_name))
+
 def ensure_shakedown_metadata(test):
     returned = getattr(test, "__shakedown__", None)
     if returned is None:
         returned = test.__shakedown__ = Metadata(test)
     return returned
+
+def _get_test_file_path(test):
+    file_path = getattr(sys.modules.get(type(test).__module__), "__file__", None)
+    if file_path is None:
+        return None
+    if file_path.endswith((".pyc", ".pyo")):
+        file_path = file_path[:-1]
+    return os.path.abspath(file_path)
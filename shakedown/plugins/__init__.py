@@ -2,10 +2,13 @@ import argparse
 from contextlib import contextmanager
 import os
 from .interface import PluginInterface
+from .manifest import LazyPlugin, ManifestCache, PluginManifest
+from .builtin import BUILTIN_PLUGIN_MANIFESTS
 from .. import hooks
 from ..conf import config
 from ..utils.imports import import_file
 from six import iteritems, itervalues
+from weakref import WeakKeyDictionary
 
 _SKIPPED_PLUGIN_METHOD_NAMES = set(dir(PluginInterface))
 
@@ -21,22 +24,48 @@ class PluginManager(object):
 
     def discover(self):
         """
-        Iterates over all search paths and loads plugins
+        Iterates over all search paths and installs the plugins found in them.
+
+        Files are only imported if they are not described by the manifest cache (see ``plugins.manifest_cache_path``),
+        otherwise their plugins are installed lazily, and are only imported once activated.
         """
-        for search_path in config.root.plugins.search_paths:
+        search_paths = config.root.plugins.search_paths
+        if not search_paths:
+            return
+        cache = ManifestCache(_get_manifest_cache_path())
+        for search_path in search_paths:
             for path, _, filenames in os.walk(search_path):
                 for filename in filenames:
                     if not filename.endswith(".py"):
                         continue
-                    module = import_file(os.path.join(path, filename))
-                    install_func = getattr(module, "install_plugins", None)
-                    if install_func is None:
-                        continue
-                    install_func()
+                    file_path = os.path.abspath(os.path.join(path, filename))
+                    manifests = cache.get(file_path)
+                    if manifests is None:
+                        manifests = self._scan_plugin_file(file_path)
+                        cache.set(file_path, manifests)
+                    for manifest in manifests:
+                        self.install_manifest(manifest)
+        cache.save()
+
+    def _scan_plugin_file(self, file_path):
+        prev_installed = self._installed.copy()
+        self._import_plugin_file(file_path)
+        return [
+            _get_plugin_manifest(plugin, file_path)
+            for plugin_name, plugin in iteritems(self._installed)
+            if prev_installed.get(plugin_name) is not plugin
+        ]
+
+    def _import_plugin_file(self, file_path):
+        module = import_file(file_path)
+        install_func = getattr(module, "install_plugins", None)
+        if install_func is not None:
+            install_func()
 
     def get_installed_plugins(self):
         """
-        Returns a dict mapping plugin names to currently installed plugins
+        Returns a dict mapping plugin names to currently installed plugins. Plugins which were not imported yet
+        are represented by :class:`shakedown.plugins.manifest.LazyPlugin` objects.
         """
         return self._installed.copy()
 
@@ -52,9 +81,9 @@ class PluginManager(object):
 
     def get_plugin(self, plugin_name):
         """
-        Retrieves a registered plugin by name, or raises a LookupError
+        Retrieves a registered plugin by name, or raises a LookupError. Lazily installed plugins are imported
         """
-        return self._installed[plugin_name]
+        return self._load_plugin(self._installed[plugin_name])
 
     def install(self, plugin, activate=False):
         """
@@ -68,20 +97,32 @@ class PluginManager(object):
         if activate:
             self.activate(plugin_name)
 
+    def install_manifest(self, manifest):
+        """
+        Installs a plugin described by a :class:`shakedown.plugins.manifest.PluginManifest`, without importing it.
+        The plugin's code is imported only when it is activated (or retrieved by :func:`get_plugin`).
+        Plugins which are already installed under the same name are left untouched.
+        """
+        if manifest.name not in self._installed:
+            self._installed[manifest.name] = LazyPlugin(manifest)
+
     def install_builtin_plugins(self):
-        for builtin_plugin_module in self._iter_builtin_plugin_modules():
-            module = __import__(
-                "shakedown.plugins.builtin.{0}".format(builtin_plugin_module),
-                fromlist=[""]
-            )
+        for manifest in BUILTIN_PLUGIN_MANIFESTS:
+            self.install_manifest(manifest)
+
+    def _load_plugin(self, plugin):
+        if not isinstance(plugin, LazyPlugin):
+            return plugin
+        manifest = plugin.manifest
+        if manifest.is_file():
+            self._import_plugin_file(manifest.module)
+        else:
+            module = __import__(manifest.module, fromlist=[""])
             self.install(module.Plugin())
-
-    def _iter_builtin_plugin_modules(self):
-        builtin_dir = os.path.join(os.path.dirname(__file__), "builtin")
-        for filename in os.listdir(builtin_dir):
-            if filename.startswith("_") or filename.startswith(".") or not filename.endswith(".py"):
-                continue
-            yield filename[:-3]
+        returned = self._installed.get(manifest.name)
+        if returned is None or isinstance(returned, LazyPlugin):
+            raise IncompatiblePlugin("{0} did not install plugin {1!r}".format(manifest.module, manifest.name))
+        return returned
 
     def uninstall(self, plugin):
         """
@@ -106,7 +147,7 @@ class PluginManager(object):
 
         :param plugin: either a plugin object or a plugin name
         """
-        plugin = self._get_installed_plugin(plugin)
+        plugin = self._load_plugin(self._get_installed_plugin(plugin))
         plugin_name = plugin.get_name()
         for hook, callback in self._get_plugin_registrations(plugin):
             hook.register(callback, plugin_name)
@@ -120,6 +161,9 @@ class PluginManager(object):
         """
         plugin = self._get_installed_plugin(plugin)
         plugin_name = plugin.get_name()
+        if isinstance(plugin, LazyPlugin):
+            # never imported, so never activated
+            return
         for hook, _ in self._get_plugin_registrations(plugin):
             hook.unregister_by_identifier(plugin_name)
         self._active.discard(plugin_name)
@@ -135,21 +179,47 @@ class PluginManager(object):
         return plugin
 
     def _get_plugin_registrations(self, plugin):
-        returned = []
-        unknown = []
-        for hook_name in dir(type(plugin)):
-            if hook_name in _SKIPPED_PLUGIN_METHOD_NAMES:
-                continue
-            if hook_name.startswith("_"):
-                continue
-            hook = getattr(hooks, hook_name, None)
-            if hook is None:
-                unknown.append(hook_name)
-                continue
-            assert hook is not None
-            returned.append((hook, getattr(plugin, hook_name)))
-        if unknown:
-            raise IncompatiblePlugin("Unknown hooks: {0}".format(", ".join(unknown)))
-        return returned
+        return [(hook, getattr(plugin, hook_name)) for hook, hook_name in _get_registration_table(type(plugin))]
+
+_registration_tables = WeakKeyDictionary()
+
+def _get_registration_table(plugin_class):
+    """
+    Returns a list of (hook, method name) pairs for the hook methods of a plugin class. Computed once per class
+    """
+    returned = _registration_tables.get(plugin_class)
+    if returned is None:
+        returned = _registration_tables[plugin_class] = _build_registration_table(plugin_class)
+    return returned
+
+def _build_registration_table(plugin_class):
+    returned = []
+    unknown = []
+    for hook_name in _iter_hook_names(plugin_class):
+        hook = getattr(hooks, hook_name, None)
+        if hook is None:
+            unknown.append(hook_name)
+            continue
+        returned.append((hook, hook_name))
+    if unknown:
+        raise IncompatiblePlugin("Unknown hooks: {0}".format(", ".join(unknown)))
+    return tuple(returned)
+
+def _iter_hook_names(plugin_class):
+    for hook_name in dir(plugin_class):
+        if hook_name in _SKIPPED_PLUGIN_METHOD_NAMES:
+            continue
+        if hook_name.startswith("_"):
+            continue
+        yield hook_name
+
+def _get_plugin_manifest(plugin, module):
+    return PluginManifest(plugin.get_name(), module, description=plugin.get_description())
+
+def _get_manifest_cache_path():
+    path = config.root.plugins.manifest_cache_path
+    if path is not None:
+        path = os.path.expanduser(path)
+    return path
 
 manager = PluginManager()
@@ -1 +1,11 @@
+from ..manifest import PluginManifest
 
+# Builtin plugins are installed by the plugin manager's constructor, so they are described here rather than imported.
+# Each module named here must expose a ``Plugin`` class matching its manifest
+BUILTIN_PLUGIN_MANIFESTS = [
+    PluginManifest("notifications", __name__ + ".notifications"),
+    PluginManifest("junit", __name__ + ".junit", description="Write results to a JUnit XML file"),
+    PluginManifest("json_results", __name__ + ".json_results", description="Write results to a JSON-lines file"),
+    PluginManifest("results_history", __name__ + ".results_history",
+                   description="Record results in a database for use with shake results"),
+]
@@ -0,0 +1,24 @@
+from ..interface import PluginInterface
+from ...conf import config
+from ...utils.result_writers import JSONLinesResultWriter
+
+class Plugin(PluginInterface):
+    """
+    Writes results to a JSON-lines file (``result_files.json_path``), one line per test, as tests end
+    """
+    def __init__(self):
+        super(Plugin, self).__init__()
+        self._writer = None
+    def get_name(self):
+        return "json_results"
+    def get_description(self):
+        return "Write results to a JSON-lines file"
+    def session_start(self, session):
+        self._writer = JSONLinesResultWriter(config.root.result_files.json_path, session.id)
+    def test_end(self, result):
+        if self._writer is not None:
+            self._writer.add_result(result)
+    def session_end(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
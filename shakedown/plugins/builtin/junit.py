@@ -0,0 +1,24 @@
+from ..interface import PluginInterface
+from ...conf import config
+from ...utils.result_writers import JUnitXMLResultWriter
+
+class Plugin(PluginInterface):
+    """
+    Writes results to a JUnit XML file (``result_files.junit_path``) as tests end
+    """
+    def __init__(self):
+        super(Plugin, self).__init__()
+        self._writer = None
+    def get_name(self):
+        return "junit"
+    def get_description(self):
+        return "Write results to a JUnit XML file"
+    def session_start(self):
+        self._writer = JUnitXMLResultWriter(config.root.result_files.junit_path)
+    def test_end(self, result):
+        if self._writer is not None:
+            self._writer.add_result(result)
+    def session_end(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
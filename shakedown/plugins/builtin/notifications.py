@@ -1,19 +1,78 @@
 from ..interface import PluginInterface
 from ...conf import config
-from ...ctx import session
-import requests
+from ...utils.background import BackgroundWorker
+from logbook import Logger # pylint: disable=F0401
+import atexit
+import time
+
+_logger = Logger(__name__)
+
+# (url, name of the api key configuration value)
+_SERVICES = [
+    ("https://prowl.weks.net/publicapi/add", "prowl_api_key"),
+    ("https://www.notifymyandroid.com/publicapi/notify", "nma_api_key"),
+]
 
 class Plugin(PluginInterface):
     def get_name(self):
         return "notifications"
-    def session_end(self):
+    def session_end(self, session):
         self._notify("Session Ended", "Session {0} ended".format(session.id))
     def _notify(self, title, message):
-        for url, api_key in [
-                ("https://prowl.weks.net/publicapi/add", config.root.notifications.prowl_api_key),
-                ("https://www.notifymyandroid.com/publicapi/notify", config.root.notifications.nma_api_key),
-                ]:
+        notifications_config = config.root.notifications
+        for url, api_key_name in _SERVICES:
+            api_key = getattr(notifications_config, api_key_name)
             if api_key is None:
                 continue
-            resp = requests.post(url, {"apikey": api_key, "application": "shakedown", "event": title, "description": message})
-            resp.raise_for_status()
+            _get_sender().submit(
+                _post, url, {"apikey": api_key, "application": "shakedown", "event": title, "description": message},
+                timeout=notifications_config.timeout_seconds,
+                max_retries=notifications_config.max_retries,
+                retry_backoff_seconds=notifications_config.retry_backoff_seconds,
+            )
+
+_sender = None
+_http_session = None
+
+def _get_sender():
+    global _sender # pylint: disable=W0603
+    if _sender is None:
+        _sender = BackgroundWorker("shakedown-notifications")
+        atexit.register(flush)
+    return _sender
+
+def flush(timeout=None):
+    """
+    Waits for pending notifications to be delivered, for at most ``timeout`` seconds (by default
+    ``notifications.flush_timeout_seconds``). Called automatically when the process exits.
+    """
+    if _sender is None:
+        return True
+    if timeout is None:
+        timeout = config.root.notifications.flush_timeout_seconds
+    returned = _sender.flush(timeout)
+    if not returned:
+        _logger.warning("Timed out waiting for notifications to be delivered")
+    return returned
+
+def _get_http_session():
+    # only used from the sender thread, so that its connections are pooled across notifications
+    global _http_session # pylint: disable=W0603
+    if _http_session is None:
+        import requests # pylint: disable=F0401
+        _http_session = requests.Session()
+    return _http_session
+
+def _post(url, data, timeout, max_retries, retry_backoff_seconds):
+    import requests # pylint: disable=F0401
+    for attempt in range(max_retries + 1):
+        try:
+            response = _get_http_session().post(url, data, timeout=timeout)
+            response.raise_for_status()
+            return
+        except requests.RequestException as e:
+            response = getattr(e, "response", None)
+            if attempt == max_retries or (response is not None and response.status_code < 500):
+                _logger.warning("Could not send notification to {0}", url, exc_info=True)
+                return
+            time.sleep(retry_backoff_seconds * (2 ** attempt))
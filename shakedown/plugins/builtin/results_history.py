@@ -0,0 +1,45 @@
+from ..interface import PluginInterface
+from ...conf import config
+from ...utils.results_db import ResultsDatabase
+import time
+
+class Plugin(PluginInterface):
+    """
+    Records sessions and results in a SQLite database (``results_history.path``), queried by ``shake results``.
+    Results are inserted in batches, so the cost per test is only that of keeping a row in memory
+    """
+    def __init__(self):
+        super(Plugin, self).__init__()
+        self._db = None
+        self._session_id = None
+        self._pending = []
+    def get_name(self):
+        return "results_history"
+    def get_description(self):
+        return "Record results in a database for use with shake results"
+    def session_start(self, session):
+        self._db = ResultsDatabase(config.root.results_history.path)
+        self._session_id = session.id
+        self._db.add_session(session.id, time.time())
+    def test_end(self, result):
+        if self._db is None:
+            return
+        fingerprint = next((fingerprint for fingerprint, _ in result.iter_fingerprinted_exceptions()), None)
+        # canonical names include the synthetic package test files are imported into, which differs between sessions
+        self._pending.append((self._session_id, result.test_metadata.get_key(), result.get_status(),
+                              result.start_time, result.get_duration(), fingerprint))
+        if len(self._pending) >= config.root.results_history.batch_size:
+            self._flush()
+    def session_end(self):
+        if self._db is None:
+            return
+        try:
+            self._flush()
+            self._db.end_session(self._session_id, time.time())
+        finally:
+            self._db.close()
+            self._db = None
+    def _flush(self):
+        if self._pending:
+            self._db.add_results(self._pending)
+            self._pending = []
@@ -0,0 +1,107 @@
+import json
+import os
+from logbook import Logger # pylint: disable=F0401
+from .interface import PluginInterface
+from ..utils.path import ensure_containing_directory
+
+_logger = Logger(__name__)
+
+class PluginManifest(object):
+    """
+    Describes a plugin without having to import its code.
+
+    ``module`` is either a dotted module name exposing a ``Plugin`` class (as builtin plugins do), or a path to a
+    python file with an ``install_plugins`` function (as plugins found in search paths do).
+    """
+    def __init__(self, name, module, description=None):
+        super(PluginManifest, self).__init__()
+        self.name = name
+        self.module = module
+        self.description = description
+    def is_file(self):
+        return self.module.endswith(".py")
+    def to_dict(self):
+        return {"name" : self.name, "module" : self.module, "description" : self.description}
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d["name"], d["module"], description=d.get("description"))
+    def __eq__(self, other):
+        return isinstance(other, PluginManifest) and self.to_dict() == other.to_dict()
+    def __ne__(self, other):
+        return not self == other
+    def __repr__(self):
+        return "<Plugin manifest {0} ({1})>".format(self.name, self.module)
+
+class LazyPlugin(PluginInterface):
+    """
+    Stands in for an installed plugin whose code was not imported yet. The plugin manager replaces it with the
+    actual plugin once it gets activated.
+    """
+    def __init__(self, manifest):
+        super(LazyPlugin, self).__init__()
+        self.manifest = manifest
+    def get_name(self):
+        return self.manifest.name
+    def get_description(self):
+        return self.manifest.description
+    def __repr__(self):
+        return "<Lazy plugin {0}>".format(self.manifest.name)
+
+class ManifestCache(object):
+    """
+    Stores the manifests of plugins found in files, keyed by file path. Entries are invalidated whenever the file's
+    modification time or size change.
+    """
+    _FORMAT_VERSION = 1
+
+    def __init__(self, path):
+        super(ManifestCache, self).__init__()
+        self._path = path
+        self._entries = self._load()
+        self._dirty = False
+
+    def get(self, filename):
+        """
+        Returns the list of manifests for plugins installed by ``filename``, or None if not cached
+        """
+        entry = self._entries.get(filename)
+        if entry is None or entry["stat"] != _get_stat_key(filename):
+            return None
+        return [PluginManifest.from_dict(d) for d in entry["plugins"]]
+
+    def set(self, filename, manifests):
+        self._entries[filename] = {
+            "stat" : _get_stat_key(filename),
+            "plugins" : [manifest.to_dict() for manifest in manifests],
+        }
+        self._dirty = True
+
+    def save(self):
+        if not self._dirty or self._path is None:
+            return
+        try:
+            ensure_containing_directory(self._path)
+            tmp_path = "{0}.{1}.tmp".format(self._path, os.getpid())
+            with open(tmp_path, "w") as f:
+                json.dump({"version" : self._FORMAT_VERSION, "files" : self._entries}, f)
+            getattr(os, "replace", os.rename)(tmp_path, self._path)
+        except (IOError, OSError):
+            _logger.warning("Could not save plugin manifest cache to {0}", self._path, exc_info=True)
+        else:
+            self._dirty = False
+
+    def _load(self):
+        if self._path is None:
+            return {}
+        try:
+            with open(self._path) as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != self._FORMAT_VERSION:
+            return {}
+        return data.get("files", {})
+
+def _get_stat_key(filename):
+    stat = os.stat(filename)
+    return [stat.st_mtime, stat.st_size]
@@ -0,0 +1,115 @@
+from .conf import config
+from .utils.background import is_internal_thread
+from contextlib import contextmanager
+import os
+import threading
+
+try:
+    import resource
+except ImportError: # pragma: no cover
+    resource = None # Windows
+
+# resource.getrusage fields whose change over a test is recorded
+_RUSAGE_FIELDS = ("ru_utime", "ru_stime", "ru_minflt", "ru_majflt", "ru_inblock", "ru_oublock", "ru_nvcsw", "ru_nivcsw")
+
+_FD_DIRS = ("/proc/self/fd", "/dev/fd")
+
+class ResourceUsage(object):
+    """
+    The resources a test used while running (see ``resource_usage.enabled``). Figures which cannot be measured on the
+    current platform are None
+    """
+    def __init__(self):
+        super(ResourceUsage, self).__init__()
+        #: maps ``resource.getrusage`` field names (e.g. ``ru_utime``) to their change while the test ran
+        self.rusage = {}
+        self.rss_before = self.rss_after = None
+        self.fds_before = self.fds_after = None
+        self.threads_before = self.threads_after = None
+        #: descriptions of the leaks exceeding the ``resource_usage`` thresholds
+        self.leaks = []
+
+    def get_cpu_seconds(self):
+        if not self.rusage:
+            return None
+        return self.rusage["ru_utime"] + self.rusage["ru_stime"]
+
+    def get_rss_growth(self):
+        return _get_growth(self.rss_before, self.rss_after)
+
+    def get_fd_growth(self):
+        return _get_growth(self.fds_before, self.fds_after)
+
+    def get_thread_growth(self):
+        return _get_growth(self.threads_before, self.threads_after)
+
+@contextmanager
+def measure_resource_usage():
+    """
+    Measures the resources used by the code run in the context, yielding a :class:`ResourceUsage` which is filled in
+    once the context exits
+    """
+    returned = ResourceUsage()
+    returned.rss_before = _get_rss()
+    returned.fds_before = _count_fds()
+    returned.threads_before = _count_threads()
+    rusage_before = _get_rusage()
+    try:
+        yield returned
+    finally:
+        rusage_after = _get_rusage()
+        if rusage_before is not None:
+            returned.rusage = dict((field, getattr(rusage_after, field) - getattr(rusage_before, field))
+                                   for field in _RUSAGE_FIELDS)
+        returned.rss_after = _get_rss()
+        returned.fds_after = _count_fds()
+        returned.threads_after = _count_threads()
+        returned.leaks = _find_leaks(returned)
+
+def _find_leaks(usage):
+    usage_config = config.root.resource_usage
+    returned = []
+    fd_growth = usage.get_fd_growth()
+    if fd_growth is not None and fd_growth > usage_config.max_fd_growth:
+        returned.append("{0} file descriptors leaked".format(fd_growth))
+    thread_growth = usage.get_thread_growth()
+    if thread_growth is not None and thread_growth > usage_config.max_thread_growth:
+        returned.append("{0} threads leaked".format(thread_growth))
+    rss_growth = usage.get_rss_growth()
+    if rss_growth is not None and rss_growth > usage_config.max_rss_growth_mb * 1024 * 1024:
+        returned.append("RSS grew by {0:.1f}MB".format(rss_growth / (1024.0 * 1024)))
+    return returned
+
+def _get_growth(before, after):
+    if before is None or after is None:
+        return None
+    return after - before
+
+def _get_rusage():
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF)
+
+def _get_rss():
+    """
+    Returns the current resident set size of the process in bytes, or None if it is unknown. ``ru_maxrss`` is not
+    used, since it only ever grows
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (IOError, OSError, ValueError, IndexError):
+        return None
+
+def _count_threads():
+    # threads shakedown starts on demand, e.g. the one enforcing timeouts, are not the test's doing
+    return sum(1 for thread in threading.enumerate() if not is_internal_thread(thread))
+
+def _count_fds():
+    for fd_dir in _FD_DIRS:
+        try:
+            # the listing itself opens a descriptor, counted both before and after the test
+            return len(os.listdir(fd_dir))
+        except OSError:
+            continue
+    return None
@@ -1,4 +1,35 @@
+from .conf import config
+from .utils.exception_info import ExceptionInfo
 import sys
+import time
+
+def capture_exception_info():
+    """
+    Summarizes the exception being handled as an :class:`shakedown.utils.exception_info.ExceptionInfo`, according to
+    the ``tracebacks`` configuration
+    """
+    # the exception is summarized rather than kept, so its traceback and frames can be released
+    tracebacks_config = config.root.tracebacks
+    return ExceptionInfo.capture(
+        sys.exc_info(), capture_locals=tracebacks_config.capture_locals,
+        max_repr_length=tracebacks_config.max_repr_length, max_locals_size=tracebacks_config.max_locals_size)
+
+class Attempt(object):
+    """
+    A previous run of a test which was retried (see :func:`Result.start_new_attempt`)
+    """
+    def __init__(self, errors, failures, start_time, end_time):
+        super(Attempt, self).__init__()
+        self.errors = errors
+        self.failures = failures
+        self.start_time = start_time
+        self.end_time = end_time
+    def get_status(self):
+        if self.errors:
+            return "error"
+        if self.failures:
+            return "failure"
+        return "success"
 
 class Result(object):
     def __init__(self, test_metadata=None):
@@ -7,7 +38,13 @@ class Result(object):
         self._errors = []
         self._failures = []
         self._skips = []
+        self._exceptions = []
         self._finished = False
+        self._timed_out = False
+        self.start_time = self.end_time = None
+        self._previous_attempts = []
+        #: the resources used by the test (a :class:`shakedown.resource_usage.ResourceUsage`), if they were measured
+        self.resource_usage = None
     def is_error(self):
         return bool(self._errors)
     def is_failure(self):
@@ -19,20 +56,111 @@ class Result(object):
         return bool(self._skips)
     def is_success(self):
         return self._finished and not self._errors and not self._failures and not self._skips
+    def is_timeout(self):
+        """Indicates the test was interrupted for running longer than its timeout. Such tests are also errors"""
+        return self._timed_out
+    def mark_timed_out(self):
+        self._timed_out = True
     def is_finished(self):
         return self._finished
+    def mark_started(self):
+        self.start_time = time.time()
+    def start_new_attempt(self):
+        """
+        Moves the outcome of the current run to the previous attempts, and resets the result for running the test again
+        """
+        self._previous_attempts.append(Attempt(self._errors, self._failures, self.start_time, self.end_time))
+        self._errors = []
+        self._failures = []
+        self._skips = []
+        self._exceptions = []
+        self._finished = False
+        self._timed_out = False
+        self.end_time = None
+        self.mark_started()
+    def update_from(self, other):
+        """
+        Takes over the outcome of ``other``, a result of the same test created elsewhere (e.g. in another process)
+        """
+        test_metadata = self.test_metadata
+        self.__dict__.update(other.__dict__)
+        self.test_metadata = test_metadata
+    def get_previous_attempts(self):
+        return self._previous_attempts
+    def get_num_attempts(self):
+        return len(self._previous_attempts) + 1
+    def is_flaky(self):
+        """Indicates the test succeeded only after being retried"""
+        return self.is_success() and bool(self._previous_attempts)
     def mark_finished(self):
         self._finished = True
-    def add_error(self):
-        self._errors.append(sys.exc_info()[1])
-    def add_failure(self):
-        self._failures.append(sys.exc_info()[1])
+        self.end_time = time.time()
+    def get_duration(self):
+        """Returns the running time of the test in seconds, or None if it did not run to completion"""
+        if self.start_time is None or self.end_time is None:
+            return None
+        return self.end_time - self.start_time
+    def get_status(self):
+        """Returns one of "error", "failure", "skip", "success" or "incomplete". Errors take precedence over failures and skips"""
+        if self.is_error():
+            return "error"
+        if self.is_failure():
+            return "failure"
+        if self.is_skip():
+            return "skip"
+        if self.is_success():
+            return "success"
+        return "incomplete"
+    def add_error(self, exception_info=None):
+        """Records the exception being handled as an error, or ``exception_info`` if given"""
+        self._add_exception(self._errors, exception_info)
+    def add_failure(self, exception_info=None):
+        """Records the exception being handled as a failure, or ``exception_info`` if given"""
+        self._add_exception(self._failures, exception_info)
+    def _add_exception(self, exceptions, exception_info):
+        if exception_info is None:
+            exception_info = capture_exception_info()
+        exceptions.append(exception_info)
+        self._exceptions.append(exception_info)
     def add_skip(self, reason):
         self._skips.append(reason)
+    def get_skips(self):
+        """Returns the reasons given for skipping the test"""
+        return self._skips
     def get_errors(self):
+        """Returns the errors of this result, as :class:`shakedown.utils.exception_info.ExceptionInfo` objects"""
         return self._errors
     def get_failures(self):
+        """Returns the failures of this result, as :class:`shakedown.utils.exception_info.ExceptionInfo` objects"""
         return self._failures
+    def iter_fingerprinted_exceptions(self):
+        """Yields (fingerprint, exception info) pairs for the errors and failures of this result, in the order they occurred"""
+        for exception_info in self._exceptions:
+            yield exception_info.fingerprint, exception_info
+
+class FailureGroup(object):
+    """
+    Unsuccessful results sharing an exception fingerprint (see :func:`shakedown.utils.fingerprint.get_exception_fingerprint`)
+    """
+    def __init__(self, fingerprint, exception, max_examples):
+        super(FailureGroup, self).__init__()
+        self.fingerprint = fingerprint
+        #: the :class:`shakedown.utils.exception_info.ExceptionInfo` of the first exception with this fingerprint
+        self.exception = exception
+        self.count = 0
+        #: metadata of the first few tests in this group
+        self.examples = []
+        self._max_examples = max_examples
+        self._last_result = None
+    def add(self, result):
+        if result is self._last_result:
+            return
+        self._last_result = result
+        self.count += 1
+        if len(self.examples) < self._max_examples:
+            self.examples.append(result.test_metadata)
+    def get_description(self):
+        return str(self.exception)
 
 class AggregatedResult(object):
     def __init__(self, result_iterator_func):
@@ -50,6 +178,22 @@ class AggregatedResult(object):
         return self._count(Result.is_just_failure)
     def get_num_skipped(self):
         return self._count(Result.is_skip)
+    def get_num_flaky(self):
+        return self._count(Result.is_flaky)
+    def get_failure_groups(self, max_examples=3):
+        """
+        Groups the errors and failures of all results by fingerprint. Returns a list of :class:`FailureGroup`, largest first
+        """
+        groups = {}
+        order = []
+        for result in self:
+            for fingerprint, exception in result.iter_fingerprinted_exceptions():
+                group = groups.get(fingerprint)
+                if group is None:
+                    group = groups[fingerprint] = FailureGroup(fingerprint, exception, max_examples)
+                    order.append(group)
+                group.add(result)
+        return sorted(order, key=lambda group: group.count, reverse=True)
     def _count(self, pred):
         returned = 0
         for result in self:
@@ -11,6 +11,19 @@ class RunnableTest(object):
         """
         raise NotImplementedError() # pragma: no cover
 
+    def get_timeout(self):
+        """
+        Returns the timeout of this test in seconds, or None to use the default (``run.default_timeout_seconds``)
+        """
+        return None
+
+    def get_resources(self):
+        """
+        Returns a dict mapping the names of resources used by this test to their capacities (see
+        :func:`shakedown.uses_resource`)
+        """
+        return {}
+
     def get_canonical_name(self):
         return "{0}.{1}".format(type(self).__module__, type(self).__name__)
     def __repr__(self):
@@ -6,35 +6,222 @@ from .conf import config
 from .ctx import context
 from .exceptions import (
     TestFailed,
+    TestProcessDied,
+    TestTimedOut,
     SkipTest,
     )
 from .metadata import ensure_shakedown_metadata
+from .result import capture_exception_info
 from .exception_handling import handling_exceptions
-from contextlib import contextmanager
+from .timeouts import timeout_context
+from .resource_usage import measure_resource_usage
+from .scheduling import ResourceScheduler, get_test_resources
+from .utils.forking import iter_forked, iter_forked_concurrently
+from contextlib import closing, contextmanager
+import collections
+import functools
 import logbook # pylint: disable=F0401
+import os
 
 _logger = logbook.Logger(__name__)
 
-def run_tests(iterable):
+def run_tests(iterable, coordinator=None):
     """
-    Runs tests from an iterable using the current session
+    Runs tests from an iterable using the current session. If ``coordinator`` (a
+    :class:`shakedown.distributed.Coordinator`) is given, the tests are run by its workers
     """
-    for test in iterable:
-        ensure_shakedown_metadata(test).id = context.session.id_space.allocate()
+    session = context.session
+    run_config = config.root.run
+    retries = run_config.retries
+    num_attempts = 1 if run_config.retry_at_end else retries + 1
+    if coordinator is None:
+        # the end hooks of tests retried at the end are triggered once, with their final outcome
+        retry_at_end = bool(run_config.retry_at_end and retries)
+        executed = _execute(_iter_new_results(session, iterable), num_attempts, defer_retried=retry_at_end)
+    else:
+        # workers retry tests themselves
+        retry_at_end = False
+        executed = _execute_remotely(_iter_new_results(session, iterable), coordinator)
+    # maps ids of tests to retry at the end to the tests
+    to_retry = collections.OrderedDict()
+    with closing(executed):
+        for test, result in executed:
+            session.add_checkpoint(result)
+            if retry_at_end and _should_retry(result):
+                to_retry[test.__shakedown__.id] = test
+                continue
+            if _should_stop(result):
+                break
+        else:
+            retried = _execute([(test, session.get_result(test)) for test in to_retry.values()], retries, is_retry=True)
+            with closing(retried):
+                for test, result in retried:
+                    to_retry.pop(test.__shakedown__.id)
+                    session.add_checkpoint(result)
+                    if _should_stop(result):
+                        break
+                else:
+                    session.mark_complete()
+    # tests whose retries were not run (e.g. after stopping on an error) end with the outcome they have
+    for test in to_retry.values():
+        with _get_test_context(test):
+            _trigger_end_hooks(test, session.get_result(test))
+
+def _iter_new_results(session, tests):
+    for test in tests:
+        metadata = ensure_shakedown_metadata(test)
+        if session.pop_resumed_result(test) is not None:
+            _logger.debug("Not running {0}, which completed before the session was resumed", test)
+            continue
+        metadata.id = session.id_space.allocate()
+        yield test, session.create_result(test)
+
+def _execute(test_results, num_attempts, is_retry=False, defer_retried=False):
+    """
+    Runs tests, yielding each test and its result once it is done. If ``defer_retried`` is set, the end hooks of
+    tests which will be retried are not triggered
+    """
+    run_config = config.root.run
+    if run_config.concurrency > 1:
+        return _execute_concurrently(test_results, num_attempts, is_retry, defer_retried, run_config.concurrency)
+    if run_config.isolate:
+        return _execute_isolated(test_results, num_attempts, is_retry, defer_retried, run_config.isolation_batch_size)
+    return _execute_in_process(test_results, num_attempts, is_retry, defer_retried)
+
+def _execute_in_process(test_results, num_attempts, is_retry, defer_retried):
+    for test, result in test_results:
         _logger.debug("Running {0}...", test)
         with _get_test_context(test):
-            with _update_result_context() as result:
-                with _get_test_hooks_context():
-                    try:
-                        with handling_exceptions():
-                            test.run()
-                    finally:
-                        call_cleanups()
-        if not result.is_success() and not result.is_skip() and config.root.run.stop_on_error:
-            _logger.debug("Stopping (run.stop_on_error==True)")
-            break
+            _start_attempt(result, is_retry)
+            with _get_test_hooks_context(test, result, is_retry, defer_retried):
+                _run_attempts(test, result, num_attempts)
+        yield test, result
+
+def _execute_isolated(test_results, num_attempts, is_retry, defer_retried, batch_size):
+    """
+    Runs each test in a child process forked from the current one, so that modules imported so far are shared
+    rather than imported again. The test hooks are triggered in the current process: ``test_start`` as the test is
+    handed to a child, and the end hooks once its result arrives
+    """
+    start_errors = {}
+    run_in_child = functools.partial(_run_in_child, num_attempts=num_attempts, is_retry=is_retry)
+    on_start = functools.partial(_trigger_start_hook, start_errors=start_errors, is_retry=is_retry)
+    with closing(iter_forked(test_results, run_in_child, batch_size=batch_size, on_start=on_start)) as forked:
+        for test_result in _iter_received_results(forked, is_retry, defer_retried, start_errors):
+            yield test_result
+
+def _execute_concurrently(test_results, num_attempts, is_retry, defer_retried, concurrency):
+    """
+    Runs up to ``concurrency`` tests at once, each in a child process forked from the current one. Tests using a
+    resource whose capacity is taken by running tests wait for it, while the tests following them may start
+    """
+    scheduler = ResourceScheduler(test_results, lambda test_result: get_test_resources(test_result[0]))
+    start_errors = {}
+    run_in_child = functools.partial(_run_in_child, num_attempts=num_attempts, is_retry=is_retry)
+    on_start = functools.partial(_trigger_start_hook, start_errors=start_errors, is_retry=is_retry)
+    try:
+        with closing(iter_forked_concurrently(scheduler, run_in_child, concurrency, on_start=on_start)) as forked:
+            for test_result in _iter_received_results(forked, is_retry, defer_retried, start_errors):
+                yield test_result
+    finally:
+        resource_wait_seconds = context.session.resource_wait_seconds
+        for name, seconds in scheduler.wait_seconds.items():
+            resource_wait_seconds[name] = resource_wait_seconds.get(name, 0) + seconds
+
+def _execute_remotely(test_results, coordinator):
+    """
+    Runs tests on the workers of ``coordinator``. The test hooks are triggered in the current process, as the
+    workers report the results. Since the coordinator hands out tests in batches, ``test_start`` is triggered only
+    when the result arrives as well, right before the end hooks
+    """
+    with closing(coordinator.iter_results(test_results)) as received:
+        for test_result in _iter_received_results(received, is_retry=False, defer_retried=False):
+            yield test_result
+
+def _run_in_child(test_result, num_attempts, is_retry):
+    test, result = test_result
+    _logger.debug("Running {0} in process {1}...", test, os.getpid())
+    with _get_test_context(test):
+        _start_attempt(result, is_retry)
+        _run_attempts(test, result, num_attempts)
+    return result
+
+def _trigger_start_hook(test_result, start_errors, is_retry):
+    """
+    Triggers ``test_start`` for a test about to be run in a child process. The exceptions it raised are kept in
+    ``start_errors`` by test id, to be recorded once the result of the test arrives
+    """
+    test, result = test_result
+    if is_retry:
+        return
+    with _get_test_context(test):
+        start_errors[result.test_metadata.id] = _trigger_hook(hooks.test_start, test, result)
+
+def _iter_received_results(forked, is_retry, defer_retried, start_errors=None):
+    """
+    Updates the results of tests run in child processes, triggering the test hooks in the current process. If
+    ``start_errors`` is given, ``test_start`` was triggered as the tests were dispatched (see
+    :func:`_trigger_start_hook`), and is not triggered again
+    """
+    for (test, result), received, exit_description in forked:
+        with _get_test_context(test):
+            test_start_errors = None if start_errors is None else start_errors.pop(result.test_metadata.id, [])
+            with _get_test_hooks_context(test, result, is_retry, defer_retried, test_start_errors):
+                if exit_description is None:
+                    result.update_from(received)
+                else:
+                    _record_process_death(result, exit_description, is_retry)
+        yield test, result
+
+def _record_process_death(result, description, is_retry):
+    _start_attempt(result, is_retry)
+    with _update_result_context(result):
+        raise TestProcessDied(description)
+
+def _start_attempt(result, is_retry):
+    if is_retry:
+        result.start_new_attempt()
     else:
-        context.session.mark_complete()
+        result.mark_started()
+
+def _run_attempts(test, result, num_attempts):
+    with _get_resource_usage_context(result):
+        _run_attempts_unmeasured(test, result, num_attempts)
+
+def _run_attempts_unmeasured(test, result, num_attempts):
+    for attempt_index in range(num_attempts):
+        if attempt_index > 0:
+            _logger.debug("Retrying {0} (attempt {1})", test, result.get_num_attempts() + 1)
+            result.start_new_attempt()
+        with _update_result_context(result):
+            try:
+                with handling_exceptions():
+                    with timeout_context(test):
+                        test.run()
+            finally:
+                call_cleanups()
+        if not _should_retry(result):
+            break
+
+def _should_retry(result):
+    return (result.is_error() or result.is_failure()) and not result.is_skip()
+
+def _should_stop(result):
+    if not result.is_success() and not result.is_skip() and config.root.run.stop_on_error:
+        _logger.debug("Stopping (run.stop_on_error==True)")
+        return True
+    return False
+
+@contextmanager
+def _get_resource_usage_context(result):
+    if not config.root.resource_usage.enabled:
+        yield
+        return
+    with measure_resource_usage() as usage:
+        result.resource_usage = usage
+        yield
+    for leak in result.resource_usage.leaks:
+        _logger.warning("{0}: {1}", result.test_metadata, leak)
 
 @contextmanager
 def _get_test_context(test):
@@ -43,21 +230,50 @@ def _get_test_context(test):
             yield
 
 @contextmanager
-def _get_test_hooks_context():
-    hooks.test_start()
+def _get_test_hooks_context(test, result, is_retry=False, defer_retried=False, start_errors=None):
+    """
+    Triggers the test hooks around a test. The outcome hooks and ``test_end`` are triggered after the result has
+    been updated, so they receive the final result of the test. ``test_start`` is not triggered again for retries,
+    nor if ``start_errors`` is given (i.e. it was triggered already, raising these exceptions), and if
+    ``defer_retried`` is set, the end hooks are not triggered for tests which will be retried.
+
+    Exceptions raised by the hooks are recorded as errors of the test
+    """
+    if start_errors is None:
+        start_errors = [] if is_retry else _trigger_hook(hooks.test_start, test, result)
     try:
         yield
-    except SkipTest:
-        hooks.test_skip()
-        raise
-    except TestFailed:
-        hooks.test_failure()
-        raise
-    except:
-        hooks.test_error()
-        raise
     finally:
-        hooks.test_end()
+        # recorded only now, since the result may be replaced by one received from another process
+        for exception_info in start_errors:
+            result.add_error(exception_info)
+        if not (defer_retried and _should_retry(result)):
+            _trigger_end_hooks(test, result)
+
+def _trigger_end_hooks(test, result):
+    if result.is_skip():
+        outcome_hook = hooks.test_skip
+    elif result.is_error():
+        outcome_hook = hooks.test_error
+    elif result.is_failure():
+        outcome_hook = hooks.test_failure
+    else:
+        outcome_hook = hooks.test_success
+    for hook in (outcome_hook, hooks.test_end):
+        for exception_info in _trigger_hook(hook, test, result):
+            result.add_error(exception_info)
+
+def _trigger_hook(hook, test, result):
+    """
+    Triggers a test hook, returning the exceptions it raised as a list of
+    :class:`shakedown.utils.exception_info.ExceptionInfo`
+    """
+    try:
+        hook(test=test, result=result)
+    except Exception: # pylint: disable=W0703
+        _logger.debug("Exception raised by a test hook", exc_info=sys.exc_info())
+        return [capture_exception_info()]
+    return []
 
 @contextmanager
 def _set_current_test_context(test):
@@ -72,11 +288,10 @@ def _set_current_test_context(test):
         context.test_id = prev_test_id
 
 @contextmanager
-def _update_result_context():
-    result = context.session.create_result(context.test)
+def _update_result_context(result):
     try:
         try:
-            yield result
+            yield
         except:
             _logger.debug("Exception escaped test", exc_info=sys.exc_info())
             raise
@@ -84,6 +299,9 @@ def _update_result_context():
         result.add_skip(e.reason)
     except TestFailed:
         result.add_failure()
+    except TestTimedOut:
+        result.add_error()
+        result.mark_timed_out()
     except:
         result.add_error()
     finally:
@@ -0,0 +1,101 @@
+import collections
+import time
+
+# how many tests blocked by resources in use are looked past when choosing the next test to run
+_MAX_LOOKAHEAD = 1000
+
+def get_test_resources(test):
+    """
+    Returns the resources used by a test, as a dict mapping their names to their capacities
+    """
+    get_resources = getattr(test, "get_resources", None)
+    return {} if get_resources is None else get_resources()
+
+class _PendingItem(object):
+    def __init__(self, item, resources):
+        super(_PendingItem, self).__init__()
+        self.item = item
+        self.resources = resources
+        self.blocked_since = None
+        self.blocking = set()
+
+class ResourceScheduler(object):
+    """
+    Chooses the next item (e.g. test) to run out of an iterable, for running items concurrently. Items are started in
+    order, except that items using a resource whose capacity is taken by running items are passed over for following
+    ones, until the resource is released. The time items spent waiting for each resource is summed in
+    :attr:`wait_seconds`.
+
+    ``get_resources`` returns the resources of an item, as a dict mapping names to capacities. If items declare
+    different capacities for the same resource, the smallest one applies
+    """
+    def __init__(self, items, get_resources):
+        super(ResourceScheduler, self).__init__()
+        self._items = iter(items)
+        self._exhausted = False
+        self._get_resources = get_resources
+        self._pending = []
+        self._capacities = {}
+        self._in_use = collections.defaultdict(int)
+        self._running = {}
+        #: maps names of resources to the total time items waited for them, in seconds
+        self.wait_seconds = collections.defaultdict(float)
+
+    def has_pending(self):
+        if self._pending:
+            return True
+        self._fetch()
+        return bool(self._pending)
+
+    def pop_runnable(self):
+        """
+        Returns the next item whose resources are available, and marks them as used until it is :func:`release`-d.
+        Returns None if there is no such item
+        """
+        now = time.time()
+        for index, pending in enumerate(self._pending):
+            if self._is_available(pending, now):
+                del self._pending[index]
+                return self._start(pending, now)
+        while len(self._pending) < _MAX_LOOKAHEAD and self._fetch():
+            pending = self._pending[-1]
+            if self._is_available(pending, now):
+                self._pending.pop()
+                return self._start(pending, now)
+        return None
+
+    def release(self, item):
+        for name in self._running.pop(id(item)):
+            self._in_use[name] -= 1
+
+    def _fetch(self):
+        if self._exhausted:
+            return False
+        try:
+            item = next(self._items)
+        except StopIteration:
+            self._exhausted = True
+            return False
+        resources = self._get_resources(item)
+        for name, capacity in resources.items():
+            self._capacities[name] = min(capacity, self._capacities.get(name, capacity))
+        self._pending.append(_PendingItem(item, resources))
+        return True
+
+    def _is_available(self, pending, now):
+        blocking = set(name for name in pending.resources if self._in_use[name] >= self._capacities[name])
+        if blocking:
+            if pending.blocked_since is None:
+                pending.blocked_since = now
+            pending.blocking.update(blocking)
+            return False
+        return True
+
+    def _start(self, pending, now):
+        if pending.blocked_since is not None:
+            for name in pending.blocking:
+                self.wait_seconds[name] += now - pending.blocked_since
+        for name in pending.resources:
+            self._in_use[name] += 1
+        self._running[id(pending.item)] = list(pending.resources)
+        return pending.item
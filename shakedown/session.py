@@ -1,4 +1,5 @@
 from six import itervalues
+from . import checkpoints
 from . import ctx
 from . import hooks
 from . import log
@@ -10,13 +11,20 @@ from contextlib import contextmanager
 import uuid
 
 class Session(Activatable):
-    def __init__(self):
+    def __init__(self, session_id=None, checkpoint_dir=None):
         super(Session, self).__init__()
-        self.id = "{0}:0".format(uuid.uuid1())
+        self.id = session_id or "{0}:0".format(uuid.uuid1())
         self.id_space = IDSpace(self.id)
+        #: directory journaling the tests completed by the session (see :mod:`shakedown.checkpoints`), or None to use
+        #: a directory under ``checkpoints.root``, if set
+        self.checkpoint_dir = checkpoint_dir
+        self._journal = None
         self._complete = False
         self._context = None
         self._results = {}
+        self._resumed_results = {}
+        #: maps names of resources to the time tests spent waiting for them when running concurrently, in seconds
+        self.resource_wait_seconds = {}
         self.result = AggregatedResult(self.iter_results)
     def iter_results(self):
         return itervalues(self._results)
@@ -29,6 +37,37 @@ class Session(Activatable):
         if test.__shakedown__ is None:
             raise LookupError("Could not find result for {0}".format(test))
         return self._results[test.__shakedown__.id]
+    def add_resumed_result(self, test_key, result):
+        """
+        Adds the result of a test completed by a previous run of this session. Tests with the same key are not run
+        again (see :func:`shakedown.metadata.get_test_key`)
+        """
+        self._results[result.test_metadata.id] = result
+        self._resumed_results.setdefault(test_key, []).append(result)
+    def pop_resumed_result(self, test):
+        """
+        Returns a result added by :func:`add_resumed_result` for ``test``, if any remain, or None
+        """
+        metadata = test.__shakedown__
+        resumed = self._resumed_results.get(metadata.get_key())
+        if not resumed:
+            return None
+        return resumed.pop(0)
+    def add_checkpoint(self, result):
+        """
+        Journals the outcome of a completed test, if the session is checkpointed
+        """
+        if self._journal is not None:
+            self._journal.add(result)
+    def _open_journal(self):
+        if self.checkpoint_dir is None:
+            self.checkpoint_dir = checkpoints.get_session_dir(self.id)
+        if self.checkpoint_dir is not None:
+            self._journal = checkpoints.open_journal(self.checkpoint_dir, self.id)
+    def _close_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
     def activate(self):
         assert self._context is None
         self._context = _session_context(self)
@@ -47,12 +86,17 @@ def _session_context(session):
     ctx.push_context()
     ctx.context.session = session
     try:
-        with log.get_session_logging_context():
-            hooks.session_start()
-            try:
-                yield
-            finally:
-                hooks.session_end()
+        session._open_journal() # pylint: disable=W0212
+        try:
+            with log.get_session_logging_context():
+                hooks.reset_latencies()
+                hooks.session_start(session=session)
+                try:
+                    yield
+                finally:
+                    hooks.session_end(session=session)
+        finally:
+            session._close_journal() # pylint: disable=W0212
     finally:
         ctx.pop_context()
 
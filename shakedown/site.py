@@ -1,6 +1,7 @@
 import os
-import requests
-import pkg_resources
+from .conf import config
+from .utils.entry_points import iter_entry_points
+from .utils.url_cache import URLCache
 
 def load(thing=None):
     """
@@ -30,7 +31,7 @@ def _load_environment():
         load(loaded_url_or_file)
 
 def _load_entry_points():
-    for customize_function_loader in pkg_resources.iter_entry_points("shakedown.site.customize"):
+    for customize_function_loader in iter_entry_points("shakedown.site.customize"):
         func = customize_function_loader.load()
         func()
 
@@ -45,9 +46,15 @@ def _load_filename(filename):
         _load_source(f.read(), filename)
 
 def _load_url(url):
-    response = requests.get(url)
-    response.raise_for_status()
-    _load_source(response.content, url)
+    _load_source(_get_url_cache().get(url), url)
+
+def _get_url_cache():
+    site_config = config.root.site
+    return URLCache(
+        os.path.expanduser(site_config.cache_dir),
+        ttl_seconds=site_config.cache_ttl_seconds,
+        timeout=(site_config.connect_timeout_seconds, site_config.read_timeout_seconds),
+    )
 
 def _load_source(source, filename):
     exec(source, {"__file__" : filename}) # pylint: disable=W0122
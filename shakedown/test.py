@@ -16,6 +16,10 @@ class Test(RunnableTest, RunnableTestFactory):
         self._test_kwargs = test_kwargs or {}
     __shakedown_skipped__ = False
     __shakedown_skipped_reason__ = None
+    #: timeout in seconds for the tests of this class, unless set for a specific method with :func:`shakedown.timeout`
+    timeout_seconds = None
+    #: resources used by the tests of this class, in addition to those of specific methods (see :func:`shakedown.uses_resource`)
+    resources = {}
     @classmethod
     def skip_all(cls, reason=None):
         cls.__shakedown_skipped__ = True
@@ -66,6 +70,15 @@ class Test(RunnableTest, RunnableTestFactory):
         Gets called after each separate case from this test class executed, assuming :meth:`before` was successful.
         """
         pass
+    def get_timeout(self):
+        returned = getattr(getattr(self, self._test_method_name), "__shakedown_timeout__", None)
+        if returned is None:
+            returned = self.timeout_seconds
+        return returned
+    def get_resources(self):
+        returned = dict(self.resources)
+        returned.update(getattr(getattr(self, self._test_method_name), "__shakedown_resources__", {}))
+        return returned
     def get_canonical_name(self):
         return "{0}:{1}".format(super(Test, self).get_canonical_name(), self._test_method_name)
 
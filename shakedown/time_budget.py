@@ -0,0 +1,146 @@
+from .metadata import ensure_shakedown_metadata
+import json
+import logbook # pylint: disable=F0401
+import os
+import tempfile
+import time
+
+_logger = logbook.Logger(__name__)
+
+# weight of the latest duration in a test's average duration, so that the average follows tests getting slower
+_DURATION_SMOOTHING = 0.3
+# assumed duration of tests without history, when no test has any
+_DEFAULT_DURATION_SECONDS = 1.0
+_MIN_DURATION_SECONDS = 0.001
+
+_RECORDED_STATUSES = ("success", "failure", "error")
+
+NOT_SELECTED = "not expected to fit in the time budget"
+BUDGET_EXHAUSTED = "time budget exhausted"
+
+class RunHistory(object):
+    """
+    The average durations and outcome counts of tests in previous sessions, stored in a JSON file and keyed by
+    :func:`shakedown.metadata.get_test_key`
+    """
+    def __init__(self, path):
+        super(RunHistory, self).__init__()
+        self._path = os.path.expanduser(path)
+        self._entries = self._load()
+
+    def _load(self):
+        if not os.path.exists(self._path):
+            return {}
+        try:
+            with open(self._path) as f:
+                return json.load(f)
+        except ValueError:
+            _logger.warning("Ignoring corrupt test history file {0}", self._path)
+            return {}
+
+    def get_duration(self, key):
+        """Returns the average duration of a test, or None if it never completed"""
+        entry = self._entries.get(key)
+        return None if entry is None else entry["duration"]
+
+    def get_failure_probability(self, key):
+        """
+        Estimates the probability that a test fails or errors, by its past outcomes. Tests without history get 0.5
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return 0.5
+        # Laplace's rule of succession, so that a few lucky runs do not make a test look infallible
+        return (entry["failures"] + 1.0) / (entry["runs"] + 2.0)
+
+    def iter_durations(self):
+        for entry in self._entries.values():
+            yield entry["duration"]
+
+    def update(self, results):
+        for result in results:
+            status = result.get_status()
+            duration = result.get_duration()
+            if status not in _RECORDED_STATUSES or duration is None:
+                continue
+            key = result.test_metadata.get_key()
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = {"runs" : 0, "failures" : 0, "duration" : duration}
+            entry["runs"] += 1
+            if status != "success":
+                entry["failures"] += 1
+            entry["duration"] += (duration - entry["duration"]) * _DURATION_SMOOTHING
+
+    def save(self):
+        directory = os.path.dirname(self._path) or "."
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        # replace the file at once, so that concurrent sessions never read a partially written one
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".test_history")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self._entries, f)
+        os.rename(temp_path, self._path)
+
+class TimeBudget(object):
+    """
+    Chooses the tests to run within a time budget, and stops starting tests once the budget is exhausted. Tests not
+    run are kept, with the reason, in :attr:`skipped`
+    """
+    def __init__(self, seconds, history):
+        super(TimeBudget, self).__init__()
+        self.seconds = seconds
+        self._history = history
+        #: list of (test metadata, reason) pairs
+        self.skipped = []
+
+    def select(self, tests):
+        """
+        Returns the tests, in their original order, maximizing the number of failures expected to be detected,
+        while the sum of their expected durations fits in the budget
+        """
+        selected, deselected = select_tests(tests, self.seconds, self._history)
+        self.skipped.extend((ensure_shakedown_metadata(test), NOT_SELECTED) for test in deselected)
+        return selected
+
+    def iter_within_budget(self, tests):
+        """
+        Yields tests until the budget is exhausted, counting from the first test yielded
+        """
+        deadline = time.time() + self.seconds
+        for test in tests:
+            if time.time() >= deadline:
+                self.skipped.append((ensure_shakedown_metadata(test), BUDGET_EXHAUSTED))
+                continue
+            yield test
+
+def select_tests(tests, budget_seconds, history):
+    """
+    Picks tests by their probability to fail per second of expected running time, as long as they fit in the budget.
+    Returns the lists of selected and deselected tests, each in the original order
+    """
+    tests = list(tests)
+    default_duration = _get_median(list(history.iter_durations())) or _DEFAULT_DURATION_SECONDS
+    candidates = []
+    for index, test in enumerate(tests):
+        key = ensure_shakedown_metadata(test).get_key()
+        duration = history.get_duration(key)
+        if duration is None:
+            duration = default_duration
+        duration = max(duration, _MIN_DURATION_SECONDS)
+        candidates.append((-history.get_failure_probability(key) / duration, index, duration))
+    remaining = budget_seconds
+    selected_indices = set()
+    for _, index, duration in sorted(candidates):
+        if duration <= remaining:
+            selected_indices.add(index)
+            remaining -= duration
+    selected = [test for index, test in enumerate(tests) if index in selected_indices]
+    deselected = [test for index, test in enumerate(tests) if index not in selected_indices]
+    return selected, deselected
+
+def _get_median(values):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[len(values) // 2]
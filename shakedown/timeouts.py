@@ -0,0 +1,111 @@
+from .conf import config
+from .exceptions import TestTimedOut
+from .log import get_test_log_path
+from .utils.path import ensure_containing_directory
+from .utils.watchdog import Watchdog, dump_stacks, raise_in_thread
+from contextlib import contextmanager
+import logbook # pylint: disable=F0401
+import signal
+import sys
+import threading
+
+_logger = logbook.Logger(__name__)
+
+_watchdog = Watchdog("shakedown-timeouts")
+
+def get_test_timeout(test):
+    """
+    Returns the timeout of a test in seconds: either its own (see :func:`shakedown.timeout`), or
+    ``run.default_timeout_seconds``. None means no timeout
+    """
+    get_timeout = getattr(test, "get_timeout", None)
+    returned = None if get_timeout is None else get_timeout()
+    if returned is None:
+        returned = config.root.run.default_timeout_seconds
+    return returned
+
+@contextmanager
+def timeout_context(test):
+    """
+    Enforces the timeout of a test running in the current thread. When it expires, the stacks of all threads are
+    dumped to the test's log file, and :class:`shakedown.exceptions.TestTimedOut` is raised in the test
+    """
+    timeout = get_test_timeout(test)
+    if not timeout:
+        yield
+        return
+    expiration = _Expiration(test, timeout, get_test_log_path())
+    try:
+        with expiration.get_interruption_context():
+            _watchdog.arm(timeout, expiration.expire)
+            try:
+                yield
+            finally:
+                _watchdog.disarm()
+                expiration.finished = True
+    except TestTimedOut:
+        expiration.delivered = True
+        _logger.error("{0} timed out after {1} seconds", test, timeout)
+        raise
+    finally:
+        expiration.cancel()
+
+class _Expiration(object):
+    def __init__(self, test, timeout, log_path):
+        super(_Expiration, self).__init__()
+        self.test = test
+        self.timeout = timeout
+        self.log_path = log_path
+        self.thread_id = _get_current_thread_id()
+        # signals interrupt blocking calls (e.g. sleep) as well, but only reach the main thread
+        self.use_signal = hasattr(signal, "pthread_kill") and isinstance(threading.current_thread(), threading._MainThread) # pylint: disable=W0212
+        self.expired = self.delivered = self.finished = False
+
+    @contextmanager
+    def get_interruption_context(self):
+        if not self.use_signal:
+            yield
+            return
+        prev_handler = signal.signal(signal.SIGALRM, self._handle_signal)
+        try:
+            yield
+        finally:
+            signal.signal(signal.SIGALRM, prev_handler)
+
+    def expire(self):
+        # called from the watchdog thread
+        self.expired = True
+        self._dump_stacks()
+        if self.use_signal:
+            signal.pthread_kill(self.thread_id, signal.SIGALRM) # pylint: disable=E1101
+        else:
+            raise_in_thread(self.thread_id, TestTimedOut)
+
+    def _handle_signal(self, *_):
+        if self.expired and not self.finished:
+            raise TestTimedOut("Test timed out after {0} seconds".format(self.timeout))
+
+    def cancel(self):
+        # the test may have ended before the exception was raised in it
+        self.finished = True
+        if self.expired and not self.delivered and not self.use_signal:
+            raise_in_thread(self.thread_id, None)
+
+    def _dump_stacks(self):
+        try:
+            if self.log_path is None:
+                dump_stacks(sys.stderr)
+                return
+            ensure_containing_directory(self.log_path)
+            with open(self.log_path, "a") as f:
+                f.write("Test timed out after {0} seconds. Stacks of all threads:\n".format(self.timeout))
+                dump_stacks(f)
+        except Exception: # pylint: disable=W0703
+            _logger.warning("Could not dump stacks of timed out test {0}", self.test, exc_info=True)
+
+def _get_current_thread_id():
+    get_ident = getattr(threading, "get_ident", None)
+    if get_ident is None:
+        import thread # pylint: disable=F0401
+        get_ident = thread.get_ident
+    return get_ident()
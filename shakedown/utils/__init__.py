@@ -23,3 +23,28 @@ def skipped(thing, reason=None):
     def new_func(*_, **__):
         skip_test(reason)
     return new_func
+
+def timeout(seconds):
+    """
+    A decorator setting the timeout of test methods or classes, in seconds
+    """
+    def decorator(thing):
+        if isinstance(thing, type):
+            thing.timeout_seconds = seconds
+        else:
+            thing.__shakedown_timeout__ = seconds
+        return thing
+    return decorator
+
+def uses_resource(name, capacity=1):
+    """
+    A decorator declaring that test methods or classes use a named resource, e.g. a database or a hardware rig. When
+    tests run concurrently (see ``run.concurrency``), at most ``capacity`` tests using the resource run at once
+    """
+    def decorator(thing):
+        if isinstance(thing, type):
+            thing.resources = dict(thing.resources, **{name : capacity})
+        else:
+            thing.__shakedown_resources__ = dict(getattr(thing, "__shakedown_resources__", {}), **{name : capacity})
+        return thing
+    return decorator
@@ -0,0 +1,70 @@
+from six.moves import queue # pylint: disable=F0401
+from logbook import Logger # pylint: disable=F0401
+import os
+import sys
+import threading
+import weakref
+
+_logger = Logger(__name__)
+
+_internal_threads = weakref.WeakSet()
+
+def start_internal_thread(target, name, args=()):
+    """
+    Starts a daemon thread for shakedown's own use. Such threads are not counted as leaked by the tests during which
+    they happen to start (see :mod:`shakedown.resource_usage`)
+    """
+    returned = threading.Thread(target=target, args=args, name=name)
+    returned.daemon = True
+    _internal_threads.add(returned)
+    returned.start()
+    return returned
+
+def is_internal_thread(thread):
+    return thread in _internal_threads
+
+class BackgroundWorker(object):
+    """
+    Executes jobs one by one in a daemon thread, which is started on first use. Errors in jobs are logged and ignored
+    """
+    def __init__(self, name):
+        super(BackgroundWorker, self).__init__()
+        self._name = name
+        self._queue = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, **kwargs):
+        self._ensure_started()
+        self._queue.put((func, args, kwargs))
+
+    def flush(self, timeout=None):
+        """
+        Waits for all jobs submitted so far to finish, for at most ``timeout`` seconds. Returns whether they did
+        """
+        if not self._is_started():
+            return True
+        done = threading.Event()
+        self.submit(done.set)
+        done.wait(timeout)
+        return done.is_set()
+
+    def _is_started(self):
+        # threads do not survive fork(), so a worker started by a parent process is restarted in children
+        return self._thread is not None and self._pid == os.getpid()
+
+    def _ensure_started(self):
+        with self._lock:
+            if not self._is_started():
+                self._pid = os.getpid()
+                self._queue = queue.Queue()
+                self._thread = start_internal_thread(self._work, self._name, args=(self._queue,))
+
+    def _work(self, job_queue):
+        while True:
+            func, args, kwargs = job_queue.get()
+            try:
+                func(*args, **kwargs) # pylint: disable=W0142
+            except:
+                _logger.warning("Error in background job {0}", func, exc_info=sys.exc_info())
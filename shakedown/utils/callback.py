@@ -1,55 +1,142 @@
+import inspect
 import itertools
 import logbook
 import sys
 import six
+import time
 
 from ..conf import config
 
 _declaration_index = itertools.count()
 _logger = logbook.Logger(__name__)
+_timer = getattr(time, "perf_counter", time.time)
+
+class HookLatency(object):
+    """
+    Cumulative time spent in the callbacks registered to a hook under a single identifier
+    """
+    def __init__(self):
+        super(HookLatency, self).__init__()
+        self.num_calls = 0
+        self.total_seconds = 0.0
+    def get_average_seconds(self):
+        if not self.num_calls:
+            return 0.0
+        return self.total_seconds / self.num_calls
+    def __repr__(self):
+        return "<{0} calls, {1:.6f}s>".format(self.num_calls, self.total_seconds)
 
 class Callback(object):
     """
-    Implements a hook to which callbacks can be registered
+    Implements a hook to which callbacks can be registered.
+
+    The hook is called with the keyword arguments named in ``arg_names``. Each callback only receives the arguments
+    it accepts, so callbacks taking no arguments keep working as arguments are added to hooks.
     """
     def __init__(self, arg_names=(), doc=""):
         super(Callback, self).__init__()
         self._arg_names = arg_names
         self._callbacks = []
+        self._num_callbacks_by_identifier = {}
+        self._latencies = {}
+        self._measure_latency = False
         self.declaration_index = next(_declaration_index)
         self.doc = doc
     def get_argument_names(self):
         return set(self._arg_names)
     def __call__(self, **kwargs):
         last_exc_info = None
-        for (_, callback) in self._callbacks:
+        measure_latency = self._measure_latency
+        for (identifier, callback, accepted_arg_names) in self._callbacks:
+            if measure_latency:
+                start_time = _timer()
             try:
-                callback(**kwargs)
+                if accepted_arg_names is None:
+                    callback(**kwargs)
+                elif accepted_arg_names:
+                    callback(**dict((name, kwargs[name]) for name in accepted_arg_names if name in kwargs))
+                else:
+                    callback()
             except:
                 _logger.warn("Ignoring error occurred while calling {0}", callback, exc_info=sys.exc_info())
                 if last_exc_info is None:
                     last_exc_info = sys.exc_info()
+            finally:
+                if measure_latency:
+                    self._record_latency(identifier, _timer() - start_time)
         if last_exc_info and not config.root.hooks.swallow_exceptions:
             six.reraise(*last_exc_info) # pylint: disable=W0142
+    def _record_latency(self, identifier, elapsed):
+        latency = self._latencies.get(identifier)
+        if latency is None:
+            latency = self._latencies[identifier] = HookLatency()
+        latency.num_calls += 1
+        latency.total_seconds += elapsed
+    def get_latencies(self):
+        """
+        Returns a dict mapping identifiers to the :class:`HookLatency` of their callbacks. Latencies are only
+        recorded if ``hooks.measure_latency`` was set when latencies were last reset (i.e. when the session started)
+        """
+        return self._latencies.copy()
+    def reset_latencies(self):
+        self._latencies.clear()
+        # read once here rather than on every call, as hooks are called for every test
+        self._measure_latency = config.root.hooks.measure_latency
     def register(self, func, identifier=None):
         """
         Registers a function to this callback.
 
         Optional argument identifier for later removal by :func:`shakedown.utils.callback.Callback.unregister_by_identifier`.
         """
-        self._callbacks.append((identifier, func))
+        self._callbacks.append((identifier, func, self._get_accepted_arg_names(func)))
+        self._num_callbacks_by_identifier[identifier] = self._num_callbacks_by_identifier.get(identifier, 0) + 1
         return func # useful for decorators
 
     def unregister_by_identifier(self, identifier):
         """
         Unregisters a callback identified by ``identifier``.
         """
-        for index, (callback_id, _) in reversed(list(enumerate(self._callbacks))):
-            if callback_id == identifier:
-                self._callbacks.pop(index)
+        if self._num_callbacks_by_identifier.pop(identifier, None) is None:
+            return
+        # replacing the list (rather than removing from it) keeps ongoing calls iterating over the previous callbacks
+        self._callbacks = [registration for registration in self._callbacks if registration[0] != identifier]
 
     def iter_registered(self):
         """
         Yields tuples of (identifier, callback) for each registered callback
         """
-        return iter(self._callbacks)
+        return ((identifier, callback) for identifier, callback, _ in self._callbacks)
+
+    def _get_accepted_arg_names(self, func):
+        """
+        Returns the hook arguments ``func`` accepts, or None if it should receive all of them
+        """
+        accepted = _get_keyword_parameter_names(func)
+        if accepted is None:
+            return None
+        return tuple(name for name in self._arg_names if name in accepted)
+
+def _get_keyword_parameter_names(func):
+    """
+    Returns the names of the parameters ``func`` can receive as keywords, or None if it takes arbitrary keywords
+    (or cannot be inspected)
+    """
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except AttributeError: # python 2
+        try:
+            argspec = inspect.getargspec(func) # pylint: disable=W1505
+        except TypeError:
+            return None
+        if argspec.keywords is not None:
+            return None
+        return frozenset(argspec.args)
+    except (TypeError, ValueError):
+        return None
+    returned = set()
+    for parameter in parameters:
+        if parameter.kind == parameter.VAR_KEYWORD:
+            return None
+        if parameter.kind in (parameter.POSITIONAL_OR_KEYWORD, parameter.KEYWORD_ONLY):
+            returned.add(parameter.name)
+    return frozenset(returned)
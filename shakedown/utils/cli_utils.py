@@ -24,22 +24,28 @@ def get_cli_environment_context(argv=None, config=conf.config, parser=None):
 
 @contextmanager
 def _get_active_plugins_context(argv):
-    cleanups = []
     prev_active = set(plugins.manager.get_active_plugins())
     try:
         new_active, new_argv = _get_new_active_plugins_from_args(argv)
         for plugin_name in new_active - prev_active:
             plugins.manager.activate(plugin_name)
-            cleanups.append((plugins.manager.deactivate, plugin_name))
         for plugin_name in prev_active - new_active:
             plugins.manager.deactivate(plugin_name)
-            cleanups.append((plugins.manager.activate, plugin_name))
         del argv[:]
         argv.extend(new_argv)
         yield
     finally:
-        for cleanup_func, plugin_name in reversed(cleanups):
-            cleanup_func(plugin_name)
+        # plugins (de)activated while the context was active, and not only through the arguments, are restored too
+        _restore_active_plugins(prev_active)
+
+def _restore_active_plugins(plugin_names):
+    active = set(plugins.manager.get_active_plugins())
+    for plugin_name in active - plugin_names:
+        plugins.manager.deactivate(plugin_name)
+    installed = plugins.manager.get_installed_plugins()
+    for plugin_name in plugin_names - active:
+        if plugin_name in installed:
+            plugins.manager.activate(plugin_name)
 
 _PLUGIN_ACTIVATION_PREFIX = "--with-"
 _PLUGIN_DEACTIVATION_PREFIX = "--without-"
@@ -120,6 +126,7 @@ class PluginAwareArgumentParser(argparse.ArgumentParser):
                 with f.indented(2):
                     f.write(description)
             f.writeln()
+        f.flush()
         return returned.getvalue()
 
     def _iter_available_plugins(self):
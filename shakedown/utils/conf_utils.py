@@ -14,12 +14,13 @@ def _decrease(value):
     return value - 1
 
 class _Cmdline(object):
-    def __init__(self, arg=None, on=None, off=None, increase=None, decrease=None):
+    def __init__(self, arg=None, on=None, off=None, increase=None, decrease=None, arg_type=None):
         super(_Cmdline, self).__init__()
         dest = next(_dest_generator)
         self.callback_dest = dest + ":callbacks"
         self.arg_dest = dest + ":arg"
         self.arg = arg
+        self.arg_type = arg_type
         self.on = on
         self.off = off
         self.increase = increase
@@ -29,7 +30,8 @@ class _Cmdline(object):
         Add all required flags to a parser to support updating the config value from commandline
         """
         if self.arg is not None:
-            parser.add_argument(self.arg, dest=self.arg_dest, default=None, metavar="VALUE")
+            kwargs = {} if self.arg_type is None else {"type" : self.arg_type}
+            parser.add_argument(self.arg, dest=self.arg_dest, default=None, metavar="VALUE", **kwargs) # pylint: disable=W0142
         self._add_arg(parser, self.on, callback=_set_true)
         self._add_arg(parser, self.off, callback=_set_false)
         self._add_arg(parser, self.increase, callback=_increase)
@@ -53,6 +55,24 @@ class _Cmdline(object):
                 value = callback(value)
         return value
 
+_DURATION_UNITS = {"s" : 1, "m" : 60, "h" : 60 * 60}
+
+def parse_duration(value):
+    """
+    Parses durations such as ``90``, ``90s``, ``10m`` or ``1.5h`` to seconds. For use as ``arg_type`` of
+    :func:`Cmdline`
+    """
+    value = value.strip().lower()
+    multiplier = _DURATION_UNITS.get(value[-1:])
+    if multiplier is None:
+        multiplier = 1
+    else:
+        value = value[:-1]
+    returned = float(value) * multiplier
+    if returned <= 0:
+        raise ValueError("Durations must be positive")
+    return returned
+
 def Cmdline(**kwargs):
     return Metadata(cmdline=_Cmdline(**kwargs))
 
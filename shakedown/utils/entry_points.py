@@ -0,0 +1,26 @@
+_cached_entry_points = {}
+
+def iter_entry_points(group):
+    """
+    Yields the entry points registered under ``group``. The installed distributions are only scanned once per
+    group and process, since the scan is relatively expensive.
+    """
+    returned = _cached_entry_points.get(group)
+    if returned is None:
+        returned = _cached_entry_points[group] = list(_scan_entry_points(group))
+    return iter(returned)
+
+def clear_cache():
+    _cached_entry_points.clear()
+
+def _scan_entry_points(group):
+    try:
+        from importlib import metadata # pylint: disable=F0401,E0611
+    except ImportError:
+        # pkg_resources is slow to import, so we only fall back to it on old interpreters
+        import pkg_resources # pylint: disable=F0401
+        return pkg_resources.iter_entry_points(group)
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        return entry_points.select(group=group)
+    return entry_points.get(group, ())
@@ -0,0 +1,119 @@
+from six.moves import reprlib # pylint: disable=F0401
+from .fingerprint import get_exception_fingerprint
+import linecache
+
+class FrameInfo(object):
+    def __init__(self, filename, lineno, function_name, code_line, locals=None): # pylint: disable=W0622
+        super(FrameInfo, self).__init__()
+        self.filename = filename
+        self.lineno = lineno
+        self.function_name = function_name
+        self.code_line = code_line
+        #: mapping of local variable names to their (truncated) reprs, or None if locals were not captured
+        self.locals = locals
+    def __repr__(self):
+        return "<{0}:{1} in {2}>".format(self.filename, self.lineno, self.function_name)
+
+class ExceptionInfo(object):
+    """
+    A summary of an exception and its traceback, made only of plain values. Unlike the exception itself, it does not
+    keep the traceback's frames (and their locals) alive, and it can be pickled
+    """
+    def __init__(self, exception_type, exception_type_name, message, frames, fingerprint=None):
+        super(ExceptionInfo, self).__init__()
+        #: fully qualified name of the exception type, or None if no exception was being handled
+        self.exception_type = exception_type
+        self.exception_type_name = exception_type_name
+        self.message = message
+        #: list of :class:`FrameInfo`, outermost first
+        self.frames = frames
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def capture(cls, exc_info, capture_locals=False, max_repr_length=200, max_locals_size=8 * 1024):
+        """
+        Creates an :class:`ExceptionInfo` from a ``(type, value, traceback)`` tuple. If ``capture_locals`` is set, the
+        reprs of local variables are kept as well, starting from the innermost frame, until ``max_locals_size``
+        characters are used
+        """
+        exc_type, exc_value, tb = exc_info
+        frames = _capture_frames(tb)
+        if capture_locals:
+            _capture_locals(tb, frames, max_repr_length, max_locals_size)
+        if exc_type is None:
+            exception_type = exception_type_name = None
+        else:
+            exception_type_name = exc_type.__name__
+            exception_type = "{0}.{1}".format(exc_type.__module__, exception_type_name)
+        return cls(exception_type, exception_type_name, _get_message(exc_value), frames,
+                   fingerprint=get_exception_fingerprint(exc_info))
+
+    def format_traceback(self):
+        returned = ["Traceback (most recent call last):\n"]
+        for frame in self.frames:
+            returned.append('  File "{0}", line {1}, in {2}\n'.format(frame.filename, frame.lineno, frame.function_name))
+            if frame.code_line:
+                returned.append("    {0}\n".format(frame.code_line))
+            if frame.locals:
+                for name, value in sorted(frame.locals.items()):
+                    returned.append("      {0} = {1}\n".format(name, value))
+        returned.append("{0}\n".format(self))
+        return "".join(returned)
+
+    def to_dict(self):
+        """Returns a JSON-compatible summary, with the traceback already formatted"""
+        return {"type" : self.exception_type, "message" : self.message, "fingerprint" : self.fingerprint,
+                "traceback" : self.format_traceback()}
+
+    def __str__(self):
+        if self.exception_type_name is None:
+            return "<unknown exception>"
+        if not self.message:
+            return self.exception_type_name
+        return "{0}: {1}".format(self.exception_type_name, self.message)
+
+    def __repr__(self):
+        return "<ExceptionInfo: {0}>".format(self)
+
+def _get_message(exc_value):
+    if exc_value is None:
+        return ""
+    try:
+        return str(exc_value)
+    except Exception: # pylint: disable=W0703
+        return "<unprintable {0} object>".format(type(exc_value).__name__)
+
+def _iter_tb(tb):
+    while tb is not None:
+        yield tb
+        tb = tb.tb_next
+
+def _capture_frames(tb):
+    returned = []
+    for entry in _iter_tb(tb):
+        frame = entry.tb_frame
+        filename = frame.f_code.co_filename
+        code_line = linecache.getline(filename, entry.tb_lineno, frame.f_globals).strip() or None
+        returned.append(FrameInfo(filename, entry.tb_lineno, frame.f_code.co_name, code_line))
+    return returned
+
+def _capture_locals(tb, frames, max_repr_length, max_locals_size):
+    repr_obj = reprlib.Repr()
+    repr_obj.maxstring = repr_obj.maxother = max_repr_length
+    remaining = max_locals_size
+    for entry, frame_info in reversed(list(zip(_iter_tb(tb), frames))):
+        frame_info.locals = {}
+        for name, value in entry.tb_frame.f_locals.items():
+            value_repr = _safe_repr(repr_obj, value)
+            if len(value_repr) > max_repr_length:
+                value_repr = value_repr[:max_repr_length] + "..."
+            if len(value_repr) > remaining:
+                return
+            remaining -= len(value_repr)
+            frame_info.locals[name] = value_repr
+
+def _safe_repr(repr_obj, value):
+    try:
+        return repr_obj.repr(value)
+    except Exception: # pylint: disable=W0703
+        return "<unrepresentable {0} object>".format(type(value).__name__)
@@ -0,0 +1,47 @@
+import hashlib
+import re
+
+_NUM_FINGERPRINT_FRAMES = 3
+
+_MESSAGE_NORMALIZATIONS = [
+    (re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"), "<uuid>"),
+    (re.compile(r"0x[0-9a-fA-F]+"), "<address>"),
+    (re.compile(r"\d+"), "<number>"),
+]
+
+def get_exception_fingerprint(exc_info, num_frames=_NUM_FINGERPRINT_FRAMES):
+    """
+    Returns a string identifying the kind of an exception: its type, its message with varying parts (numbers,
+    addresses, uuids) normalized, and the innermost ``num_frames`` frames of its traceback. Exceptions caused by the
+    same problem (e.g. in different cases of a parameterized test) get the same fingerprint.
+    """
+    exc_type, exc_value, tb = exc_info
+    parts = [_get_type_name(exc_type), normalize_message(_get_message(exc_value))]
+    parts.extend("{0}:{1}:{2}".format(*frame) for frame in _get_innermost_frames(tb, num_frames))
+    return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+def normalize_message(message):
+    for pattern, replacement in _MESSAGE_NORMALIZATIONS:
+        message = pattern.sub(replacement, message)
+    return message
+
+def _get_type_name(exc_type):
+    if exc_type is None:
+        return ""
+    return "{0}.{1}".format(exc_type.__module__, exc_type.__name__)
+
+def _get_message(exc_value):
+    if exc_value is None:
+        return ""
+    try:
+        return str(exc_value)
+    except Exception: # pylint: disable=W0703
+        return ""
+
+def _get_innermost_frames(tb, num_frames):
+    returned = []
+    while tb is not None:
+        code = tb.tb_frame.f_code
+        returned.append((code.co_filename, code.co_name, tb.tb_lineno))
+        tb = tb.tb_next
+    return returned[-num_frames:]
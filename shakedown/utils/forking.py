@@ -0,0 +1,184 @@
+from six.moves import cPickle as pickle # pylint: disable=F0401
+import errno
+import itertools
+import logbook # pylint: disable=F0401
+import os
+import select
+import signal
+import struct
+import sys
+
+_logger = logbook.Logger(__name__)
+
+_HEADER = struct.Struct(">I")
+
+def iter_forked(items, func, batch_size=1, on_start=None):
+    """
+    Calls ``func`` on each of ``items`` in forked child processes, ``batch_size`` items per child, and yields
+    ``(item, return value, None)`` tuples as the children send back the (pickled) return values. If given,
+    ``on_start`` is called in the current process with each item, before the child running it is forked.
+
+    If a child dies before returning the values of its whole batch, ``(item, None, description)`` is yielded for the
+    item it was working on, with a description of how the child exited. The rest of the batch is passed to a new child.
+    Closing the generator kills the current child
+    """
+    items = iter(items)
+    pending = []
+    while True:
+        new_items = list(itertools.islice(items, batch_size - len(pending)))
+        if on_start is not None:
+            for item in new_items:
+                on_start(item)
+        pending.extend(new_items)
+        if not pending:
+            return
+        child = _Child(pending, func)
+        try:
+            for value in child.iter_values():
+                yield pending.pop(0), value, None
+            status = child.wait()
+            if pending:
+                yield pending.pop(0), None, _describe_exit_status(status)
+        finally:
+            child.kill()
+
+def iter_forked_concurrently(scheduler, func, concurrency, on_start=None):
+    """
+    Calls ``func`` on items taken from ``scheduler`` (a :class:`shakedown.scheduling.ResourceScheduler`), each in a
+    child process of its own, with up to ``concurrency`` children at once. Yields ``(item, return value, None)``
+    tuples as children finish, or ``(item, None, description)`` for children which died without returning a value.
+    If given, ``on_start`` is called in the current process with each item, before its child is forked.
+    Items are released back to the scheduler once their children exit. Closing the generator kills the children
+    """
+    running = {}
+    try:
+        while True:
+            while len(running) < concurrency:
+                item = scheduler.pop_runnable()
+                if item is None:
+                    break
+                if on_start is not None:
+                    on_start(item)
+                child = _Child([item], func)
+                running[child.fileno()] = (item, child)
+            if not running:
+                if scheduler.has_pending():
+                    raise RuntimeError("No item can be scheduled, although none is running")
+                return
+            for fd in _select_readable(list(running)):
+                item, child = running.pop(fd)
+                values = list(child.iter_values())
+                status = child.wait()
+                child.kill()
+                scheduler.release(item)
+                if values:
+                    yield item, values[0], None
+                else:
+                    yield item, None, _describe_exit_status(status)
+    finally:
+        for _, child in running.values():
+            child.kill()
+
+def _select_readable(fds):
+    while True:
+        try:
+            return select.select(fds, [], [])[0]
+        except select.error as e:
+            if e.args[0] != errno.EINTR:
+                raise
+
+class _Child(object):
+    def __init__(self, items, func):
+        super(_Child, self).__init__()
+        read_fd, write_fd = os.pipe()
+        _flush_std_streams()
+        self._pid = os.fork()
+        if self._pid == 0:
+            os.close(read_fd)
+            _child_main(write_fd, list(items), func)
+        os.close(write_fd)
+        self._file = os.fdopen(read_fd, "rb")
+        self._status = None
+
+    def fileno(self):
+        return self._file.fileno()
+
+    def iter_values(self):
+        while True:
+            header = self._read(_HEADER.size)
+            if header is None:
+                return
+            data = self._read(_HEADER.unpack(header)[0])
+            if data is None:
+                return
+            yield pickle.loads(data)
+
+    def _read(self, size):
+        data = self._file.read(size)
+        if len(data) < size:
+            # the child exited, possibly in the middle of writing
+            return None
+        return data
+
+    def wait(self):
+        if self._status is None:
+            while True:
+                try:
+                    _, self._status = os.waitpid(self._pid, 0)
+                    break
+                except OSError as e:
+                    if e.errno != errno.EINTR:
+                        raise
+        return self._status
+
+    def kill(self):
+        self._file.close()
+        if self._status is None:
+            try:
+                os.kill(self._pid, signal.SIGKILL)
+            except OSError as e:
+                if e.errno != errno.ESRCH:
+                    raise
+            self.wait()
+
+def _child_main(write_fd, items, func):
+    exit_code = 1
+    try:
+        with os.fdopen(write_fd, "wb") as f:
+            for item in items:
+                data = pickle.dumps(func(item), pickle.HIGHEST_PROTOCOL)
+                f.write(_HEADER.pack(len(data)))
+                f.write(data)
+                f.flush()
+        exit_code = 0
+    except:
+        _logger.error("Error in forked child process", exc_info=sys.exc_info())
+    finally:
+        _flush_std_streams()
+        # never return to the caller's stack in the child, nor run the parent's exit handlers
+        os._exit(exit_code) # pylint: disable=W0212
+
+def _flush_std_streams():
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except Exception: # pylint: disable=W0703
+            pass
+
+def _describe_exit_status(status):
+    if os.WIFSIGNALED(status):
+        signum = os.WTERMSIG(status)
+        return "Test process was killed by signal {0}".format(_get_signal_name(signum))
+    return "Test process exited with status {0}".format(os.WEXITSTATUS(status))
+
+def _get_signal_name(signum):
+    signals_enum = getattr(signal, "Signals", None)
+    if signals_enum is not None:
+        try:
+            return signals_enum(signum).name
+        except ValueError:
+            return str(signum)
+    for name in sorted(dir(signal)):
+        if name.startswith("SIG") and not name.startswith("SIG_") and getattr(signal, name) == signum:
+            return name
+    return str(signum)
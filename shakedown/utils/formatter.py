@@ -2,28 +2,49 @@ from __future__ import print_function
 from contextlib import contextmanager
 import errno
 
+_DEFAULT_FLUSH_THRESHOLD = 64 * 1024
+
 class Formatter(object):
-    def __init__(self, stream, indentation_string=" "):
+    """
+    Writes indented text to a stream. Output is collected in a buffer and written to the stream in bulk, whenever a
+    separator is written, the buffer exceeds ``flush_threshold`` characters, or :func:`flush` is called
+    """
+    def __init__(self, stream, indentation_string=" ", flush_threshold=_DEFAULT_FLUSH_THRESHOLD):
         super(Formatter, self).__init__()
         self._indentation_string = indentation_string
         self._indentation_list = []
         self._indentation = ""
         self._stream = stream
+        self._buffer = []
+        self._buffer_size = 0
+        self._flush_threshold = flush_threshold
     def write_separator(self, length=80):
         self.writeln("-" * length)
+        self.flush()
     def writeln(self, *args, **kwargs):
         self.write(end="\n", *args, **kwargs)
     def write(self, *args, **kwargs):
+        end = kwargs.pop('end', '')
+        for arg in args:
+            lines = str(arg).splitlines()
+            if self._indentation:
+                lines = [self._indentation + line for line in lines]
+            self._append("\n".join(lines))
+        self._append(end)
+        if self._buffer_size >= self._flush_threshold:
+            self.flush()
+    def _append(self, text):
+        if text:
+            self._buffer.append(text)
+            self._buffer_size += len(text)
+    def flush(self):
+        if not self._buffer:
+            return
+        text = "".join(self._buffer)
+        self._buffer = []
+        self._buffer_size = 0
         try:
-            end = kwargs.pop('end', '')
-            for arg in args:
-                lines = str(arg).splitlines()
-                for index, line in enumerate(lines):
-                    self._stream.write(self._indentation)
-                    self._stream.write(line)
-                    if index != len(lines) - 1:
-                        self._stream.write("\n")
-            self._stream.write(end)
+            self._stream.write(text)
         except IOError as e:
             if e.errno not in (errno.EIO, errno.EPIPE):
                 raise
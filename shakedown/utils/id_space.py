@@ -5,6 +5,10 @@ class IDSpace(object):
         super(IDSpace, self).__init__()
         if not base.endswith(":"):
             base += ":"
-        self._allocator = (base + str(i) for i in itertools.count(1))
+        self._base = base
+        self._counter = itertools.count(1)
     def allocate(self):
-        return next(self._allocator)
+        return self._base + str(next(self._counter))
+    def skip_to(self, index):
+        """Makes the following allocations start after ``index``, e.g. to continue a space used by another process"""
+        self._counter = itertools.count(index + 1)
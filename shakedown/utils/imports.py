@@ -8,16 +8,94 @@ _IS_PYTHON_3_3 = (platform.python_version() >= "3.3")
 
 from logbook import Logger # pylint: disable=F0401
 
+try:
+    # python 3.3 caches directory listings, and would not find newly created files without this
+    from importlib import invalidate_caches as _invalidate_import_caches # pylint: disable=E0611
+except ImportError:
+    def _invalidate_import_caches():
+        pass
+
 _logger = Logger(__name__)
 
 class NoInitFileFound(Exception):
     pass
 
-def import_file(filename):
-    module_name = _setup_module_name_for_import(filename)
+class ImportNamespace(object):
+    """
+    Keeps track of the synthetic packages :func:`import_file` registers in ``sys.modules``, one for each directory
+    files are imported from. Files imported into different namespaces are imported separately, and :func:`close`
+    removes a namespace's packages, along with all modules imported into them, from ``sys.modules``
+    """
+    def __init__(self):
+        super(ImportNamespace, self).__init__()
+        self._package_names = {}
+
+    def get_package_name(self, nonpackage_dir):
+        return self._package_names.get(nonpackage_dir, None)
+
+    def create_package(self, nonpackage_dir):
+        package_name = _generate_package_name()
+        sys.modules[package_name] = _create_package_module(package_name, nonpackage_dir)
+        self._package_names[nonpackage_dir] = package_name
+        return package_name
+
+    def close(self):
+        package_names = set(self._package_names.values())
+        self._package_names.clear()
+        for module_name in list(sys.modules):
+            if module_name.split(".", 1)[0] in package_names:
+                del sys.modules[module_name]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+_default_namespace = ImportNamespace()
+
+def import_file(filename, namespace=None):
+    module_name = _setup_module_name_for_import(filename, namespace or _default_namespace)
     returned = __import__(module_name, fromlist=[''])
     return returned
 
+def unload_file(filename, namespace=None):
+    """
+    Removes the module imported from ``filename`` by :func:`import_file` from ``sys.modules``, so that importing the
+    file again executes its current contents. The synthetic package containing it, and any other modules, are kept.
+    Returns whether the module was loaded
+    """
+    _invalidate_import_caches()
+    nonpackage_dir, remainder = _split_nonpackage_dir(filename)
+    package_name = (namespace or _default_namespace).get_package_name(nonpackage_dir)
+    if package_name is None:
+        return False
+    module_name = "{0}.{1}".format(package_name, remainder)
+    module = sys.modules.pop(module_name, None)
+    if module is None:
+        return False
+    _logger.debug("Unloaded {0} ({1})", module_name, filename)
+    parent_name, _, attr_name = module_name.rpartition(".")
+    parent = sys.modules.get(parent_name, None)
+    if parent is not None and getattr(parent, attr_name, None) is module:
+        delattr(parent, attr_name)
+    _remove_bytecode(module)
+    return True
+
+def _remove_bytecode(module):
+    # bytecode is only checked against the source's modification time in whole seconds (and its size), so a file
+    # changed right after being imported could otherwise be reimported from stale bytecode
+    bytecode_path = getattr(module, "__cached__", None)
+    if bytecode_path is None:
+        source_path = getattr(module, "__file__", None) or ""
+        if not source_path.endswith(".py"):
+            return
+        bytecode_path = source_path + "c"
+    try:
+        os.unlink(bytecode_path)
+    except OSError:
+        pass
+
 _package_name_generator = ('_{0}'.format(x) for x in itertools.count())
 
 def _generate_package_name():
@@ -28,20 +106,16 @@ def _generate_package_name():
 def _package_name_exists(pkg_name):
     return pkg_name in sys.modules
 
-def _setup_module_name_for_import(filename):
-    return _create_new_module_name(filename)
-
-_cached_package_names = {}
+def _setup_module_name_for_import(filename, namespace):
+    return _create_new_module_name(filename, namespace)
 
-def _create_new_module_name(filename):
+def _create_new_module_name(filename, namespace):
     _logger.debug("Creating new package for {0}", filename)
     nonpackage_dir, remainder = _split_nonpackage_dir(filename)
     _logger.debug("After split: {0}, {1}", nonpackage_dir, remainder)
-    package_name = _cached_package_names.get(nonpackage_dir, None)
+    package_name = namespace.get_package_name(nonpackage_dir)
     if package_name is None:
-        package_name = _generate_package_name()
-        sys.modules[package_name] = _create_package_module(package_name, nonpackage_dir)
-        _cached_package_names[nonpackage_dir] = package_name
+        package_name = namespace.create_package(nonpackage_dir)
     return '{0}.{1}'.format(package_name, remainder)
 
 def _split_nonpackage_dir(path):
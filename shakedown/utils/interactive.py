@@ -1,11 +1,11 @@
-try:
-    from IPython import embed # pylint: disable=F0401
-except ImportError:
-    import code
-    def _interact(ns):
+def _interact(ns):
+    # IPython takes a long time to import, so we only look for it when a shell is actually requested
+    try:
+        from IPython import embed # pylint: disable=F0401
+    except ImportError:
+        import code
         code.interact(local=ns)
-else:
-    def _interact(ns):
+    else:
         embed(user_ns=ns)
 
 def start_interactive_shell(**namespace):
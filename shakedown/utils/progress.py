@@ -0,0 +1,88 @@
+from .. import hooks
+import errno
+import time
+
+_HOOK_IDENTIFIER = "shakedown-progress"
+
+class ProgressReporter(object):
+    """
+    Displays the progress of a run, driven by the ``test_end`` hook. Counting a test is cheap, and the display is only
+    updated every ``update_interval`` seconds. When the stream is not a terminal, a line is printed every
+    ``plain_interval`` seconds instead
+    """
+    def __init__(self, stream, total=None, update_interval=0.1, plain_interval=30):
+        super(ProgressReporter, self).__init__()
+        self._stream = stream
+        self._total = total
+        self._is_tty = _is_tty(stream)
+        self._interval = update_interval if self._is_tty else plain_interval
+        self._start_time = self._next_update_time = None
+        self._num_completed = 0
+        self._counts = {"success" : 0, "failure" : 0, "error" : 0, "skip" : 0, "incomplete" : 0}
+        self._last_line_length = 0
+
+    def attach(self):
+        self._start_time = time.time()
+        self._next_update_time = self._start_time + self._interval
+        hooks.test_end.register(self._test_end, _HOOK_IDENTIFIER)
+
+    def detach(self):
+        hooks.test_end.unregister_by_identifier(_HOOK_IDENTIFIER)
+        if self._is_tty and self._num_completed:
+            self._display()
+            self._write("\n")
+
+    def __enter__(self):
+        self.attach()
+        return self
+
+    def __exit__(self, *_):
+        self.detach()
+
+    def _test_end(self, result):
+        self._num_completed += 1
+        self._counts[result.get_status()] += 1
+        now = time.time()
+        if now >= self._next_update_time:
+            self._next_update_time = now + self._interval
+            self._display(now)
+
+    def get_line(self, now=None):
+        if now is None:
+            now = time.time()
+        elapsed = now - self._start_time
+        if self._total is None:
+            returned = "{0} tests".format(self._num_completed)
+        else:
+            returned = "{0}/{1} tests ({2}%)".format(
+                self._num_completed, self._total, self._num_completed * 100 // max(self._total, 1))
+        if elapsed > 0:
+            returned += ", {0:.1f} tests/s".format(self._num_completed / elapsed)
+        return returned + ": {0[success]} successful, {0[failure]} failures, {0[error]} errors, {0[skip]} skipped".format(
+            self._counts)
+
+    def _display(self, now=None):
+        line = self.get_line(now)
+        if self._is_tty:
+            # pad with spaces to cover the remains of a longer previous line
+            self._write("\r" + line.ljust(self._last_line_length))
+            self._last_line_length = len(line)
+        else:
+            self._write(line + "\n")
+
+    def _write(self, text):
+        try:
+            self._stream.write(text)
+            flush = getattr(self._stream, "flush", None)
+            if flush is not None:
+                flush()
+        except IOError as e:
+            if e.errno not in (errno.EIO, errno.EPIPE):
+                raise
+
+def _is_tty(stream):
+    isatty = getattr(stream, "isatty", None)
+    try:
+        return isatty is not None and isatty()
+    except ValueError: # closed file
+        return False
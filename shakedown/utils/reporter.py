@@ -1,29 +1,118 @@
 from .formatter import Formatter
-import itertools
+from .. import hooks
+from ..conf import config
 
 _REPORT_COLUMNS = [
     ("Successful", "get_num_successful"),
     ("Failures", "get_num_failures"),
     ("Errors", "get_num_errors"),
     ("Skipped", "get_num_skipped"),
+    ("Flaky", "get_num_flaky"),
     ]
 
+_MAX_REPORTED_HOOK_LATENCIES = 10
+_MAX_EXAMPLES_PER_FAILURE_GROUP = 3
+_MAX_REPORTED_BUDGET_SKIPS = 20
+_MAX_REPORTED_RESOURCE_USERS = 5
+
 class Reporter(object):
     def __init__(self, stream):
         super(Reporter, self).__init__()
         self._formatter = Formatter(stream)
-    def report_session(self, session):
-        self._describe_unsuccessful(session)
-        self._describe_summary(session)
+    def report_session(self, session, time_budget=None):
+        try:
+            self._describe_unsuccessful(session)
+            self._describe_flaky(session)
+            if time_budget is not None:
+                self._describe_budget_skips(time_budget)
+            self._describe_resource_waits(session)
+            self._describe_resource_usage(session)
+            self._describe_hook_latencies()
+            self._describe_summary(session)
+        finally:
+            self._formatter.flush()
     def _describe_unsuccessful(self, session):
         self._formatter.write_separator()
-        for result in session.iter_results():
-            if result.is_success():
-                continue
-            self._formatter.writeln("> ", result.test_metadata)
+        show_tracebacks = config.root.tracebacks.in_report
+        for group in session.result.get_failure_groups(max_examples=_MAX_EXAMPLES_PER_FAILURE_GROUP):
+            self._formatter.writeln("> {0} x {1}".format(group.count, group.get_description()))
             with self._formatter.indented():
-                for x in itertools.chain(result.get_failures(), result.get_errors()):
-                    self._formatter.writeln(x)
+                for test_metadata in group.examples:
+                    self._formatter.writeln(test_metadata)
+                if group.count > len(group.examples):
+                    self._formatter.writeln("... and {0} more".format(group.count - len(group.examples)))
+                if show_tracebacks and group.exception is not None and group.exception.frames:
+                    self._formatter.writeln(group.exception.format_traceback())
+    def _describe_flaky(self, session):
+        flaky = [result for result in session.iter_results() if result.is_flaky()]
+        if not flaky:
+            return
+        self._formatter.write_separator()
+        self._formatter.writeln("Flaky tests (succeeded after retrying):")
+        with self._formatter.indented():
+            for result in flaky:
+                self._formatter.writeln("{0} ({1} attempts)".format(result.test_metadata, result.get_num_attempts()))
+    def _describe_budget_skips(self, time_budget):
+        if not time_budget.skipped:
+            return
+        self._formatter.write_separator()
+        self._formatter.writeln("{0} tests not run within the time budget ({1:g}s):".format(
+            len(time_budget.skipped), time_budget.seconds))
+        with self._formatter.indented():
+            for test_metadata, reason in time_budget.skipped[:_MAX_REPORTED_BUDGET_SKIPS]:
+                self._formatter.writeln("{0} ({1})".format(test_metadata, reason))
+            if len(time_budget.skipped) > _MAX_REPORTED_BUDGET_SKIPS:
+                self._formatter.writeln("... and {0} more".format(len(time_budget.skipped) - _MAX_REPORTED_BUDGET_SKIPS))
+    def _describe_resource_waits(self, session):
+        waits = sorted(session.resource_wait_seconds.items(), key=lambda item: item[1], reverse=True)
+        if not waits:
+            return
+        self._formatter.write_separator()
+        self._formatter.writeln("Time tests spent waiting for resources:")
+        with self._formatter.indented():
+            for name, seconds in waits:
+                self._formatter.writeln("{0}: {1:.3f}s".format(name, seconds))
+    def _describe_resource_usage(self, session):
+        usages = [(result.test_metadata, result.resource_usage) for result in session.iter_results()
+                  if result.resource_usage is not None]
+        if not usages:
+            return
+        self._formatter.write_separator()
+        self._describe_resource_leaders("Tests using the most CPU time:", usages, lambda usage: usage.get_cpu_seconds(),
+                                        "s", precision=3)
+        self._describe_resource_leaders("Tests growing the most in memory:", usages,
+                                        lambda usage: usage.get_rss_growth(), "MB", precision=1, scale=1024 * 1024)
+        leaking = [(test_metadata, usage.leaks) for test_metadata, usage in usages if usage.leaks]
+        if leaking:
+            self._formatter.writeln("Tests leaking resources:")
+            with self._formatter.indented():
+                for test_metadata, leaks in leaking:
+                    self._formatter.writeln("{0}: {1}".format(test_metadata, ", ".join(leaks)))
+    def _describe_resource_leaders(self, title, usages, get_figure, unit, precision, scale=1):
+        leaders = []
+        for test_metadata, usage in usages:
+            figure = get_figure(usage)
+            # figures which would be printed as zero are left out
+            if figure is not None and round(figure / float(scale), precision) > 0:
+                leaders.append((figure / float(scale), test_metadata))
+        if not leaders:
+            return
+        leaders.sort(key=lambda item: -item[0])
+        self._formatter.writeln(title)
+        with self._formatter.indented():
+            for figure, test_metadata in leaders[:_MAX_REPORTED_RESOURCE_USERS]:
+                self._formatter.writeln("{0}: {1:.{2}f}{3}".format(test_metadata, figure, precision, unit))
+    def _describe_hook_latencies(self):
+        latencies = sorted(hooks.get_latencies().items(), key=lambda item: item[1].total_seconds, reverse=True)
+        if not latencies:
+            return
+        self._formatter.write_separator()
+        self._formatter.writeln("Slowest hook callbacks:")
+        with self._formatter.indented():
+            for (hook_name, identifier), latency in latencies[:_MAX_REPORTED_HOOK_LATENCIES]:
+                self._formatter.writeln("{0} ({1}): {2:.3f}s total, {3} calls, {4:.3f}ms per call".format(
+                    "<anonymous>" if identifier is None else identifier, hook_name,
+                    latency.total_seconds, latency.num_calls, latency.get_average_seconds() * 1000))
     def _describe_summary(self, session):
         self._formatter.write_separator()
         for col, _ in _REPORT_COLUMNS:
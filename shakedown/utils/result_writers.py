@@ -0,0 +1,138 @@
+from datetime import datetime
+from xml.sax.saxutils import escape, quoteattr
+import json
+import os
+import re
+import six
+
+# characters which may not appear in XML documents, even escaped
+_INVALID_XML_CHARS = re.compile(u"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# room left in the <testsuite> tag for the counts written when the file is finalized
+_RESERVED_HEADER_SPACE = 200
+
+class JSONLinesResultWriter(object):
+    """
+    Appends a JSON object per finished test to a file. Every line is written in full and flushed as soon as the test
+    ends, so the file is usable even if the run is killed
+    """
+    def __init__(self, path, session_id):
+        super(JSONLinesResultWriter, self).__init__()
+        self._session_id = session_id
+        self._file = _open_for_writing(path)
+
+    def add_result(self, result):
+        record = {
+            "session_id" : self._session_id,
+            "test_id" : getattr(result.test_metadata, "id", None),
+            "name" : _get_test_name(result),
+            "status" : result.get_status(),
+            "duration" : result.get_duration(),
+            "num_attempts" : result.get_num_attempts(),
+            "errors" : [error.to_dict() for error in result.get_errors()],
+            "failures" : [failure.to_dict() for failure in result.get_failures()],
+            "skips" : [six.text_type(reason) for reason in result.get_skips()],
+        }
+        self._file.write(_to_bytes(json.dumps(record, sort_keys=True) + "\n"))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+class JUnitXMLResultWriter(object):
+    """
+    Writes results to a JUnit XML file as tests end. The closing tag is rewritten after each test, so the file is
+    always a valid document containing all tests finished so far. :func:`close` fills in the suite totals
+    """
+    def __init__(self, path, suite_name="shakedown"):
+        super(JUnitXMLResultWriter, self).__init__()
+        self._suite_attributes = "name={0} timestamp={1}".format(
+            _quote_xml_attribute(suite_name), quoteattr(datetime.utcnow().replace(microsecond=0).isoformat()))
+        self._counts = {"tests" : 0, "failures" : 0, "errors" : 0, "skipped" : 0}
+        self._total_time = 0.0
+        self._file = _open_for_writing(path)
+        self._file.write(_to_bytes('<?xml version="1.0" encoding="utf-8"?>\n'))
+        self._header_offset = self._file.tell()
+        self._header_length = len(self._get_suite_tag()) + _RESERVED_HEADER_SPACE
+        self._write_suite_tag()
+        self._footer_offset = self._file.tell()
+        self._write_footer()
+
+    def add_result(self, result):
+        self._counts["tests"] += 1
+        duration = result.get_duration() or 0.0
+        self._total_time += duration
+        classname, _, name = _get_test_name(result).rpartition(":")
+        parts = ['  <testcase classname={0} name={1} time="{2:.3f}"'.format(
+            _quote_xml_attribute(classname), _quote_xml_attribute(name), duration)]
+        children = []
+        for tag, exceptions in (("error", result.get_errors()), ("failure", result.get_failures())):
+            for exception in exceptions:
+                children.append("    <{0} type={1} message={2}>{3}</{0}>\n".format(
+                    tag, _quote_xml_attribute(exception.exception_type or ""), _quote_xml_attribute(exception.message),
+                    _escape_xml(exception.format_traceback())))
+        if result.is_error():
+            self._counts["errors"] += 1
+        elif result.is_failure():
+            self._counts["failures"] += 1
+        elif result.is_skip():
+            self._counts["skipped"] += 1
+            children.extend("    <skipped message={0}/>\n".format(_quote_xml_attribute(six.text_type(reason)))
+                            for reason in result.get_skips())
+        if children:
+            parts.append(">\n")
+            parts.extend(children)
+            parts.append("  </testcase>\n")
+        else:
+            parts.append("/>\n")
+        self._file.seek(self._footer_offset)
+        self._file.write(_to_bytes("".join(parts)))
+        self._footer_offset = self._file.tell()
+        self._write_footer()
+
+    def close(self):
+        self._file.seek(self._header_offset)
+        self._write_suite_tag()
+        self._file.close()
+
+    def _get_suite_tag(self):
+        return '<testsuite {0} tests="{1[tests]}" failures="{1[failures]}" errors="{1[errors]}" skipped="{1[skipped]}" time="{2:.3f}"'.format(
+            self._suite_attributes, self._counts, self._total_time)
+
+    def _write_suite_tag(self):
+        tag = self._get_suite_tag()
+        if len(tag) > self._header_length:
+            # cannot happen with realistic counts, but never overwrite the test cases that follow
+            return
+        self._file.write(_to_bytes(tag.ljust(self._header_length) + ">\n"))
+        self._file.flush()
+
+    def _write_footer(self):
+        self._file.write(_to_bytes("</testsuite>\n"))
+        self._file.flush()
+
+def _open_for_writing(path):
+    path = os.path.expanduser(path)
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+    return open(path, "wb")
+
+def _get_test_name(result):
+    return getattr(result.test_metadata, "canonical_name", None) or repr(result.test_metadata)
+
+def _to_bytes(text):
+    if isinstance(text, bytes):
+        return text
+    return text.encode("utf-8")
+
+def _to_text(text):
+    if isinstance(text, bytes):
+        return text.decode("utf-8", "replace")
+    return six.text_type(text)
+
+def _escape_xml(text):
+    return escape(_INVALID_XML_CHARS.sub(u"?", _to_text(text)))
+
+def _quote_xml_attribute(text):
+    return quoteattr(_INVALID_XML_CHARS.sub(u"?", _to_text(text)))
@@ -0,0 +1,86 @@
+import os
+import sqlite3
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, start_time REAL, end_time REAL)",
+    "CREATE TABLE IF NOT EXISTS results (session_id TEXT, name TEXT, status TEXT, start_time REAL, duration REAL, fingerprint TEXT)",
+    # covers the queries over time windows, so they never need to read the table itself
+    "CREATE INDEX IF NOT EXISTS results_by_time ON results (start_time, name, status, duration)",
+    "CREATE INDEX IF NOT EXISTS results_by_name ON results (name, start_time)",
+    "CREATE INDEX IF NOT EXISTS results_by_session ON results (session_id)",
+]
+
+_UNSUCCESSFUL_STATUSES = ("failure", "error")
+
+class ResultsDatabase(object):
+    """
+    Stores sessions and test results in a SQLite database, for querying trends across sessions
+    """
+    def __init__(self, path):
+        super(ResultsDatabase, self).__init__()
+        path = os.path.expanduser(path)
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        self._connection = sqlite3.connect(path, timeout=30)
+        with self._connection:
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+
+    def close(self):
+        self._connection.close()
+
+    def add_session(self, session_id, start_time):
+        with self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO sessions (id, start_time) VALUES (?, ?)", (session_id, start_time))
+
+    def end_session(self, session_id, end_time):
+        with self._connection:
+            self._connection.execute("UPDATE sessions SET end_time = ? WHERE id = ?", (end_time, session_id))
+
+    def add_results(self, rows):
+        """
+        Inserts results in a single transaction. Each row is a tuple of (session id, canonical name, status,
+        start time, duration, fingerprint)
+        """
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO results (session_id, name, status, start_time, duration, fingerprint) VALUES (?, ?, ?, ?, ?, ?)",
+                rows)
+
+    def get_slower_tests(self, since, previous_since, limit=20):
+        """
+        Compares the average duration of successful runs of each test since ``since`` with the one between
+        ``previous_since`` and ``since``. Returns (name, previous average, recent average) tuples of the tests which
+        got slower, by the increase in duration
+        """
+        return self._connection.execute(
+            "SELECT name, previous, recent FROM ("
+            "  SELECT name,"
+            "    AVG(CASE WHEN start_time < :since THEN duration END) AS previous,"
+            "    AVG(CASE WHEN start_time >= :since THEN duration END) AS recent"
+            "  FROM results WHERE start_time >= :previous_since AND status = 'success' AND duration IS NOT NULL"
+            "  GROUP BY name"
+            ") WHERE recent > previous ORDER BY recent - previous DESC LIMIT :limit",
+            {"since" : since, "previous_since" : previous_since, "limit" : limit}).fetchall()
+
+    def get_flaky_tests(self, since, limit=20):
+        """
+        Returns (name, number of runs, number of unsuccessful runs) tuples of tests which both succeeded and failed
+        since ``since``, by failure rate
+        """
+        return self._connection.execute(
+            "SELECT name, runs, unsuccessful FROM ("
+            "  SELECT name, COUNT(*) AS runs, SUM(CASE WHEN status IN (?, ?) THEN 1 ELSE 0 END) AS unsuccessful,"
+            "    SUM(CASE WHEN status = 'success' THEN 1 ELSE 0 END) AS successful"
+            "  FROM results WHERE start_time >= ? GROUP BY name"
+            ") WHERE unsuccessful > 0 AND successful > 0 ORDER BY unsuccessful * 1.0 / runs DESC, runs DESC LIMIT ?",
+            _UNSUCCESSFUL_STATUSES + (since, limit)).fetchall()
+
+    def get_test_history(self, name, limit=20):
+        """
+        Returns (session id, status, start time, duration, fingerprint) tuples of the latest runs of a test, newest first
+        """
+        return self._connection.execute(
+            "SELECT session_id, status, start_time, duration, fingerprint FROM results WHERE name = ?"
+            " ORDER BY start_time DESC LIMIT ?", (name, limit)).fetchall()
@@ -0,0 +1,267 @@
+import errno
+import json
+import logbook # pylint: disable=F0401
+import os
+import select
+import signal
+import socket
+import struct
+import sys
+import traceback
+
+_logger = logbook.Logger(__name__)
+
+# every message is a frame: a one-byte type, the payload length and the payload
+_HEADER = struct.Struct(">cI")
+_EXIT_CODE = struct.Struct(">i")
+
+_REQUEST = b"R"
+_STDOUT = b"O"
+_STDERR = b"E"
+_EXIT = b"X"
+
+_READ_SIZE = 64 * 1024
+_REAP_INTERVAL_SECONDS = 1
+
+class ServerError(Exception):
+    pass
+
+class Server(object):
+    """
+    Serves run requests over a Unix socket. Every request is handled in a process forked from the server, which in turn
+    forks a process calling ``run_func`` with the request's arguments, so modules imported by the server before
+    :func:`serve_forever` are already imported there, and state changed by a request never leaks into the next one.
+    The output of the run is streamed back to the client, followed by its exit code
+    """
+    def __init__(self, socket_path, run_func):
+        super(Server, self).__init__()
+        self._socket_path = socket_path
+        self._run_func = run_func
+        self._listener = None
+
+    def listen(self):
+        if os.path.exists(self._socket_path):
+            if _is_listening(self._socket_path):
+                raise ServerError("A server is already listening on {0}".format(self._socket_path))
+            os.unlink(self._socket_path)
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o077)
+        try:
+            self._listener.bind(self._socket_path)
+        finally:
+            os.umask(old_umask)
+        self._listener.listen(16)
+        # accepting wakes up periodically, to reap the processes of finished requests
+        self._listener.settimeout(_REAP_INTERVAL_SECONDS)
+
+    def serve_forever(self):
+        if self._listener is None:
+            self.listen()
+        _logger.debug("Serving on {0}", self._socket_path)
+        try:
+            while True:
+                _reap_children()
+                try:
+                    conn, _ = self._listener.accept()
+                except socket.timeout:
+                    continue
+                except socket.error as e:
+                    if e.errno == errno.EINTR:
+                        continue
+                    raise
+                conn.setblocking(True)
+                try:
+                    self._fork_handler(conn)
+                finally:
+                    conn.close()
+        finally:
+            self.close()
+
+    def close(self):
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+            if os.path.exists(self._socket_path):
+                os.unlink(self._socket_path)
+
+    def _fork_handler(self, conn):
+        _flush_std_streams()
+        if os.fork() != 0:
+            return
+        exit_code = 1
+        try:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            self._listener.close()
+            self._handle(conn)
+            exit_code = 0
+        except:
+            _logger.error("Error handling request", exc_info=sys.exc_info())
+        finally:
+            # never return to the server's loop in the child, nor run its exit handlers
+            os._exit(exit_code) # pylint: disable=W0212
+
+    def _handle(self, conn):
+        frame_type, payload = _recv_frame(conn)
+        if frame_type != _REQUEST:
+            raise ServerError("Unexpected frame type: {0!r}".format(frame_type))
+        request = json.loads(payload.decode("utf-8"))
+        out_read, out_write = os.pipe()
+        err_read, err_write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            conn.close()
+            os.close(out_read)
+            os.close(err_read)
+            self._run_request(request, out_write, err_write)
+        os.close(out_write)
+        os.close(err_write)
+        try:
+            _relay(conn, {out_read : _STDOUT, err_read : _STDERR})
+        except _ClientGone:
+            _logger.debug("Client disconnected, killing process {0}", pid)
+            os.kill(pid, signal.SIGKILL)
+            _waitpid(pid)
+            return
+        _send_frame(conn, _EXIT, _EXIT_CODE.pack(_get_exit_code(_waitpid(pid))))
+
+    def _run_request(self, request, out_write, err_write):
+        exit_code = 1
+        try:
+            null_fd = os.open(os.devnull, os.O_RDONLY)
+            for fd, target in [(null_fd, 0), (out_write, 1), (err_write, 2)]:
+                os.dup2(fd, target)
+                os.close(fd)
+            _flush_std_streams()
+            # the standard streams may have been replaced by objects not writing to the standard file descriptors
+            sys.stdout = os.fdopen(1, "w")
+            sys.stderr = os.fdopen(2, "w")
+            os.chdir(request["cwd"])
+            os.environ.clear()
+            os.environ.update(request["environ"])
+            exit_code = self._run_func(request["argv"])
+        except SystemExit as e:
+            exit_code = e.code
+        except:
+            traceback.print_exc()
+        finally:
+            if exit_code is None:
+                exit_code = 0
+            elif not isinstance(exit_code, int):
+                sys.stderr.write("{0}\n".format(exit_code))
+                exit_code = 1
+            _flush_std_streams()
+            os._exit(exit_code & 0xFF) # pylint: disable=W0212
+
+def run_remote(socket_path, argv, cwd=None, environ=None, stdout=None, stderr=None):
+    """
+    Sends a run request to the :class:`Server` listening on ``socket_path``, writes the output of the run to ``stdout``
+    and ``stderr`` as it arrives, and returns its exit code. The request is run in ``cwd`` with ``environ`` as its
+    environment, defaulting to those of the calling process
+    """
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            conn.connect(socket_path)
+        except socket.error as e:
+            raise ServerError("Could not connect to a server on {0}: {1}".format(socket_path, e))
+        request = {
+            "argv" : list(argv),
+            "cwd" : os.getcwd() if cwd is None else cwd,
+            "environ" : dict(os.environ if environ is None else environ),
+        }
+        _send_frame(conn, _REQUEST, json.dumps(request).encode("utf-8"))
+        streams = {
+            _STDOUT : _get_binary_stream(sys.stdout if stdout is None else stdout),
+            _STDERR : _get_binary_stream(sys.stderr if stderr is None else stderr),
+        }
+        while True:
+            frame_type, payload = _recv_frame(conn)
+            if frame_type == _EXIT:
+                return _EXIT_CODE.unpack(payload)[0]
+            stream = streams[frame_type]
+            stream.write(payload)
+            stream.flush()
+    finally:
+        conn.close()
+
+class _ClientGone(Exception):
+    pass
+
+def _relay(conn, fds):
+    while fds:
+        readable, _, _ = select.select(list(fds) + [conn], [], [])
+        if conn in readable and not conn.recv(1):
+            raise _ClientGone()
+        for fd in readable:
+            if fd is conn:
+                continue
+            data = os.read(fd, _READ_SIZE)
+            if not data:
+                os.close(fd)
+                fds.pop(fd)
+                continue
+            try:
+                _send_frame(conn, fds[fd], data)
+            except socket.error:
+                raise _ClientGone()
+
+def _send_frame(conn, frame_type, payload):
+    conn.sendall(_HEADER.pack(frame_type, len(payload)) + payload)
+
+def _recv_frame(conn):
+    frame_type, length = _HEADER.unpack(_recv_exactly(conn, _HEADER.size))
+    return frame_type, _recv_exactly(conn, length)
+
+def _recv_exactly(conn, size):
+    returned = b""
+    while len(returned) < size:
+        data = conn.recv(size - len(returned))
+        if not data:
+            raise ServerError("Connection closed unexpectedly")
+        returned += data
+    return returned
+
+def _is_listening(socket_path):
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except socket.error:
+        return False
+    finally:
+        probe.close()
+    return True
+
+def _reap_children():
+    while True:
+        try:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+        except OSError as e:
+            if e.errno == errno.ECHILD:
+                return
+            raise
+        if pid == 0:
+            return
+
+def _waitpid(pid):
+    while True:
+        try:
+            return os.waitpid(pid, 0)[1]
+        except OSError as e:
+            if e.errno != errno.EINTR:
+                raise
+
+def _get_exit_code(status):
+    if os.WIFSIGNALED(status):
+        # like shells do
+        return 128 + os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+def _get_binary_stream(stream):
+    return getattr(stream, "buffer", stream)
+
+def _flush_std_streams():
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except Exception: # pylint: disable=W0703
+            pass
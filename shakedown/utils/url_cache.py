@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import time
+from logbook import Logger # pylint: disable=F0401
+from .path import ensure_directory
+
+_logger = Logger(__name__)
+
+class URLCache(object):
+    """
+    Keeps local copies of files fetched over HTTP, keyed by URL.
+
+    Copies younger than ``ttl_seconds`` are returned without contacting the server. Older copies are revalidated
+    with a conditional request (ETag/Last-Modified), and are returned as-is if the server cannot be reached.
+    """
+    def __init__(self, root, ttl_seconds, timeout):
+        super(URLCache, self).__init__()
+        self._root = root
+        self._ttl_seconds = ttl_seconds
+        self._timeout = timeout
+
+    def get(self, url):
+        """
+        Returns the contents of ``url``, either from the cache or from the server
+        """
+        metadata, content = self._read(url)
+        if metadata is not None and time.time() - metadata["fetched_at"] < self._ttl_seconds:
+            _logger.debug("Using cached copy of {0}", url)
+            return content
+        import requests # pylint: disable=F0401
+        try:
+            response = requests.get(url, headers=_get_conditional_headers(metadata), timeout=self._timeout)
+            if response.status_code == requests.codes.not_modified and metadata is not None: # pylint: disable=E1101
+                _logger.debug("{0} not modified since last fetched", url)
+                self._write(url, metadata, content)
+                return content
+            response.raise_for_status()
+        except requests.RequestException:
+            if metadata is None:
+                raise
+            _logger.warning("Could not fetch {0}, falling back to cached copy", url, exc_info=True)
+            return content
+        self._write(url, {
+            "url" : url,
+            "etag" : response.headers.get("ETag"),
+            "last_modified" : response.headers.get("Last-Modified"),
+        }, response.content)
+        return response.content
+
+    def _read(self, url):
+        metadata_path, content_path = self._get_paths(url)
+        try:
+            with open(metadata_path, "r") as f:
+                metadata = json.load(f)
+            with open(content_path, "rb") as f:
+                content = f.read()
+        except (IOError, OSError, ValueError):
+            return None, None
+        if metadata.get("url") != url:
+            return None, None
+        return metadata, content
+
+    def _write(self, url, metadata, content):
+        metadata = dict(metadata, fetched_at=time.time())
+        metadata_path, content_path = self._get_paths(url)
+        try:
+            ensure_directory(self._root)
+            # content first, so that the metadata never describes a partially written file
+            _write_atomically(content_path, content)
+            _write_atomically(metadata_path, json.dumps(metadata).encode("utf-8"))
+        except (IOError, OSError):
+            _logger.warning("Could not cache {0} under {1}", url, self._root, exc_info=True)
+
+    def _get_paths(self, url):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self._root, key + ".json"), os.path.join(self._root, key)
+
+def _get_conditional_headers(metadata):
+    returned = {}
+    if metadata is not None:
+        if metadata.get("etag"):
+            returned["If-None-Match"] = metadata["etag"]
+        if metadata.get("last_modified"):
+            returned["If-Modified-Since"] = metadata["last_modified"]
+    return returned
+
+def _write_atomically(path, data):
+    tmp_path = "{0}.{1}.tmp".format(path, os.getpid())
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    getattr(os, "replace", os.rename)(tmp_path, path)
@@ -0,0 +1,51 @@
+import os
+import time
+
+class FileWatcher(object):
+    """
+    Polls the Python files under a list of paths (files or directories) for changes
+    """
+    def __init__(self, paths, interval=1):
+        super(FileWatcher, self).__init__()
+        self._paths = list(paths)
+        self._interval = interval
+        self._snapshot = self._take_snapshot()
+
+    def poll(self):
+        """
+        Returns a sorted list of the files created or modified since the previous poll (or since construction)
+        """
+        snapshot = self._take_snapshot()
+        returned = sorted(path for path, stat in snapshot.items() if self._snapshot.get(path) != stat)
+        self._snapshot = snapshot
+        return returned
+
+    def iter_changes(self):
+        """
+        Yields lists of changed files, as returned by :func:`poll`, whenever files change
+        """
+        while True:
+            time.sleep(self._interval)
+            changed = self.poll()
+            if changed:
+                yield changed
+
+    def _take_snapshot(self):
+        returned = {}
+        for path in _iter_python_files(self._paths):
+            try:
+                stat = os.stat(path)
+            except OSError: # deleted while walking
+                continue
+            returned[path] = (stat.st_mtime, stat.st_size)
+        return returned
+
+def _iter_python_files(paths):
+    for path in paths:
+        if os.path.isfile(path):
+            yield os.path.abspath(path)
+            continue
+        for dirname, _, filenames in os.walk(path):
+            for filename in filenames:
+                if filename.endswith(".py"):
+                    yield os.path.abspath(os.path.join(dirname, filename))
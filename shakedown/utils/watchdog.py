@@ -0,0 +1,86 @@
+from .background import start_internal_thread
+import os
+import sys
+import threading
+import time
+import traceback
+
+class Watchdog(object):
+    """
+    Calls a function from a daemon thread, unless disarmed within a given time. The thread is started on first use.
+
+    The function is called with the watchdog's lock held, so once :func:`disarm` returns it is guaranteed to have
+    either completed or not to be called at all
+    """
+    def __init__(self, name):
+        super(Watchdog, self).__init__()
+        self._name = name
+        self._condition = threading.Condition()
+        self._deadline = None
+        self._callback = None
+        self._thread = None
+        self._pid = None
+
+    def arm(self, timeout, callback):
+        with self._condition:
+            self._ensure_started()
+            self._deadline = time.time() + timeout
+            self._callback = callback
+            self._condition.notify()
+
+    def disarm(self):
+        with self._condition:
+            self._deadline = self._callback = None
+            self._condition.notify()
+
+    def _ensure_started(self):
+        # threads do not survive fork(), so a watchdog started by a parent process is restarted in children
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._thread = start_internal_thread(self._work, self._name)
+
+    def _work(self):
+        with self._condition:
+            while True:
+                if self._deadline is None:
+                    self._condition.wait()
+                    continue
+                remaining = self._deadline - time.time()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                    continue
+                callback = self._callback
+                self._deadline = self._callback = None
+                callback()
+
+def dump_stacks(f):
+    """
+    Writes the stacks of all threads to the file object ``f``
+    """
+    try:
+        import faulthandler
+    except ImportError:
+        faulthandler = None
+    if faulthandler is not None:
+        f.flush()
+        try:
+            faulthandler.dump_traceback(file=f, all_threads=True)
+            return
+        except (AttributeError, ValueError, IOError): # no file descriptor behind f
+            pass
+    for thread_id, frame in sys._current_frames().items(): # pylint: disable=W0212
+        f.write("Thread 0x{0:x} (most recent call first):\n".format(thread_id))
+        f.write("".join(reversed(traceback.format_stack(frame))))
+        f.write("\n")
+    f.flush()
+
+def raise_in_thread(thread_id, exception_type):
+    """
+    Asynchronously raises ``exception_type`` in another thread, once it executes Python code. Passing None cancels
+    a pending exception
+    """
+    import ctypes
+    thread_id_type = ctypes.c_ulong if sys.version_info >= (3, 7) else ctypes.c_long
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(thread_id_type(thread_id),
+                                               None if exception_type is None else ctypes.py_object(exception_type))
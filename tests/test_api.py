@@ -0,0 +1,73 @@
+from .utils import TestCase
+from .utils import NullFile
+from shakedown.conf import config
+from shakedown.utils import imports
+import os
+import re
+import shakedown
+import shutil
+import sys
+import tempfile
+
+_TEST_FILE = """
+import shakedown
+import sys
+
+class EmbeddedTest(shakedown.Test):
+    def test_succeed(self):
+        pass
+    def test_check_stop_on_error(self):
+        assert not shakedown.config.root.run.stop_on_error
+"""
+
+_SYNTHETIC_PACKAGE_PATTERN = re.compile(r"^_\d+$")
+
+class RunSessionTest(TestCase):
+    def setUp(self):
+        super(RunSessionTest, self).setUp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.path = os.path.join(self.root, "test_embedded.py")
+        with open(self.path, "w") as f:
+            f.write(_TEST_FILE)
+    def test_success(self):
+        session = shakedown.run_session([self.path])
+        self.assertTrue(session.result.is_success())
+        self.assertEquals(session.result.get_num_successful(), 2)
+    def test_argv(self):
+        session = shakedown.run_session([self.path], argv=["-x"])
+        self.assertFalse(session.result.is_success())
+        self.assertFalse(config.root.run.stop_on_error)
+    def test_report(self):
+        shakedown.run_session([self.path], report_stream=NullFile())
+    def test_modules_not_leaked(self):
+        before = self._get_synthetic_packages()
+        for _ in range(3):
+            self.assertTrue(shakedown.run_session([self.path]).result.is_success())
+        self.assertEquals(self._get_synthetic_packages(), before)
+        self.assertIsNone(imports._default_namespace.get_package_name(self.root)) # pylint: disable=W0212
+    def _get_synthetic_packages(self):
+        return set(name for name in sys.modules if _SYNTHETIC_PACKAGE_PATTERN.match(name.split(".")[0]))
+
+class ImportNamespaceTest(TestCase):
+    def setUp(self):
+        super(ImportNamespaceTest, self).setUp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.path = os.path.join(self.root, "imported.py")
+        with open(self.path, "w") as f:
+            f.write("value = object()")
+    def test_close(self):
+        with imports.ImportNamespace() as namespace:
+            module = imports.import_file(self.path, namespace=namespace)
+            package_name = module.__name__.split(".")[0]
+            self.assertIs(sys.modules[module.__name__], module)
+        self.assertNotIn(module.__name__, sys.modules)
+        self.assertNotIn(package_name, sys.modules)
+    def test_separate_namespaces(self):
+        with imports.ImportNamespace() as first:
+            with imports.ImportNamespace() as second:
+                first_module = imports.import_file(self.path, namespace=first)
+                self.assertIs(imports.import_file(self.path, namespace=first), first_module)
+                second_module = imports.import_file(self.path, namespace=second)
+                self.assertIsNot(second_module.value, first_module.value)
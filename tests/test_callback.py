@@ -1,6 +1,7 @@
 from .utils import TestCase
 from .utils import CustomException
 from shakedown.utils.callback import Callback
+import time
 
 class CallbackTestBase(TestCase):
     def setUp(self):
@@ -53,3 +54,96 @@ class HookExceptionsTest(CallbackTestBase):
         with self.assertRaises(CustomException) as caught:
             self.hook(arg_value=self.arg)
         self.assertEquals(caught.exception.args[0], 0, "First exception was not the one propagated from hook!")
+
+class UnregisterTest(CallbackTestBase):
+    def setUp(self):
+        super(UnregisterTest, self).setUp()
+        self.called = []
+        for identifier in ["a", "b", "a", None]:
+            self.hook.register(self._make_callback(identifier), identifier)
+    def _make_callback(self, identifier):
+        def callback(**_):
+            self.called.append(identifier)
+        return callback
+    def test_unregister_by_identifier(self):
+        self.hook.unregister_by_identifier("a")
+        self.assertEquals([identifier for identifier, _ in self.hook.iter_registered()], ["b", None])
+        self.hook(arg_value=self.arg)
+        self.assertEquals(self.called, ["b", None])
+    def test_unregister_unknown_identifier(self):
+        self.hook.unregister_by_identifier("c")
+        self.hook.unregister_by_identifier("a")
+        self.hook.unregister_by_identifier("a")
+        self.assertEquals([identifier for identifier, _ in self.hook.iter_registered()], ["b", None])
+    def test_reregister_after_unregister(self):
+        self.hook.unregister_by_identifier("a")
+        self.hook.register(self._make_callback("a"), "a")
+        self.hook(arg_value=self.arg)
+        self.assertEquals(self.called, ["b", None, "a"])
+    def test_unregister_during_call(self):
+        "Unregistering from within a callback should not skip callbacks in the ongoing call"
+        self.hook.register(lambda **_: self.hook.unregister_by_identifier("b"), "unregistering")
+        self.hook.register(self._make_callback("last"), "last")
+        self.hook(arg_value=self.arg)
+        self.assertEquals(self.called, ["a", "b", "a", None, "last"])
+        del self.called[:]
+        self.hook(arg_value=self.arg)
+        self.assertEquals(self.called, ["a", "a", None, "last"])
+
+class CallbackArgumentsTest(TestCase):
+    def setUp(self):
+        super(CallbackArgumentsTest, self).setUp()
+        self.hook = Callback(["a", "b"])
+        self.calls = []
+    def test_callback_without_arguments(self):
+        self.hook.register(lambda: self.calls.append(()))
+        self.hook(a=1, b=2)
+        self.assertEquals(self.calls, [()])
+    def test_callback_with_some_arguments(self):
+        self.hook.register(lambda b: self.calls.append(b))
+        self.hook(a=1, b=2)
+        self.assertEquals(self.calls, [2])
+    def test_callback_with_arbitrary_keywords(self):
+        self.hook.register(lambda **kwargs: self.calls.append(kwargs))
+        self.hook(a=1, b=2)
+        self.assertEquals(self.calls, [{"a" : 1, "b" : 2}])
+    def test_bound_method_callback(self):
+        hook = self.hook
+        calls = self.calls
+        class Plugin(object):
+            def handler(self, a, b):
+                calls.append((self, a, b))
+        plugin = Plugin()
+        hook.register(plugin.handler)
+        hook(a=1, b=2)
+        self.assertEquals(self.calls, [(plugin, 1, 2)])
+
+class LatencyTest(CallbackTestBase):
+    def setUp(self):
+        super(LatencyTest, self).setUp()
+        self.hook.register(lambda: time.sleep(0.01), "slow")
+        self.hook.register(lambda: None, "fast")
+    def test_latency_not_measured_by_default(self):
+        self.hook(arg_value=self.arg)
+        self.assertEquals(self.hook.get_latencies(), {})
+    def test_latency_measured(self):
+        self.override_config("hooks.measure_latency", True)
+        self.hook.reset_latencies()
+        for _ in range(3):
+            self.hook(arg_value=self.arg)
+        latencies = self.hook.get_latencies()
+        self.assertEquals(set(latencies), set(["slow", "fast"]))
+        self.assertEquals(latencies["slow"].num_calls, 3)
+        self.assertGreaterEqual(latencies["slow"].total_seconds, 0.03)
+        self.assertGreater(latencies["slow"].get_average_seconds(), latencies["fast"].get_average_seconds())
+        self.hook.reset_latencies()
+        self.assertEquals(self.hook.get_latencies(), {})
+    def test_latency_setting_read_on_reset(self):
+        self.hook.reset_latencies()
+        self.override_config("hooks.measure_latency", True)
+        self.hook(arg_value=self.arg)
+        self.assertEquals(self.hook.get_latencies(), {})
+        self.hook.reset_latencies()
+        self.override_config("hooks.measure_latency", False)
+        self.hook(arg_value=self.arg)
+        self.assertEquals(set(self.hook.get_latencies()), set(["slow", "fast"]))
@@ -0,0 +1,87 @@
+from .utils import TestCase
+from shakedown import checkpoints
+from shakedown.runner import run_tests
+from shakedown.session import Session
+import json
+import os
+import shakedown
+import shutil
+import tempfile
+
+_executed = []
+
+class CheckpointedTest(shakedown.Test):
+    def test_1_success(self):
+        _executed.append("success")
+    def test_2_error(self):
+        _executed.append("error")
+        raise ZeroDivisionError("Oops")
+    def test_3_skip(self):
+        _executed.append("skip")
+        shakedown.skip_test("Skipping")
+    def test_4_last(self):
+        _executed.append("last")
+
+class CheckpointsTest(TestCase):
+    def setUp(self):
+        super(CheckpointsTest, self).setUp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.override_config("checkpoints.root", self.root)
+        del _executed[:]
+    def test_no_journal_by_default(self):
+        self.override_config("checkpoints.root", None)
+        session = self._run(Session(), 4)
+        self.assertIsNone(session.checkpoint_dir)
+        self.assertEquals(os.listdir(self.root), [])
+    def test_journal(self):
+        session = self._run(Session(), 2)
+        self.assertEquals(session.checkpoint_dir, os.path.join(self.root, session.id))
+        with open(os.path.join(session.checkpoint_dir, "journal")) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEquals(records[0], {"session_id" : session.id})
+        self.assertEquals([(record["name"].rsplit(":", 1)[-1], record["status"]) for record in records[1:]],
+                          [("test_1_success", "success"), ("test_2_error", "error")])
+    def test_resume(self):
+        interrupted = self._run(Session(), 3)
+        self.assertEquals(_executed, ["success", "error", "skip"])
+        resumed = checkpoints.resume_session(interrupted.checkpoint_dir)
+        self.assertEquals(resumed.id, interrupted.id)
+        self._run(resumed, 4)
+        self.assertEquals(_executed, ["success", "error", "skip", "last"])
+        self.assertEquals(self._get_statuses(resumed),
+                          {"test_1_success" : "success", "test_2_error" : "error", "test_3_skip" : "skip",
+                           "test_4_last" : "success"})
+        self.assertEquals(len(set(result.test_metadata.id for result in resumed.iter_results())), 4)
+        [error_result] = [result for result in resumed.iter_results() if result.is_error()]
+        [error] = error_result.get_errors()
+        self.assertEquals(str(error), "ZeroDivisionError: Oops")
+        self.assertEquals(resumed.result.get_num_skipped(), 1)
+    def test_resume_twice(self):
+        session = self._run(Session(), 1)
+        session = self._run(checkpoints.resume_session(session.checkpoint_dir), 2)
+        session = self._run(checkpoints.resume_session(session.checkpoint_dir), 4)
+        self.assertEquals(_executed, ["success", "error", "skip", "last"])
+        self.assertEquals(len(list(session.iter_results())), 4)
+    def test_partial_line_ignored(self):
+        session = self._run(Session(), 2)
+        with open(os.path.join(session.checkpoint_dir, "journal"), "a") as f:
+            f.write('{"id": "bla", "na')
+        session_id, records = checkpoints.read_journal(session.checkpoint_dir)
+        self.assertEquals(session_id, session.id)
+        self.assertEquals(len(records), 2)
+        # resuming after the partial line journals the following tests on lines of their own
+        session = self._run(checkpoints.resume_session(session.checkpoint_dir), 3)
+        self.assertEquals(_executed, ["success", "error", "skip"])
+        _, records = checkpoints.read_journal(session.checkpoint_dir)
+        self.assertEquals([record["status"] for record in records], ["success", "error", "skip"])
+        self._run(checkpoints.resume_session(session.checkpoint_dir), 4)
+        self.assertEquals(_executed, ["success", "error", "skip", "last"])
+    def _run(self, session, num_tests):
+        with session:
+            tests = sorted(CheckpointedTest.generate_tests(), key=lambda test: test.get_canonical_name())
+            run_tests(tests[:num_tests])
+        return session
+    def _get_statuses(self, session):
+        return dict((result.test_metadata.canonical_name.rsplit(":", 1)[-1], result.get_status())
+                    for result in session.iter_results())
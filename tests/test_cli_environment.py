@@ -23,6 +23,7 @@ class ArgumentParsingTest(OutputCaptureTest):
             "b": {"b1": {"flag2": False // conf_utils.Cmdline(on="--flag2")}},
             "string_value" : "",
             "int_value" : 0,
+            "typed_value" : 0 // conf_utils.Cmdline(arg="--typed", arg_type=int),
             })
 
     def test_config_off_flag(self):
@@ -35,6 +36,11 @@ class ArgumentParsingTest(OutputCaptureTest):
             self.assertTrue(self.config["b"]["b1"]["flag2"])
         self.assertFalse(self.config["b"]["b1"]["flag2"])
 
+    def test_config_typed_arg(self):
+        with cli_utils.get_cli_environment_context(argv=["--typed", "3"], config=self.config):
+            self.assertEquals(self.config.root.typed_value, 3)
+        self.assertEquals(self.config.root.typed_value, 0)
+
     def test_config_assign_flag(self):
         with cli_utils.get_cli_environment_context(argv=["-o", "string_value=hello", "-o", "int_value=666"], config=self.config):
             self.assertEquals(self.config.root.string_value, "hello")
@@ -71,6 +77,18 @@ class PluginCommandLineArgumentsTest(OutputCaptureTest):
             self.assertNotIn(self.plugin.get_name(), plugins.manager.get_active_plugins())
         self.assertIn(self.plugin.get_name(), plugins.manager.get_active_plugins())
 
+    def test_activation_inside_context_undone(self):
+        with cli_utils.get_cli_environment_context(argv=[]):
+            plugins.manager.activate(self.plugin)
+        self.assertNotIn(self.plugin.get_name(), plugins.manager.get_active_plugins())
+
+    def test_deactivation_inside_context_undone(self):
+        plugins.manager.activate(self.plugin)
+        self.addCleanup(plugins.manager.deactivate, self.plugin)
+        with cli_utils.get_cli_environment_context(argv=[]):
+            plugins.manager.deactivate(self.plugin)
+        self.assertIn(self.plugin.get_name(), plugins.manager.get_active_plugins())
+
     def test_argument_passing(self):
         with cli_utils.get_cli_environment_context(argv=["--with-sample-plugin", "--plugin-option", "value"]):
             self.assertEquals(self.plugin.cmdline_param, "value")
@@ -0,0 +1,118 @@
+from .utils import TestCase
+from shakedown import hooks
+from shakedown.distributed import Coordinator, parse_address, Worker
+from shakedown.runner import run_tests
+from shakedown.loader import Loader
+from shakedown.session import Session
+from tempfile import mkdtemp
+import itertools
+import os
+import shutil
+
+_TEST_FILE = """
+import os
+import shakedown
+
+class DistributedTest(shakedown.Test):
+    def test_succeed(self):
+        pass
+    def test_fail(self):
+        raise shakedown.exceptions.TestFailed()
+    def test_error(self):
+        raise ZeroDivisionError()
+    def test_skip(self):
+        shakedown.skip_test()
+    def test_pid(self):
+        with open(os.path.join(os.path.dirname(__file__), "pids"), "a") as f:
+            f.write("{0}\\n".format(os.getpid()))
+"""
+
+_CRASHING_TEST_FILE = """
+import os
+import shakedown
+
+class CrashingTest(shakedown.Test):
+    def test_1_crash_once(self):
+        marker = os.path.join(os.path.dirname(__file__), "crashed")
+        if not os.path.exists(marker):
+            open(marker, "w").close()
+            os._exit(1)
+    def test_2_always_crash(self):
+        os._exit(1)
+    def test_3_succeed(self):
+        pass
+"""
+
+class DistributedTest(TestCase):
+    def setUp(self):
+        super(DistributedTest, self).setUp()
+        self.tempdir = mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tempdir)
+        self.ended = []
+        hooks.test_end.register(lambda result: self.ended.append((os.getpid(), result)), "distributed-test")
+        self.addCleanup(hooks.test_end.unregister_by_identifier, "distributed-test")
+    def test_results(self):
+        session = self._run(_TEST_FILE, num_workers=3, batch_size=1)
+        self.assertEquals(self._get_statuses(session), {"test_error" : "error", "test_fail" : "failure",
+                                                        "test_pid" : "success", "test_skip" : "skip",
+                                                        "test_succeed" : "success"})
+        self.assertTrue(session.is_complete())
+        # hooks are triggered in the coordinator's process, while tests run in the workers
+        self.assertEquals(len(self.ended), 5)
+        for pid, result in self.ended:
+            self.assertEquals(pid, os.getpid())
+            self.assertIn(id(result), [id(session_result) for session_result in session.iter_results()])
+        with open(os.path.join(self.tempdir, "pids")) as f:
+            self.assertNotEquals(f.read().strip(), str(os.getpid()))
+    def test_worker_deaths(self):
+        session = self._run(_CRASHING_TEST_FILE, num_workers=4, batch_size=3)
+        statuses = self._get_statuses(session)
+        self.assertEquals(statuses, {"test_1_crash_once" : "success", "test_2_always_crash" : "error",
+                                     "test_3_succeed" : "success"})
+        [result] = [result for result in session.iter_results() if result.is_error()]
+        self.assertIn("died while running the test", str(result.get_errors()[0]))
+    def test_duplicate_keys(self):
+        session = self._run(_TEST_FILE, num_workers=2, batch_size=2, num_copies=2)
+        results = list(session.iter_results())
+        self.assertEquals(len(results), 10)
+        duplicates = [result for result in results if result.is_error() and
+                      "same key" in str(result.get_errors()[0])]
+        self.assertEquals(len(duplicates), 5)
+        self.assertEquals(len(set(result.test_metadata.canonical_name for result in duplicates)), 5)
+        self.assertEquals(len(self.ended), 10)
+    def test_parse_address(self):
+        self.assertEquals(parse_address("example.com:1234"), ("example.com", 1234))
+        self.assertEquals(parse_address(":1234"), ("localhost", 1234))
+        with self.assertRaises(ValueError):
+            parse_address("example.com")
+    def _run(self, source, num_workers, batch_size, num_copies=1):
+        path = os.path.join(self.tempdir, "test_distributed_file.py")
+        with open(path, "w") as f:
+            f.write(source)
+        coordinator = Coordinator(("localhost", 0), [self.tempdir], batch_size=batch_size)
+        coordinator.listen()
+        self.addCleanup(coordinator.close)
+        pids = [self._fork_worker(coordinator) for _ in range(num_workers)]
+        try:
+            with Session() as session:
+                test_loader = Loader()
+                run_tests(itertools.chain.from_iterable(test_loader.iter_runnable_tests(p)
+                                                        for p in [self.tempdir] * num_copies),
+                          coordinator=coordinator)
+        finally:
+            coordinator.close()
+            for pid in pids:
+                os.waitpid(pid, 0)
+        return session
+    def _fork_worker(self, coordinator):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                coordinator.close()
+                Worker(coordinator.address).run()
+            finally:
+                os._exit(0) # pylint: disable=W0212
+        return pid
+    def _get_statuses(self, session):
+        return dict((result.test_metadata.canonical_name.rsplit(":", 1)[-1], result.get_status())
+                    for result in session.iter_results())
@@ -0,0 +1,75 @@
+from .utils import TestCase
+from shakedown.result import Result
+from shakedown.utils.exception_info import ExceptionInfo
+import gc
+import pickle
+import sys
+import weakref
+
+class ExceptionInfoTest(TestCase):
+    def test_capture(self):
+        info = _capture(_raise_error, "x")
+        self.assertEquals(info.exception_type_name, "ValueError")
+        self.assertEquals(str(info), "ValueError: Bad value x")
+        self.assertEquals([frame.function_name for frame in info.frames], ["_capture", "_raise_error"])
+        self.assertEquals(info.frames[-1].code_line, 'raise ValueError("Bad value {0}".format(value))')
+        self.assertIsNone(info.frames[-1].locals)
+        self.assertIn("ValueError: Bad value x", info.format_traceback())
+    def test_no_exception(self):
+        info = ExceptionInfo.capture((None, None, None))
+        self.assertEquals(info.frames, [])
+        self.assertEquals(str(info), "<unknown exception>")
+    def test_pickle(self):
+        info = pickle.loads(pickle.dumps(_capture(_raise_error, "x", capture_locals=True)))
+        self.assertEquals(str(info), "ValueError: Bad value x")
+        self.assertEquals(info.frames[-1].locals, {"value" : "'x'"})
+    def test_locals_truncated(self):
+        info = _capture(_raise_error, "x" * 1000, capture_locals=True, max_repr_length=10)
+        self.assertLessEqual(len(info.frames[-1].locals["value"]), 13)
+    def test_locals_size_budget(self):
+        info = _capture(_raise_error, "x" * 100, capture_locals=True, max_locals_size=110)
+        # the innermost frame takes precedence, and the budget runs out before the outer frame
+        self.assertEquals(list(info.frames[-1].locals), ["value"])
+        self.assertEquals(info.frames[0].locals, {})
+    def test_unrepresentable_locals(self):
+        info = _capture(_raise_error, Unrepresentable(), capture_locals=True)
+        self.assertIn("Unrepresentable", info.frames[-1].locals["value"])
+
+class ResultExceptionsTest(TestCase):
+    def test_frames_released(self):
+        result = Result()
+        local = Unrepresentable()
+        ref = weakref.ref(local)
+        try:
+            _raise_error(local)
+        except ValueError:
+            result.add_error()
+        del local
+        gc.collect()
+        self.assertIsNone(ref())
+        [error] = result.get_errors()
+        self.assertEquals(error.exception_type_name, "ValueError")
+    def test_capture_locals_config(self):
+        self.override_config("tracebacks.capture_locals", True)
+        result = Result()
+        try:
+            _raise_error(1)
+        except ValueError:
+            result.add_failure()
+        [failure] = result.get_failures()
+        self.assertEquals(failure.frames[-1].locals, {"value" : "1"})
+
+class Unrepresentable(object):
+    def __str__(self):
+        return "unrepresentable"
+    def __repr__(self):
+        raise NotImplementedError()
+
+def _capture(func, value, **kwargs):
+    try:
+        func(value)
+    except Exception:
+        return ExceptionInfo.capture(sys.exc_info(), **kwargs)
+
+def _raise_error(value):
+    raise ValueError("Bad value {0}".format(value))
@@ -0,0 +1,35 @@
+from .utils import TestCase
+from shakedown.utils.fingerprint import get_exception_fingerprint
+from shakedown.utils.fingerprint import normalize_message
+import sys
+
+class FingerprintTest(TestCase):
+    def test_varying_message_parts_normalized(self):
+        self.assertEquals(normalize_message("object at 0x7f3a2c1d0 has 12 items"), "object at <address> has <number> items")
+        self.assertEquals(normalize_message("no such key: 0b5c3a7e-2d6f-4b1a-9c8e-1f2a3b4c5d6e"), "no such key: <uuid>")
+    def test_same_problem_same_fingerprint(self):
+        fingerprints = set(self._get_fingerprint(_raise_value_error, value) for value in range(3))
+        self.assertEquals(len(fingerprints), 1)
+    def test_different_messages(self):
+        self.assertNotEquals(self._get_fingerprint(_raise_value_error, "a"), self._get_fingerprint(_raise_value_error, "b"))
+    def test_different_types(self):
+        self.assertNotEquals(self._get_fingerprint(_raise_value_error, 1), self._get_fingerprint(_raise_key_error, 1))
+    def test_different_locations(self):
+        self.assertNotEquals(self._get_fingerprint(_raise_value_error, 1), self._get_fingerprint(_raise_value_error_elsewhere, 1))
+    def test_no_exception(self):
+        self.assertEquals(get_exception_fingerprint((None, None, None)), get_exception_fingerprint((None, None, None)))
+    def _get_fingerprint(self, func, value):
+        try:
+            func(value)
+        except Exception:
+            return get_exception_fingerprint(sys.exc_info())
+        self.fail("Exception not raised")
+
+def _raise_value_error(value):
+    raise ValueError("bad value: {0}".format(value))
+
+def _raise_value_error_elsewhere(value):
+    raise ValueError("bad value: {0}".format(value))
+
+def _raise_key_error(value):
+    raise KeyError("bad value: {0}".format(value))
@@ -1,6 +1,7 @@
 from six.moves import cStringIO as StringIO
 from shakedown.utils.formatter import Formatter
 from .utils import TestCase
+import errno
 
 class FormatterTest(TestCase):
     def setUp(self):
@@ -8,6 +9,7 @@ class FormatterTest(TestCase):
         self.buff = StringIO()
         self.f = Formatter(self.buff)
     def assertOutput(self, v):
+        self.f.flush()
         self.assertEquals(self.buff.getvalue(), v)
     def test_write_non_strings(self):
         class MyObject(object):
@@ -61,3 +63,45 @@ class FormatterTest(TestCase):
         self.f.writeln('c')
         self.assertOutput('a\n**b\nc\n')
 
+
+class FormatterBufferingTest(TestCase):
+    def setUp(self):
+        super(FormatterBufferingTest, self).setUp()
+        self.stream = RecordingStream()
+        self.f = Formatter(self.stream, flush_threshold=100)
+    def test_output_buffered_until_flush(self):
+        with self.f.indented():
+            for index in range(5):
+                self.f.writeln("line\n{0}".format(index))
+        self.assertEquals(self.stream.writes, [])
+        self.f.flush()
+        self.assertEquals(self.stream.writes, ["".join(" line\n {0}\n".format(index) for index in range(5))])
+    def test_separator_flushes(self):
+        self.f.writeln("a")
+        self.f.write_separator(3)
+        self.assertEquals(self.stream.writes, ["a\n---\n"])
+    def test_threshold_flushes(self):
+        for _ in range(20):
+            self.f.writeln("0123456789")
+        self.assertEquals(len(self.stream.writes), 2)
+        self.f.flush()
+        self.assertEquals("".join(self.stream.writes), "0123456789\n" * 20)
+    def test_broken_pipe_ignored(self):
+        self.stream.error = IOError(errno.EPIPE, "Broken pipe")
+        self.f.writeln("a")
+        self.f.flush()
+    def test_other_errors_raised(self):
+        self.stream.error = IOError(errno.ENOSPC, "No space left on device")
+        self.f.writeln("a")
+        with self.assertRaises(IOError):
+            self.f.flush()
+
+class RecordingStream(object):
+    def __init__(self):
+        super(RecordingStream, self).__init__()
+        self.writes = []
+        self.error = None
+    def write(self, text):
+        if self.error is not None:
+            raise self.error
+        self.writes.append(text)
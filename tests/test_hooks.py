@@ -0,0 +1,94 @@
+from .utils import TestCase
+from shakedown import hooks
+from shakedown.exceptions import TestFailed
+from shakedown.runner import run_tests
+from shakedown.session import Session
+import shakedown
+
+_IDENTIFIER = "hook-arguments-test"
+
+class HookArgumentsTest(TestCase):
+    def setUp(self):
+        super(HookArgumentsTest, self).setUp()
+        self.calls = []
+    def register(self, hook_name, callback):
+        hook = getattr(hooks, hook_name)
+        hook.register(callback, _IDENTIFIER)
+        self.addCleanup(hook.unregister_by_identifier, _IDENTIFIER)
+
+    def test_session_hooks(self):
+        self.register("session_start", lambda session: self.calls.append(("start", session)))
+        self.register("session_end", lambda session: self.calls.append(("end", session)))
+        with Session() as session:
+            pass
+        self.assertEquals(self.calls, [("start", session), ("end", session)])
+
+    def test_test_hooks(self):
+        for hook_name in ["test_start", "test_success", "test_failure", "test_end"]:
+            self.register(hook_name, self._make_recorder(hook_name))
+        with Session() as session:
+            run_tests(SampleTest.generate_tests())
+        results = dict((result.test_metadata.canonical_name.rsplit(":", 1)[-1], result)
+                       for result in session.iter_results())
+        self.assertEquals(len(self.calls), 6)
+        for hook_name, test, result, finished in self.calls:
+            self.assertIs(session.get_result(test), result)
+            self.assertEquals(finished, hook_name != "test_start")
+        outcomes = [(hook_name, result) for hook_name, _, result, _ in self.calls if hook_name in ("test_success", "test_failure")]
+        self.assertEquals(sorted(outcomes, key=lambda outcome: outcome[0]), [
+            ("test_failure", results["test_fail"]),
+            ("test_success", results["test_succeed"]),
+        ])
+    def _make_recorder(self, hook_name):
+        def callback(test, result):
+            self.calls.append((hook_name, test, result, result.is_finished()))
+        return callback
+
+    def test_partial_arguments(self):
+        self.register("test_end", lambda result: self.calls.append(result.is_failure()))
+        with Session():
+            run_tests(SampleTest.generate_tests())
+        self.assertEquals(sorted(self.calls), [False, True])
+
+    def test_no_arguments(self):
+        self.register("test_end", lambda: self.calls.append(shakedown.context.test))
+        with Session() as session:
+            run_tests(SampleTest.generate_tests())
+        self.assertEquals(len(self.calls), 2)
+        for test in self.calls:
+            self.assertIsNotNone(session.get_result(test))
+
+    def test_hook_errors_recorded(self):
+        for hook_name in ["test_start", "test_success", "test_end"]:
+            self.register(hook_name, self._make_raiser(hook_name))
+        self.register("test_error", lambda result: self.calls.append(("test_error", result.is_error())))
+        with Session() as session:
+            run_tests(SampleTest.generate_tests())
+        self.assertTrue(session.is_complete())
+        statuses = dict((result.test_metadata.canonical_name.rsplit(":", 1)[-1], result.get_status())
+                        for result in session.iter_results())
+        self.assertEquals(statuses, {"test_fail" : "error", "test_succeed" : "error"})
+        # the end hooks are triggered even if test_start raised
+        self.assertEquals([call for call in self.calls if call[0] != "test_start"],
+                          [("test_error", True), ("test_end", True)] * 2)
+        for result in session.iter_results():
+            self.assertIn("ZeroDivisionError: test_start", [str(error) for error in result.get_errors()])
+            self.assertIn("ZeroDivisionError: test_end", [str(error) for error in result.get_errors()])
+    def test_hook_errors_recorded_isolated(self):
+        self.override_config("run.isolate", True)
+        self.register("test_start", self._make_raiser("test_start"))
+        with Session() as session:
+            run_tests(SampleTest.generate_tests())
+        self.assertTrue(session.is_complete())
+        self.assertEquals([result.get_status() for result in session.iter_results()], ["error", "error"])
+    def _make_raiser(self, hook_name):
+        def callback(result):
+            self.calls.append((hook_name, result.is_error()))
+            raise ZeroDivisionError(hook_name)
+        return callback
+
+class SampleTest(shakedown.Test):
+    def test_succeed(self):
+        pass
+    def test_fail(self):
+        raise TestFailed("!")
@@ -0,0 +1,106 @@
+from .utils import TestCase
+from shakedown import hooks
+from shakedown.exceptions import TestFailed
+from shakedown.runner import run_tests
+from shakedown.session import Session
+import os
+import shakedown
+import signal
+import time
+
+_state = {"leaked" : False}
+
+class IsolationTest(TestCase):
+    def setUp(self):
+        super(IsolationTest, self).setUp()
+        self.override_config("run.isolate", True)
+        self.ended = []
+        hooks.test_end.register(lambda test, result: self.ended.append((os.getpid(), result)), "isolation-test")
+        self.addCleanup(hooks.test_end.unregister_by_identifier, "isolation-test")
+        self.addCleanup(hooks.test_start.unregister_by_identifier, "isolation-test")
+    def test_results(self):
+        statuses = self._get_statuses(self._run(OutcomesTest))
+        self.assertEquals(statuses, {"test_error" : "error", "test_fail" : "failure", "test_skip" : "skip",
+                                     "test_succeed" : "success"})
+    def test_exceptions_received(self):
+        [result] = [result for result in self._run(OutcomesTest).iter_results() if result.is_error()]
+        [error] = result.get_errors()
+        self.assertEquals(str(error), "ZeroDivisionError: Oops")
+        self.assertIsNotNone(result.get_duration())
+    def test_hooks_triggered_in_session_process(self):
+        session = self._run(OutcomesTest)
+        self.assertEquals(len(self.ended), 4)
+        for pid, result in self.ended:
+            self.assertEquals(pid, os.getpid())
+            self.assertIn(id(result), [id(session_result) for session_result in session.iter_results()])
+    def test_start_hook_triggered_before_test_runs(self):
+        self.override_config("run.isolation_batch_size", 10)
+        started = {}
+        hooks.test_start.register(lambda result: started.setdefault(id(result), time.time()), "isolation-test")
+        session = self._run(CrashingTest)
+        self.assertEquals(len(started), 4)
+        for result in session.iter_results():
+            self.assertLessEqual(started[id(result)], result.start_time)
+    def test_state_not_leaked(self):
+        self.assertEquals(self._get_statuses(self._run(LeakingTest)), {"test_1_leak" : "success", "test_2_check" : "success"})
+        self.assertFalse(_state["leaked"])
+    def test_crashes(self):
+        self._test_crashes()
+    def test_crashes_in_batches(self):
+        self.override_config("run.isolation_batch_size", 10)
+        self._test_crashes()
+    def _test_crashes(self):
+        session = self._run(CrashingTest)
+        statuses = self._get_statuses(session)
+        self.assertEquals(statuses, {"test_1_exit" : "error", "test_2_succeed" : "success", "test_3_kill" : "error",
+                                     "test_4_succeed" : "success"})
+        errors = dict((result.test_metadata.canonical_name.rsplit(":", 1)[-1], str(result.get_errors()[0]))
+                      for result in session.iter_results() if result.is_error())
+        self.assertEquals(errors, {"test_1_exit" : "TestProcessDied: Test process exited with status 3",
+                                   "test_3_kill" : "TestProcessDied: Test process was killed by signal SIGKILL"})
+        self.assertTrue(session.is_complete())
+    def test_stop_on_error(self):
+        self.override_config("run.stop_on_error", True)
+        self.override_config("run.isolation_batch_size", 10)
+        session = self._run(CrashingTest)
+        self.assertEquals(len(self.ended), 1)
+        self.assertFalse(session.is_complete())
+    def test_retries(self):
+        self.override_config("run.retries", 1)
+        session = self._run(CrashingTest)
+        [result] = [result for result in session.iter_results() if result.test_metadata.canonical_name.endswith("test_1_exit")]
+        self.assertEquals(result.get_num_attempts(), 1)
+        self.assertEquals(len(self.ended), 4)
+    def _run(self, test_class):
+        with Session() as session:
+            run_tests(test_class.generate_tests())
+        return session
+    def _get_statuses(self, session):
+        return dict((result.test_metadata.canonical_name.rsplit(":", 1)[-1], result.get_status())
+                    for result in session.iter_results())
+
+class OutcomesTest(shakedown.Test):
+    def test_succeed(self):
+        pass
+    def test_fail(self):
+        raise TestFailed()
+    def test_error(self):
+        raise ZeroDivisionError("Oops")
+    def test_skip(self):
+        shakedown.skip_test()
+
+class LeakingTest(shakedown.Test):
+    def test_1_leak(self):
+        _state["leaked"] = True
+    def test_2_check(self):
+        assert not _state["leaked"]
+
+class CrashingTest(shakedown.Test):
+    def test_1_exit(self):
+        os._exit(3) # pylint: disable=W0212
+    def test_2_succeed(self):
+        pass
+    def test_3_kill(self):
+        os.kill(os.getpid(), signal.SIGKILL)
+    def test_4_succeed(self):
+        pass
@@ -0,0 +1,61 @@
+from .utils import TestCase
+from .utils.http_server import LocalHTTPServer
+from shakedown import plugins
+from shakedown.plugins.builtin import notifications
+from shakedown.session import Session
+from six.moves.urllib.parse import parse_qs # pylint: disable=F0401
+import time
+
+class NotificationsTest(TestCase):
+    def setUp(self):
+        super(NotificationsTest, self).setUp()
+        self.responses = []
+        self.server = LocalHTTPServer(self._handle_request).start()
+        self.addCleanup(self.server.stop)
+        self.forge.replace_with(notifications, "_SERVICES", [(self.server.get_url("/notify"), "prowl_api_key")])
+        self.override_config("notifications.prowl_api_key", "some-api-key")
+        self.override_config("notifications.retry_backoff_seconds", 0.01)
+        plugins.manager.activate("notifications")
+        self.addCleanup(plugins.manager.deactivate, "notifications")
+    def _handle_request(self, _):
+        if self.responses:
+            return self.responses.pop(0), {}, ""
+        return 200, {}, ""
+    def test_notification_sent_on_session_end(self):
+        with Session() as session:
+            pass
+        self.assertTrue(notifications.flush(timeout=5))
+        [request] = self.server.requests
+        data = parse_qs(request.body.decode("utf-8"))
+        self.assertEquals(data["apikey"], ["some-api-key"])
+        self.assertEquals(data["description"], ["Session {0} ended".format(session.id)])
+    def test_server_errors_are_retried(self):
+        self.responses = [503, 500]
+        self._run_session_and_flush()
+        self.assertEquals(len(self.server.requests), 3)
+    def test_retries_are_bounded(self):
+        self.override_config("notifications.max_retries", 2)
+        self.responses = [500] * 10
+        self._run_session_and_flush()
+        self.assertEquals(len(self.server.requests), 3)
+    def test_client_errors_are_not_retried(self):
+        self.responses = [401]
+        self._run_session_and_flush()
+        self.assertEquals(len(self.server.requests), 1)
+    def test_session_end_does_not_wait_for_delivery(self):
+        self.server.handler = lambda request: time.sleep(0.5) or (200, {}, "")
+        start_time = time.time()
+        self._run_session()
+        self.assertLess(time.time() - start_time, 0.4)
+        self.assertTrue(notifications.flush(timeout=5))
+        self.assertEquals(len(self.server.requests), 1)
+    def test_unreachable_service(self):
+        self.override_config("notifications.max_retries", 1)
+        self.server.stop()
+        self._run_session_and_flush()
+    def _run_session_and_flush(self):
+        self._run_session()
+        self.assertTrue(notifications.flush(timeout=5))
+    def _run_session(self):
+        with Session():
+            pass
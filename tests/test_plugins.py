@@ -3,8 +3,13 @@ from shakedown import hooks
 from shakedown import plugins
 from shakedown.plugins import PluginInterface
 from shakedown.plugins import IncompatiblePlugin
+from shakedown.plugins.builtin import BUILTIN_PLUGIN_MANIFESTS
+from shakedown.plugins.manifest import LazyPlugin
 from tempfile import mkdtemp
 import os
+import sys
+
+imported_plugin_files = []
 
 class BuiltinPluginsTest(TestCase):
     def test_hooks_start_condition(self):
@@ -22,6 +27,14 @@ class BuiltinPluginsTest(TestCase):
             if filename.startswith("_") or filename.startswith(".") or not filename.endswith(".py"):
                 continue
             self.assertIn(filename[:-3], installed)
+    def test_builtin_plugins_not_imported_until_activated(self):
+        manager = plugins.PluginManager()
+        for manifest in BUILTIN_PLUGIN_MANIFESTS:
+            self.assertIsInstance(manager.get_installed_plugins()[manifest.name], LazyPlugin)
+    def test_builtin_plugin_manifests_up_to_date(self):
+        for manifest in BUILTIN_PLUGIN_MANIFESTS:
+            plugin = __import__(manifest.module, fromlist=[""]).Plugin()
+            self.assertEquals(plugins._get_plugin_manifest(plugin, manifest.module), manifest) # pylint: disable=W0212
 
 class PluginInstallationTest(TestCase):
     def test_cannot_install_incompatible_subclasses(self):
@@ -67,13 +80,19 @@ class PluginDiscoveryTest(TestCase):
                 f.write("""
 import shakedown.plugins
 from shakedown.plugins.interface import PluginInterface
+from {test_module} import imported_plugin_files
+imported_plugin_files.append(__file__)
 
 class {name}(PluginInterface):
     def get_name(self):
         return {name!r}
+    def get_description(self):
+        return "description of {name}"
+    def session_start(self):
+        self.session_started = True
 
 def install_plugins():
-""".format(name=plugin_name))
+""".format(name=plugin_name, test_module=__name__))
                 if index % 2 == 0:
                     # don't install
                     f.write("     pass")
@@ -88,6 +107,8 @@ def install_plugins():
             with open(os.path.join(self.root_path, junk_file), "w") as f:
                 f.write("---JUNK----")
         self.override_config("plugins.search_paths", [self.root_path])
+        self.override_config("plugins.manifest_cache_path", os.path.join(mkdtemp(), "manifests.json"))
+        del imported_plugin_files[:]
     def tearDown(self):
         plugins.manager.uninstall_all()
         plugins.manager.install_builtin_plugins()
@@ -100,6 +121,52 @@ def install_plugins():
             set(plugins.manager.get_installed_plugins().keys()),
             self.expected_names
         )
+        self.assertEquals(len(imported_plugin_files), 4)
+
+    def test_cached_discovery_does_not_import(self):
+        self._discover_twice()
+        self.assertEquals(imported_plugin_files, [])
+        installed = plugins.manager.get_installed_plugins()
+        self.assertEquals(set(installed), self.expected_names)
+        for plugin_name in self.expected_names:
+            self.assertIsInstance(installed[plugin_name], LazyPlugin)
+            self.assertEquals(installed[plugin_name].get_description(), "description of {0}".format(plugin_name))
+
+    def test_lazy_plugin_imported_on_activation(self):
+        self._discover_twice()
+        plugin_name = sorted(self.expected_names)[0]
+        plugins.manager.activate(plugin_name)
+        self.assertEquals(len(imported_plugin_files), 1)
+        plugin = plugins.manager.get_plugin(plugin_name)
+        self.assertNotIsInstance(plugin, LazyPlugin)
+        self.assertIn(plugin_name, plugins.manager.get_active_plugins())
+        hooks.session_start()
+        self.assertTrue(plugin.session_started)
+
+    def test_modified_files_are_rescanned(self):
+        plugins.manager.uninstall_all()
+        self.addCleanup(plugins.manager.install_builtin_plugins)
+        plugins.manager.discover()
+        modified_path = os.path.join(self.root_path, "a/p3.py")
+        with open(modified_path, "a") as f:
+            f.write("\n# modified\n")
+        self._simulate_new_process()
+        plugins.manager.discover()
+        self.assertEquals(imported_plugin_files, [modified_path])
+
+    def _discover_twice(self):
+        plugins.manager.uninstall_all()
+        self.addCleanup(plugins.manager.install_builtin_plugins)
+        plugins.manager.discover()
+        self._simulate_new_process()
+        plugins.manager.discover()
+
+    def _simulate_new_process(self):
+        plugins.manager.uninstall_all()
+        for module_name, module in list(sys.modules.items()):
+            if getattr(module, "__file__", None) and module.__file__.startswith(self.root_path):
+                del sys.modules[module_name]
+        del imported_plugin_files[:]
 
 
 class PluginActivationTest(TestCase):
@@ -164,6 +231,24 @@ class PluginActivationTest(TestCase):
         self.addCleanup(plugins.manager.uninstall, plugin)
         with self.assertRaisesRegexp(IncompatiblePlugin, r"\bUnknown hooks\b.*"):
             plugins.manager.activate(plugin)
+        # registration tables are cached, but incompatibility should still be reported on every attempt
+        with self.assertRaisesRegexp(IncompatiblePlugin, r"\bUnknown hooks\b.*"):
+            plugins.manager.activate(plugin)
+
+    def test_registration_table_computed_once_per_class(self):
+        table = plugins._get_registration_table(StartSessionPlugin) # pylint: disable=W0212
+        self.assertEquals(table, ((hooks.session_start, "session_start"),))
+        self.assertIs(plugins._get_registration_table(StartSessionPlugin), table) # pylint: disable=W0212
+
+    def test_repeated_activation(self):
+        plugins.manager.install(self.plugin)
+        self.addCleanup(plugins.manager.uninstall, self.plugin)
+        for _ in range(3):
+            plugins.manager.activate(self.plugin)
+            plugins.manager.deactivate(self.plugin)
+        plugins.manager.activate(self.plugin)
+        hooks.session_start()
+        self.assertEquals(self.plugin.session_start_call_count, 1)
 
 
 class StartSessionPlugin(PluginInterface):
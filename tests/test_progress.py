@@ -0,0 +1,67 @@
+from .utils import TestCase
+from shakedown.exceptions import TestFailed
+from shakedown.runner import run_tests
+from shakedown.session import Session
+from shakedown.utils.progress import ProgressReporter
+from six.moves import cStringIO as StringIO
+import shakedown
+
+class ProgressReporterTest(TestCase):
+    def test_tallies(self):
+        stream = StringIO()
+        with ProgressReporter(stream, total=4, plain_interval=0) as progress:
+            self._run()
+        lines = stream.getvalue().splitlines()
+        self.assertEquals(len(lines), 3)
+        self.assertTrue(lines[-1].startswith("3/4 tests (75%), "))
+        self.assertTrue(lines[-1].endswith(": 1 successful, 1 failures, 1 errors, 0 skipped"))
+        self.assertTrue(progress.get_line().startswith("3/4 tests"))
+    def test_rate_limited(self):
+        stream = StringIO()
+        with ProgressReporter(stream, plain_interval=60):
+            self._run()
+        self.assertEquals(stream.getvalue(), "")
+    def test_tty(self):
+        stream = TTYStream()
+        with ProgressReporter(stream, update_interval=0):
+            self._run()
+        output = stream.getvalue()
+        self.assertEquals(output.count("\r"), 4)
+        self.assertTrue(output.startswith("\r1 tests"))
+        self.assertTrue(output.endswith("\n"))
+    def test_detached(self):
+        stream = StringIO()
+        with ProgressReporter(stream, plain_interval=0):
+            pass
+        self._run()
+        self.assertEquals(stream.getvalue(), "")
+    def test_retried_at_end(self):
+        self.override_config("run.retries", 1)
+        self.override_config("run.retry_at_end", True)
+        stream = StringIO()
+        with ProgressReporter(stream, total=3, plain_interval=0) as progress:
+            self._run()
+        self.assertTrue(progress.get_line().startswith("3/3 tests"))
+        self.assertTrue(progress.get_line().endswith(": 1 successful, 1 failures, 1 errors, 0 skipped"))
+    def _run(self):
+        with Session():
+            run_tests(SampleTest.generate_tests())
+
+class TTYStream(object):
+    def __init__(self):
+        super(TTYStream, self).__init__()
+        self._buffer = StringIO()
+    def write(self, text):
+        self._buffer.write(text)
+    def getvalue(self):
+        return self._buffer.getvalue()
+    def isatty(self):
+        return True
+
+class SampleTest(shakedown.Test):
+    def test_1_success(self):
+        pass
+    def test_2_failure(self):
+        raise TestFailed()
+    def test_3_error(self):
+        raise ZeroDivisionError()
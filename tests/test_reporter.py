@@ -0,0 +1,55 @@
+from .utils import TestCase
+from shakedown import hooks
+from shakedown.runner import run_tests
+from shakedown.session import Session
+from shakedown.utils.reporter import Reporter
+from six.moves import cStringIO as StringIO
+import shakedown
+import time
+
+class FailureGroupsReportTest(TestCase):
+    def test_failures_grouped(self):
+        output = self._get_report()
+        self.assertIn("> 4 x ZeroDivisionError", output)
+        self.assertIn("... and 1 more", output)
+        self.assertEquals(output.count("x ZeroDivisionError"), 1)
+    def test_exemplar_traceback_reported(self):
+        output = self._get_report()
+        self.assertEquals(output.count("Traceback (most recent call last):"), 1)
+        self.assertIn("in test_divide", output)
+        self.assertIn("ZeroDivisionError: Cannot divide 1 by zero", output)
+    def test_tracebacks_not_reported_if_disabled(self):
+        self.override_config("tracebacks.in_report", False)
+        output = self._get_report()
+        self.assertNotIn("Traceback", output)
+        self.assertNotIn("in test_divide", output)
+    def _get_report(self):
+        with Session() as session:
+            run_tests(FailingTest.generate_tests())
+        output = StringIO()
+        Reporter(output).report_session(session)
+        return output.getvalue()
+
+class FailingTest(shakedown.Test):
+    @shakedown.parameters.iterate(dividend=[1, 2, 3, 4])
+    def test_divide(self, dividend):
+        raise ZeroDivisionError("Cannot divide {0} by zero".format(dividend))
+
+class HookLatencyReportTest(TestCase):
+    def test_hook_latencies_reported(self):
+        self.override_config("hooks.measure_latency", True)
+        hooks.session_end.register(lambda: time.sleep(0.01), "slow-plugin")
+        self.addCleanup(hooks.session_end.unregister_by_identifier, "slow-plugin")
+        with Session() as session:
+            pass
+        self.assertEquals(hooks.get_latencies()["session_end", "slow-plugin"].num_calls, 1)
+        output = self._get_report(session)
+        self.assertIn("slow-plugin (session_end)", output)
+    def test_no_latencies_reported_by_default(self):
+        with Session() as session:
+            pass
+        self.assertNotIn("hook callbacks", self._get_report(session))
+    def _get_report(self, session):
+        stream = StringIO()
+        Reporter(stream).report_session(session)
+        return stream.getvalue()
@@ -0,0 +1,123 @@
+from .utils import TestCase
+from shakedown import timeouts
+from shakedown.resource_usage import measure_resource_usage
+from shakedown.runner import run_tests
+from shakedown.session import Session
+from shakedown.utils.reporter import Reporter
+from shakedown.utils.watchdog import Watchdog
+from six.moves import cStringIO as StringIO
+import os
+import shakedown
+import threading
+
+_leaked = {"fds" : [], "events" : []}
+
+def _leak_fd():
+    _leaked["fds"].append(os.open(os.devnull, os.O_RDONLY))
+
+def _leak_thread():
+    event = threading.Event()
+    _leaked["events"].append(event)
+    thread = threading.Thread(target=event.wait)
+    thread.daemon = True
+    thread.start()
+
+def _burn_cpu():
+    sum(i * i for i in range(200000))
+
+class ResourceUsageTest(TestCase):
+    def setUp(self):
+        super(ResourceUsageTest, self).setUp()
+        self.addCleanup(self._release_leaked)
+    def _release_leaked(self):
+        for fd in _leaked["fds"]:
+            os.close(fd)
+        for event in _leaked["events"]:
+            event.set()
+        _leaked["fds"] = []
+        _leaked["events"] = []
+    def test_measure(self):
+        with measure_resource_usage() as usage:
+            _leak_fd()
+            _leak_thread()
+            _burn_cpu()
+        self.assertEquals(usage.get_fd_growth(), 1)
+        self.assertEquals(usage.get_thread_growth(), 1)
+        self.assertGreater(usage.get_cpu_seconds(), 0)
+        self.assertIsNotNone(usage.get_rss_growth())
+        self.assertEquals(usage.leaks, ["1 file descriptors leaked", "1 threads leaked"])
+    def test_thresholds(self):
+        self.override_config("resource_usage.max_fd_growth", 1)
+        with measure_resource_usage() as usage:
+            _leak_fd()
+        self.assertEquals(usage.leaks, [])
+    def test_no_leaks(self):
+        with measure_resource_usage() as usage:
+            with open(os.devnull) as f:
+                f.read()
+        self.assertEquals(usage.get_fd_growth(), 0)
+        self.assertEquals(usage.leaks, [])
+    def test_disabled_by_default(self):
+        session = self._run()
+        for result in session.iter_results():
+            self.assertIsNone(result.resource_usage)
+    def test_run_tests(self):
+        self.override_config("resource_usage.enabled", True)
+        session = self._run()
+        leaks = dict((result.test_metadata.canonical_name.rsplit(":", 1)[-1], result.resource_usage.leaks)
+                     for result in session.iter_results())
+        self.assertEquals(leaks, {"test_burn_cpu" : [], "test_leak_fd" : ["1 file descriptors leaked"]})
+        output = StringIO()
+        Reporter(output).report_session(session)
+        output = output.getvalue()
+        self.assertIn("Tests using the most CPU time:", output)
+        self.assertIn("Tests leaking resources:", output)
+        self.assertIn("test_leak_fd: 1 file descriptors leaked", output)
+    def test_isolated(self):
+        self.override_config("resource_usage.enabled", True)
+        self.override_config("run.isolate", True)
+        session = self._run()
+        for result in session.iter_results():
+            self.assertIsNotNone(result.resource_usage)
+            self.assertGreater(result.resource_usage.get_cpu_seconds(), 0)
+    def test_timeout_watchdog_not_leaked(self):
+        self.override_config("resource_usage.enabled", True)
+        # the watchdog thread may have been started by earlier tests, in which case it is not started by this one
+        self.forge.replace_with(timeouts, "_watchdog", Watchdog("shakedown-timeouts"))
+        with Session() as session:
+            run_tests(TimedTest.generate_tests())
+        [result] = session.iter_results()
+        self.assertTrue(result.is_success())
+        self.assertEquals(result.resource_usage.get_thread_growth(), 0)
+        self.assertEquals(result.resource_usage.leaks, [])
+    def test_negligible_usage_not_reported(self):
+        self.override_config("resource_usage.enabled", True)
+        session = self._run()
+        usages = dict((result.test_metadata.canonical_name.rsplit(":", 1)[-1], result.resource_usage)
+                      for result in session.iter_results())
+        usages["test_burn_cpu"].rusage.update(ru_utime=0.0001, ru_stime=0)
+        usages["test_leak_fd"].rusage.update(ru_utime=0.25, ru_stime=0)
+        for usage in usages.values():
+            usage.rss_before, usage.rss_after = 0, 1024
+        output = StringIO()
+        Reporter(output).report_session(session)
+        output = output.getvalue()
+        self.assertIn("test_leak_fd: 0.250s", output)
+        self.assertNotIn("0.000s", output)
+        self.assertNotIn("Tests growing the most in memory:", output)
+    def _run(self):
+        with Session() as session:
+            run_tests(LeakingTest.generate_tests())
+        return session
+
+class TimedTest(shakedown.Test):
+    @shakedown.timeout(10)
+    def test_timed(self):
+        pass
+
+class LeakingTest(shakedown.Test):
+    def test_burn_cpu(self):
+        _burn_cpu()
+    def test_leak_fd(self):
+        _burn_cpu()
+        _leak_fd()
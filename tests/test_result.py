@@ -33,3 +33,55 @@ class AggregatedResultTest(TestCase):
         self.assertEquals(self.result.get_num_errors(), 3)
         self.assertEquals(self.result.get_num_skipped(), 2)
         self.assertEquals(self.result.get_num_failures(), 1)
+
+class FailureGroupsTest(TestCase):
+    def setUp(self):
+        super(FailureGroupsTest, self).setUp()
+        self.results = [Result("test_{0}".format(index)) for index in range(6)]
+        for index, result in enumerate(self.results[:5]):
+            _add_failure(result, index)
+        # the same error twice in one result is counted once
+        _add_failure(self.results[0], 100)
+        _add_error(self.results[5])
+        self.result = AggregatedResult(self.results.__iter__)
+    def test_groups(self):
+        [failures_group, errors_group] = self.result.get_failure_groups()
+        self.assertEquals(failures_group.count, 5)
+        self.assertEquals(failures_group.examples, ["test_0", "test_1", "test_2"])
+        self.assertEquals(failures_group.get_description(), "AssertionError: Expected 0")
+        self.assertEquals(errors_group.count, 1)
+        self.assertEquals(errors_group.examples, ["test_5"])
+    def test_max_examples(self):
+        self.assertEquals(len(self.result.get_failure_groups(max_examples=10)[0].examples), 5)
+
+def _add_failure(result, index):
+    try:
+        raise AssertionError("Expected {0}".format(index))
+    except AssertionError:
+        result.add_failure()
+
+def _add_error(result):
+    try:
+        {}["key"]
+    except KeyError:
+        result.add_error()
+
+class ResultStatusTest(TestCase):
+    def test_statuses(self):
+        result = Result()
+        self.assertEquals(result.get_status(), "incomplete")
+        result.mark_finished()
+        self.assertEquals(result.get_status(), "success")
+        result.add_skip("Reason")
+        self.assertEquals(result.get_status(), "skip")
+        _add_failure(result, 1)
+        self.assertEquals(result.get_status(), "failure")
+        _add_error(result)
+        self.assertEquals(result.get_status(), "error")
+    def test_duration(self):
+        result = Result()
+        self.assertIsNone(result.get_duration())
+        result.mark_started()
+        self.assertIsNone(result.get_duration())
+        result.mark_finished()
+        self.assertGreaterEqual(result.get_duration(), 0)
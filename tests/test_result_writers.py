@@ -0,0 +1,89 @@
+from .utils import TestCase
+from shakedown import plugins
+from shakedown.exceptions import TestFailed
+from shakedown.runner import run_tests
+from shakedown.session import Session
+from shakedown.utils.result_writers import JSONLinesResultWriter
+from shakedown.utils.result_writers import JUnitXMLResultWriter
+from tempfile import mkdtemp
+from xml.etree import ElementTree
+import json
+import os
+import shakedown
+import shutil
+
+class ResultWritersTestBase(TestCase):
+    def setUp(self):
+        super(ResultWritersTestBase, self).setUp()
+        self.root = mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.path = os.path.join(self.root, "results")
+    def run_session(self):
+        with Session() as session:
+            run_tests(SampleTest.generate_tests())
+        return session
+
+class JUnitTest(ResultWritersTestBase):
+    def test_junit_plugin(self):
+        self.override_config("result_files.junit_path", self.path)
+        plugins.manager.activate("junit")
+        self.addCleanup(plugins.manager.deactivate, "junit")
+        self.run_session()
+        suite = ElementTree.parse(self.path).getroot()
+        self.assertEquals(dict((name, suite.get(name)) for name in ("tests", "failures", "errors", "skipped")),
+                          {"tests" : "4", "failures" : "1", "errors" : "1", "skipped" : "1"})
+        cases = dict((case.get("name"), case) for case in suite.findall("testcase"))
+        self.assertEquals(sorted(cases), ["test_error", "test_fail", "test_skip", "test_succeed"])
+        self.assertEquals(list(cases["test_succeed"]), [])
+        [error] = cases["test_error"]
+        self.assertEquals(error.tag, "error")
+        self.assertEquals(error.get("message"), "Invalid \x01value".replace("\x01", "?"))
+        self.assertIn("Traceback", error.text)
+        self.assertEquals(cases["test_fail"][0].tag, "failure")
+        self.assertEquals(cases["test_skip"][0].get("message"), "Not now")
+    def test_valid_before_closing(self):
+        writer = JUnitXMLResultWriter(self.path)
+        self.assertEquals(ElementTree.parse(self.path).getroot().findall("testcase"), [])
+        session = self.run_session()
+        for index, result in enumerate(session.iter_results()):
+            writer.add_result(result)
+            self.assertEquals(len(ElementTree.parse(self.path).getroot().findall("testcase")), index + 1)
+        writer.close()
+        self.assertEquals(ElementTree.parse(self.path).getroot().get("tests"), "4")
+
+class JSONResultsTest(ResultWritersTestBase):
+    def test_json_results_plugin(self):
+        self.override_config("result_files.json_path", self.path)
+        plugins.manager.activate("json_results")
+        self.addCleanup(plugins.manager.deactivate, "json_results")
+        session = self.run_session()
+        records = self._read_records()
+        self.assertEquals(len(records), 4)
+        self.assertEquals(set(record["session_id"] for record in records), set([session.id]))
+        statuses = dict((record["name"].rsplit(":", 1)[-1], record["status"]) for record in records)
+        self.assertEquals(statuses, {"test_error" : "error", "test_fail" : "failure", "test_skip" : "skip",
+                                     "test_succeed" : "success"})
+        [error_record] = [record for record in records if record["status"] == "error"]
+        [error] = error_record["errors"]
+        self.assertEquals(error["type"], "{0}.ValueError".format(ValueError.__module__))
+        self.assertIsNotNone(error_record["duration"])
+    def test_lines_written_as_tests_end(self):
+        writer = JSONLinesResultWriter(self.path, "session-id")
+        session = self.run_session()
+        for index, result in enumerate(session.iter_results()):
+            writer.add_result(result)
+            self.assertEquals(len(self._read_records()), index + 1)
+        writer.close()
+    def _read_records(self):
+        with open(self.path) as f:
+            return [json.loads(line) for line in f]
+
+class SampleTest(shakedown.Test):
+    def test_succeed(self):
+        pass
+    def test_fail(self):
+        raise TestFailed("Expected failure")
+    def test_error(self):
+        raise ValueError("Invalid \x01value")
+    def test_skip(self):
+        shakedown.skip_test("Not now")
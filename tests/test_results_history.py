@@ -0,0 +1,110 @@
+from .utils import TestCase
+from shakedown import plugins
+from shakedown.api import run_session
+from shakedown.frontend.shake_results import shake_results
+from shakedown.metadata import get_test_key
+from shakedown.runner import run_tests
+from shakedown.session import Session
+from shakedown.utils.results_db import ResultsDatabase
+from six.moves import cStringIO as StringIO
+from tempfile import mkdtemp
+import os
+import shakedown
+import shutil
+import time
+
+class ResultsHistoryTestBase(TestCase):
+    def setUp(self):
+        super(ResultsHistoryTestBase, self).setUp()
+        root = mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        self.path = os.path.join(root, "results.db")
+        self.override_config("results_history.path", self.path)
+    def open_db(self):
+        returned = ResultsDatabase(self.path)
+        self.addCleanup(returned.close)
+        return returned
+
+class ResultsHistoryPluginTest(ResultsHistoryTestBase):
+    def setUp(self):
+        super(ResultsHistoryPluginTest, self).setUp()
+        plugins.manager.activate("results_history")
+        self.addCleanup(plugins.manager.deactivate, "results_history")
+    def test_results_recorded(self):
+        self.override_config("results_history.batch_size", 2)
+        with Session() as session:
+            run_tests(SampleTest.generate_tests())
+        history = self.open_db().get_test_history(_get_name("test_fail"))
+        [(session_id, status, start_time, duration, fingerprint)] = history
+        self.assertEquals((session_id, status), (session.id, "failure"))
+        self.assertIsNotNone(start_time)
+        self.assertIsNotNone(duration)
+        self.assertIsNotNone(fingerprint)
+        [(_, status, _, _, fingerprint)] = self.open_db().get_test_history(_get_name("test_succeed"))
+        self.assertEquals((status, fingerprint), ("success", None))
+    def test_flaky(self):
+        self.addCleanup(setattr, SampleTest, "should_fail", False)
+        for should_fail in (False, True, False):
+            SampleTest.should_fail = should_fail
+            with Session():
+                run_tests(SampleTest.generate_tests())
+        self.assertEquals(self.open_db().get_flaky_tests(0), [(_get_name("test_flaky"), 3, 1)])
+    def test_test_files_grouped_across_sessions(self):
+        root = mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        path = os.path.join(root, "test_grouped.py")
+        with open(path, "w") as f:
+            f.write("import shakedown\nclass GroupedTest(shakedown.Test):\n    def test_method(self):\n        pass\n")
+        names = []
+        for _ in range(2):
+            session = run_session([path])
+            [result] = session.iter_results()
+            names.append(result.test_metadata.canonical_name)
+        # each session imports the file into a package of its own
+        self.assertNotEquals(names[0], names[1])
+        key = "{0}:test_grouped.GroupedTest:test_method".format(path)
+        self.assertEquals(len(self.open_db().get_test_history(key)), 2)
+
+class ShakeResultsTest(ResultsHistoryTestBase):
+    def setUp(self):
+        super(ShakeResultsTest, self).setUp()
+        now = time.time()
+        day = 24 * 60 * 60
+        db = self.open_db()
+        db.add_results([
+            ("session-1", "test_a", "success", now - 40 * day, 1.0, None),
+            ("session-1", "test_b", "success", now - 40 * day, 1.0, None),
+            ("session-2", "test_a", "success", now - day, 3.0, None),
+            ("session-2", "test_b", "error", now - day, 5.0, "fingerprint"),
+            ("session-3", "test_b", "success", now - day, 0.5, None),
+        ])
+    def test_slower(self):
+        output = self._shake_results(["slower"])
+        self.assertIn("test_a: 1.000s -> 3.000s", output)
+        self.assertNotIn("test_b", output)
+    def test_flaky(self):
+        self.assertIn("test_b: 1 of 2 runs unsuccessful", self._shake_results(["flaky", "--days", "7"]))
+    def test_history(self):
+        output = self._shake_results(["history", "test_b"])
+        self.assertEquals(len(output.splitlines()), 4)
+    def _shake_results(self, argv):
+        stream = StringIO()
+        self.assertEquals(shake_results(argv, report_stream=stream), 0)
+        return stream.getvalue()
+
+def _get_name(method_name):
+    return get_test_key(_get_file_path(), "{0}.{1}:{2}".format(SampleTest.__module__, SampleTest.__name__, method_name))
+
+def _get_file_path():
+    file_path = os.path.abspath(__file__)
+    return file_path[:-1] if file_path.endswith(".pyc") else file_path
+
+class SampleTest(shakedown.Test):
+    should_fail = False
+    def test_succeed(self):
+        pass
+    def test_fail(self):
+        raise shakedown.exceptions.TestFailed()
+    def test_flaky(self):
+        if self.should_fail:
+            raise ZeroDivisionError()
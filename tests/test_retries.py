@@ -0,0 +1,126 @@
+from .utils import TestCase
+from shakedown.exceptions import TestFailed
+from shakedown.runner import run_tests
+from shakedown.session import Session
+from shakedown.utils.reporter import Reporter
+from six.moves import cStringIO as StringIO
+import functools
+import shakedown
+
+class RetriesTest(TestCase):
+    def setUp(self):
+        super(RetriesTest, self).setUp()
+        self.calls = []
+        SampleTest.calls = self.calls
+        SampleTest.num_failures = 1
+    def test_no_retries_by_default(self):
+        session = self._run()
+        self.assertEquals(self._get_result(session, "test_2_flaky").get_status(), "failure")
+        self.assertEquals(self.calls, ["succeed", "flaky", "cleanup", "error"])
+    def test_retry_immediately(self):
+        self.override_config("run.retries", 2)
+        session = self._run()
+        self.assertEquals(self.calls, ["succeed", "flaky", "cleanup", "flaky", "cleanup", "error", "error", "error"])
+        flaky = self._get_result(session, "test_2_flaky")
+        self.assertTrue(flaky.is_success())
+        self.assertTrue(flaky.is_flaky())
+        [attempt] = flaky.get_previous_attempts()
+        self.assertEquals(attempt.get_status(), "failure")
+        self.assertEquals(len(attempt.failures), 1)
+        error = self._get_result(session, "test_3_error")
+        self.assertTrue(error.is_error())
+        self.assertFalse(error.is_flaky())
+        self.assertEquals(error.get_num_attempts(), 3)
+        self.assertEquals(len(error.get_errors()), 1)
+        self.assertEquals(session.result.get_num_flaky(), 1)
+        self.assertEquals(session.result.get_num_failures(), 0)
+        self.assertTrue(session.is_complete())
+    def test_retry_at_end(self):
+        self.override_config("run.retries", 1)
+        self.override_config("run.retry_at_end", True)
+        session = self._run()
+        self.assertEquals(self.calls, ["succeed", "flaky", "cleanup", "error", "flaky", "cleanup", "error"])
+        self.assertTrue(self._get_result(session, "test_2_flaky").is_flaky())
+        self.assertTrue(session.is_complete())
+    def test_hooks_triggered_once_per_test(self):
+        self.override_config("run.retries", 2)
+        self._test_hooks_triggered_once_per_test()
+    def test_hooks_triggered_once_per_test_retried_at_end(self):
+        self.override_config("run.retries", 2)
+        self.override_config("run.retry_at_end", True)
+        self._test_hooks_triggered_once_per_test()
+    def test_hooks_triggered_once_per_test_retried_at_end_isolated(self):
+        self.override_config("run.retries", 2)
+        self.override_config("run.retry_at_end", True)
+        self.override_config("run.isolate", True)
+        self._test_hooks_triggered_once_per_test()
+    def test_hooks_triggered_when_stopping_before_retrying(self):
+        self.override_config("run.retries", 1)
+        self.override_config("run.retry_at_end", True)
+        self.override_config("run.stop_on_error", True)
+        SampleTest.num_failures = 2
+        hook_calls = self._register_test_hooks()
+        session = self._run()
+        self.assertFalse(session.is_complete())
+        # the erroring test is not retried, as the session stops once the flaky test fails again
+        self.assertEquals(self.calls, ["succeed", "flaky", "cleanup", "error", "flaky", "cleanup"])
+        self.assertEquals(sorted(hook_calls), [
+            ("test_end", "error"), ("test_end", "failure"), ("test_end", "success"),
+            ("test_error", "error"), ("test_failure", "failure"),
+            ("test_start", "incomplete"), ("test_start", "incomplete"), ("test_start", "incomplete"),
+            ("test_success", "success"),
+        ])
+    def _test_hooks_triggered_once_per_test(self):
+        hook_calls = self._register_test_hooks()
+        self._run()
+        self.assertEquals(sorted(hook_calls), [
+            ("test_end", "error"), ("test_end", "success"), ("test_end", "success"),
+            ("test_error", "error"),
+            ("test_start", "incomplete"), ("test_start", "incomplete"), ("test_start", "incomplete"),
+            ("test_success", "success"), ("test_success", "success"),
+        ])
+    def _register_test_hooks(self):
+        returned = []
+        for hook_name in ["test_start", "test_success", "test_failure", "test_error", "test_end"]:
+            hook = getattr(shakedown.hooks, hook_name)
+            hook.register(functools.partial(self._record_hook_call, returned, hook_name), "retries-test")
+            self.addCleanup(hook.unregister_by_identifier, "retries-test")
+        return returned
+    def _record_hook_call(self, hook_calls, hook_name, result):
+        hook_calls.append((hook_name, result.get_status()))
+    def test_stop_on_error_after_retries(self):
+        self.override_config("run.retries", 1)
+        self.override_config("run.stop_on_error", True)
+        SampleTest.num_failures = 2
+        session = self._run()
+        self.assertEquals(self.calls, ["succeed", "flaky", "cleanup", "flaky", "cleanup"])
+        self.assertFalse(session.is_complete())
+    def test_flaky_reported(self):
+        self.override_config("run.retries", 1)
+        stream = StringIO()
+        Reporter(stream).report_session(self._run())
+        self.assertIn("Flaky tests", stream.getvalue())
+        self.assertIn("test_2_flaky (2 attempts)", stream.getvalue())
+    def _run(self):
+        with Session() as session:
+            run_tests(SampleTest.generate_tests())
+        return session
+    def _get_result(self, session, method_name):
+        [returned] = [result for result in session.iter_results()
+                      if result.test_metadata.canonical_name.endswith(":" + method_name)]
+        return returned
+
+class SampleTest(shakedown.Test):
+    calls = None
+    num_failures = 0
+    def test_1_succeed(self):
+        self.calls.append("succeed")
+    def test_2_flaky(self):
+        self.calls.append("flaky")
+        shakedown.add_cleanup(self.calls.append, "cleanup")
+        if SampleTest.num_failures:
+            SampleTest.num_failures -= 1
+            raise TestFailed("Not yet")
+    def test_3_error(self):
+        self.calls.append("error")
+        raise ZeroDivisionError()
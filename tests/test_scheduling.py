@@ -0,0 +1,114 @@
+from .utils import TestCase
+from shakedown import hooks
+from shakedown.runner import run_tests
+from shakedown.scheduling import ResourceScheduler
+from shakedown.session import Session
+import os
+import shakedown
+import shutil
+import tempfile
+import time
+
+_state = {"log_dir" : None}
+
+class ResourceSchedulerTest(TestCase):
+    def setUp(self):
+        super(ResourceSchedulerTest, self).setUp()
+        self.resources = {"a" : {"db" : 1}, "b" : {"db" : 1}, "c" : {}, "d" : {"rig" : 2}, "e" : {"rig" : 2},
+                          "f" : {"rig" : 2}}
+        self.scheduler = ResourceScheduler(sorted(self.resources), self.resources.__getitem__)
+    def test_blocked_items_passed_over(self):
+        self.assertEquals(self.scheduler.pop_runnable(), "a")
+        self.assertEquals(self.scheduler.pop_runnable(), "c")
+        self.scheduler.release("a")
+        self.assertEquals(self.scheduler.pop_runnable(), "b")
+    def test_capacity(self):
+        self.assertEquals([self.scheduler.pop_runnable() for _ in range(5)], ["a", "c", "d", "e", None])
+        self.scheduler.release("d")
+        self.assertEquals(self.scheduler.pop_runnable(), "f")
+    def test_smallest_capacity_applies(self):
+        scheduler = ResourceScheduler("ab", {"a" : {"rig" : 3}, "b" : {"rig" : 1}}.__getitem__)
+        self.assertEquals(scheduler.pop_runnable(), "a")
+        self.assertIsNone(scheduler.pop_runnable())
+    def test_has_pending(self):
+        scheduler = ResourceScheduler("a", {"a" : {}}.__getitem__)
+        self.assertTrue(scheduler.has_pending())
+        scheduler.pop_runnable()
+        self.assertFalse(scheduler.has_pending())
+    def test_wait_seconds(self):
+        self.forge.replace_with(time, "time", lambda: self.now)
+        self.now = 100
+        self.assertEquals(self.scheduler.pop_runnable(), "a")
+        self.assertEquals(self.scheduler.pop_runnable(), "c")
+        self.now = 103
+        self.scheduler.release("a")
+        self.assertEquals(self.scheduler.pop_runnable(), "b")
+        self.assertEquals(dict(self.scheduler.wait_seconds), {"db" : 3})
+
+class ConcurrentRunTest(TestCase):
+    def setUp(self):
+        super(ConcurrentRunTest, self).setUp()
+        self.override_config("run.concurrency", 3)
+        _state["log_dir"] = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, _state["log_dir"])
+    def test_exclusive_resource(self):
+        with Session() as session:
+            run_tests(ResourceUsingTest.generate_tests())
+        self.assertEquals([result.get_status() for result in session.iter_results()], ["success"] * 4)
+        self.assertTrue(session.is_complete())
+        intervals = self._get_intervals()
+        db_intervals = sorted(interval for name, interval in intervals.items() if name.startswith("test_db"))
+        for (_, end), (start, _) in zip(db_intervals, db_intervals[1:]):
+            self.assertLessEqual(end, start)
+        # the test not using the database runs alongside the ones using it
+        free_start, free_end = intervals["test_free"]
+        self.assertTrue(any(start < free_end and free_start < end for start, end in db_intervals))
+        self.assertGreater(session.resource_wait_seconds["db"], 0)
+    def test_start_hooks_triggered_on_dispatch(self):
+        events = []
+        hooks.test_start.register(lambda: events.append("start"), "scheduling-test")
+        self.addCleanup(hooks.test_start.unregister_by_identifier, "scheduling-test")
+        hooks.test_end.register(lambda: events.append("end"), "scheduling-test")
+        self.addCleanup(hooks.test_end.unregister_by_identifier, "scheduling-test")
+        with Session():
+            run_tests(ResourceUsingTest.generate_tests())
+        # the first test using the database and the test not using it run at once
+        self.assertEquals(events[:2], ["start", "start"])
+        self.assertEquals(sorted(events), ["end"] * 4 + ["start"] * 4)
+    def test_crashes(self):
+        with Session() as session:
+            run_tests(CrashingTest.generate_tests())
+        statuses = dict((result.test_metadata.canonical_name.rsplit(":", 1)[-1], result.get_status())
+                        for result in session.iter_results())
+        self.assertEquals(statuses, {"test_exit" : "error", "test_succeed" : "success"})
+    def _get_intervals(self):
+        returned = {}
+        for filename in os.listdir(_state["log_dir"]):
+            with open(os.path.join(_state["log_dir"], filename)) as f:
+                returned[filename] = tuple(float(value) for value in f.read().split())
+        return returned
+
+def _record_interval(name):
+    start = time.time()
+    time.sleep(0.2)
+    with open(os.path.join(_state["log_dir"], name), "w") as f:
+        f.write("{0!r} {1!r}".format(start, time.time()))
+
+class ResourceUsingTest(shakedown.Test):
+    @shakedown.uses_resource("db")
+    def test_db_1(self):
+        _record_interval("test_db_1")
+    @shakedown.uses_resource("db")
+    def test_db_2(self):
+        _record_interval("test_db_2")
+    @shakedown.uses_resource("db")
+    def test_db_3(self):
+        _record_interval("test_db_3")
+    def test_free(self):
+        _record_interval("test_free")
+
+class CrashingTest(shakedown.Test):
+    def test_exit(self):
+        os._exit(3) # pylint: disable=W0212
+    def test_succeed(self):
+        pass
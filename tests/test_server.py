@@ -0,0 +1,116 @@
+from .utils import TestCase
+from shakedown.frontend import shake_client
+from shakedown.frontend import shake_run
+from shakedown.utils.server import run_remote, Server, ServerError
+from six import BytesIO
+from tempfile import mkdtemp
+import os
+import shutil
+import signal
+import sys
+import time
+
+_state = {"leaked" : False}
+
+_TEST_FILE = """
+import shakedown
+
+class ServedTest(shakedown.Test):
+    def test_succeed(self):
+        pass
+    def test_fail(self):
+        assert 1 == 2
+"""
+
+def _echo(argv):
+    sys.stdout.write("out:{0}\n".format(" ".join(argv)))
+    sys.stderr.write("err:{0}\n".format(os.getcwd()))
+    return int(argv[0]) if argv else 0
+
+def _leak(argv):
+    leaked = _state["leaked"]
+    _state["leaked"] = True
+    return int(leaked)
+
+def _crash(argv):
+    os.kill(os.getpid(), signal.SIGKILL)
+
+def _exit(argv):
+    sys.exit(argv[0])
+
+class ServerTest(TestCase):
+    def setUp(self):
+        super(ServerTest, self).setUp()
+        self.tempdir = mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tempdir)
+        self.socket_path = os.path.join(self.tempdir, "server.sock")
+    def test_output_and_exit_code(self):
+        self._start_server(_echo)
+        stdout, stderr = BytesIO(), BytesIO()
+        self.assertEquals(run_remote(self.socket_path, ["3", "a"], cwd=self.tempdir, stdout=stdout, stderr=stderr), 3)
+        self.assertEquals(stdout.getvalue(), "out:3 a\n".encode("utf-8"))
+        self.assertEquals(stderr.getvalue(), "err:{0}\n".format(os.path.realpath(self.tempdir)).encode("utf-8"))
+    def test_environment(self):
+        self._start_server(lambda argv: int(os.environ.get("SHAKEDOWN_SERVER_TEST", 10)))
+        self.assertEquals(self._run([], environ={"SHAKEDOWN_SERVER_TEST" : "7"}), 7)
+        self.assertEquals(self._run([], environ={}), 10)
+    def test_state_not_leaked_between_requests(self):
+        self._start_server(_leak)
+        for _ in range(3):
+            self.assertEquals(self._run([]), 0)
+    def test_killed_request(self):
+        self._start_server(_crash)
+        self.assertEquals(self._run([]), 128 + signal.SIGKILL)
+        self.assertEquals(self._run([]), 128 + signal.SIGKILL)
+    def test_system_exit(self):
+        self._start_server(_exit)
+        stderr = BytesIO()
+        self.assertEquals(self._run(["bla"], stderr=stderr), 1)
+        self.assertEquals(stderr.getvalue(), b"bla\n")
+    def test_shake_run(self):
+        with open(os.path.join(self.tempdir, "test_file.py"), "w") as f:
+            f.write(_TEST_FILE)
+        self._start_server(shake_run.shake_run_preloaded)
+        stderr = BytesIO()
+        self.assertEquals(self._run(["--no-progress", "test_file.py"], stderr=stderr), 255)
+        self.assertIn(b"test_fail", stderr.getvalue())
+    def test_shake_client(self):
+        self._start_server(_echo)
+        self.forge.replace_with(sys, "stdout", BytesIO())
+        self.assertEquals(shake_client.shake_client(["--socket", self.socket_path, "--", "5"]), 5)
+        self.assertEquals(sys.stdout.getvalue(), b"out:5\n")
+    def test_no_server(self):
+        with self.assertRaises(ServerError):
+            self._run([])
+    def test_already_listening(self):
+        self._start_server(_echo)
+        with self.assertRaises(ServerError):
+            Server(self.socket_path, _echo).listen()
+    def test_stale_socket_replaced(self):
+        self._start_server(_echo)
+        self._stop_server()
+        self.assertTrue(os.path.exists(self.socket_path))
+        self._start_server(_echo)
+        self.assertEquals(self._run(["0"]), 0)
+    def _run(self, argv, environ=None, stderr=None):
+        return run_remote(self.socket_path, argv, cwd=self.tempdir, environ=environ,
+                          stdout=BytesIO(), stderr=BytesIO() if stderr is None else stderr)
+    def _start_server(self, run_func):
+        server = Server(self.socket_path, run_func)
+        server.listen()
+        pid = os.fork()
+        if pid == 0:
+            try:
+                server.serve_forever()
+            finally:
+                os._exit(1) # pylint: disable=W0212
+        server._listener.close() # pylint: disable=W0212
+        self._server_pid = pid
+        self.addCleanup(self._stop_server)
+    def _stop_server(self):
+        if self._server_pid is None:
+            return
+        os.kill(self._server_pid, signal.SIGKILL)
+        os.waitpid(self._server_pid, 0)
+        self._server_pid = None
+    _server_pid = None
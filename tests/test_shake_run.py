@@ -5,6 +5,9 @@ from .utils.test_generator import TestGenerator
 from shakedown.frontend import shake_run
 from shakedown import site
 import os
+import shakedown
+
+_events = []
 
 class ShakeRunTest(TestCase):
     def setUp(self):
@@ -50,3 +53,24 @@ class ShakeRunTest(TestCase):
     def tearDown(self):
         self.generator.assert_all_run()
         super(ShakeRunTest, self).tearDown()
+
+class LazyCollectionTest(TestCase):
+    def setUp(self):
+        super(LazyCollectionTest, self).setUp()
+        del _events[:]
+    def test_tests_run_as_collected(self):
+        session = shake_run._run_session(RecordingLoader(), ["path"], NullFile())
+        self.assertTrue(session.result.is_success())
+        self.assertEquals(_events, ["collected", "ran", "collected", "ran"])
+
+class RecordingLoader(object):
+    def iter_runnable_tests(self, path): # pylint: disable=W0613
+        for test in RecordedTest.generate_tests():
+            _events.append("collected")
+            yield test
+
+class RecordedTest(shakedown.Test):
+    def test_1(self):
+        _events.append("ran")
+    def test_2(self):
+        _events.append("ran")
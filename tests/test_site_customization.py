@@ -1,12 +1,13 @@
 from .utils import TestCase
+from .utils.http_server import LocalHTTPServer
 import os
 import sys
-from tempfile import mktemp
+from tempfile import mkdtemp, mktemp
 import shakedown
 import shakedown.site
 from shakedown.frontend import shake_run
 import requests
-import pkg_resources
+from shakedown.utils import entry_points
 from six.moves import cStringIO as StringIO
 
 site_customized = False
@@ -46,20 +47,18 @@ class CustomizationTest(TestCase):
             f.write(self.get_customization_source())
         self.assert_customization_loaded()
     def test_customize_via_url(self):
-        url = "http://nonexistent.com/some/path/to/custom/file.py"
-        self.forge.replace(requests, "get")
-        fake_response = self.forge.create_mock(requests.Response)
-        fake_response.raise_for_status().whenever()
-        fake_response.content = self.get_customization_source()
-        requests.get(url).and_return(fake_response)
-        os.environ["SHAKEDOWN_SETTINGS"] = url
+        self.override_config("site.cache_dir", mkdtemp())
+        server = LocalHTTPServer(lambda request: (200, {}, self.get_customization_source())).start()
+        self.addCleanup(server.stop)
+        os.environ["SHAKEDOWN_SETTINGS"] = server.get_url("/some/path/to/custom/file.py")
         self.addCleanup(os.environ.pop, "SHAKEDOWN_SETTINGS")
-        self.forge.replay()
         self.assert_customization_loaded()
     def test_customize_via_pkgutil_entry_point(self):
-        self.forge.replace(pkg_resources, "iter_entry_points")
+        self.forge.replace(entry_points, "_scan_entry_points")
+        self.addCleanup(entry_points.clear_cache)
+        entry_points.clear_cache()
         entry_point = self.forge.create_wildcard_mock()
-        pkg_resources.iter_entry_points("shakedown.site.customize").and_return(iter([entry_point]))
+        entry_points._scan_entry_points("shakedown.site.customize").and_return(iter([entry_point])) # pylint: disable=W0212
         entry_point.load().and_return(self.get_customization_function())
         self.forge.replay()
         self.assert_customization_loaded()
@@ -68,3 +67,53 @@ class CustomizationTest(TestCase):
         site_customized = False
         shakedown.site.load()
         self.assertTrue(site_customized, "Customization not loaded!")
+
+class RemoteSiteCacheTest(TestCase):
+    def setUp(self):
+        super(RemoteSiteCacheTest, self).setUp()
+        self.override_config("site.cache_dir", mkdtemp())
+        self.override_config("site.cache_ttl_seconds", 60)
+        self.etag = '"v1"'
+        self.server = LocalHTTPServer(self._handle_request).start()
+        self.addCleanup(self.server.stop)
+        self.url = self.server.get_url("/site.py")
+    def _handle_request(self, request):
+        if request.headers.get("If-None-Match") == self.etag:
+            return 304, {"ETag" : self.etag}, ""
+        return 200, {"ETag" : self.etag}, "import {0}; {0}.site_customized=True".format(__name__)
+    def test_no_requests_within_ttl(self):
+        self.assert_url_loaded()
+        self.assert_url_loaded()
+        self.assertEquals(len(self.server.requests), 1)
+    def test_conditional_request_after_ttl(self):
+        self.override_config("site.cache_ttl_seconds", 0)
+        self.assert_url_loaded()
+        self.assert_url_loaded()
+        self.assertEquals(len(self.server.requests), 2)
+        self.assertNotIn("If-None-Match", self.server.requests[0].headers)
+        self.assertEquals(self.server.requests[1].headers["If-None-Match"], self.etag)
+    def test_modified_file_is_refetched(self):
+        self.override_config("site.cache_ttl_seconds", 0)
+        self.assert_url_loaded()
+        self.etag = '"v2"'
+        self.assert_url_loaded()
+        self.assertEquals(len(self.server.requests), 2)
+    def test_fallback_to_cache_when_unreachable(self):
+        self.override_config("site.cache_ttl_seconds", 0)
+        self.assert_url_loaded()
+        self.server.stop()
+        self.assert_url_loaded()
+    def test_unreachable_without_cache(self):
+        self.server.stop()
+        with self.assertRaises(requests.ConnectionError):
+            shakedown.site.load(self.url)
+    def test_server_errors_fall_back_to_cache(self):
+        self.override_config("site.cache_ttl_seconds", 0)
+        self.assert_url_loaded()
+        self.server.handler = lambda request: (500, {}, "")
+        self.assert_url_loaded()
+    def assert_url_loaded(self):
+        global site_customized
+        site_customized = False
+        shakedown.site.load(self.url)
+        self.assertTrue(site_customized, "Customization not loaded!")
@@ -0,0 +1,57 @@
+from .utils import TestCase
+from tempfile import mkdtemp
+import os
+import subprocess
+import sys
+import time
+
+_PACKAGE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# generous, to avoid flakiness on loaded CI machines -- importing pkg_resources, requests and IPython alone
+# used to take longer than this
+_STARTUP_BUDGET_SECONDS = 1.5
+
+_SHAKE_RUN_SCRIPT = """
+import sys
+from shakedown.frontend import main
+returned = main.main(main.parser.parse_args(["run", {path!r}]))
+sys.stdout.write(",".join(name for name in {heavy_modules!r} if name in sys.modules))
+sys.exit(returned)
+"""
+
+_HEAVY_MODULES = ["pkg_resources", "requests", "IPython", "raven"]
+
+class StartupTimeTest(TestCase):
+    def setUp(self):
+        super(StartupTimeTest, self).setUp()
+        self.empty_dir = mkdtemp()
+        self.env = dict(os.environ)
+        self.env.pop("SHAKEDOWN_SETTINGS", None)
+        self.env["PYTHONPATH"] = os.pathsep.join(filter(None, [_PACKAGE_ROOT, self.env.get("PYTHONPATH")]))
+    def test_shake_run_empty_directory_within_budget(self):
+        # warm up the filesystem and bytecode caches, we only measure the second run
+        self._shake_run_empty_directory()
+        start_time = time.time()
+        self._shake_run_empty_directory()
+        elapsed = time.time() - start_time
+        self.assertLess(elapsed, _STARTUP_BUDGET_SECONDS,
+                        "shake run of an empty directory took {0:.2f} seconds".format(elapsed))
+    def test_heavy_modules_not_imported(self):
+        self.assertEquals(self._shake_run_empty_directory(), "")
+    def _shake_run_empty_directory(self):
+        process = subprocess.Popen(
+            [sys.executable, "-c", _SHAKE_RUN_SCRIPT.format(path=self.empty_dir, heavy_modules=_HEAVY_MODULES)],
+            env=self.env, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        stdout, stderr = process.communicate()
+        self.assertEquals(process.returncode, 0, "shake run failed: {0}".format(stderr))
+        return stdout.decode("utf-8").strip()
+
+class StarImportTest(TestCase):
+    def test_star_import(self):
+        namespace = {}
+        exec("from shakedown import *", namespace)
+        for name in ["Test", "fixture", "assert_equals", "assert_raises", "skip_test", "config", "parameters",
+                     "logger", "uses_resource"]:
+            self.assertIn(name, namespace)
+        self.assertNotIn("sys", namespace)
+        self.assertNotIn("_sys", namespace)
@@ -0,0 +1,149 @@
+from .utils import TestCase
+from shakedown import site
+from shakedown.frontend import shake_run
+from shakedown.metadata import get_test_key
+from shakedown.runner import run_tests
+from shakedown.session import Session
+from shakedown.time_budget import BUDGET_EXHAUSTED, NOT_SELECTED, RunHistory, TimeBudget, select_tests
+from shakedown.utils.conf_utils import parse_duration
+from six.moves import cStringIO # pylint: disable=F0401
+import json
+import os
+import shakedown
+import shutil
+import tempfile
+
+class NamedTest(object):
+    def __init__(self, name):
+        super(NamedTest, self).__init__()
+        self.name = name
+    def get_canonical_name(self):
+        return self.name
+    def __repr__(self):
+        return self.name
+
+class HistoryTest(shakedown.Test):
+    def test_success(self):
+        pass
+    def test_failure(self):
+        shakedown.assert_true(False)
+    def test_skip(self):
+        shakedown.skip_test()
+
+_BUDGETED_TEST_FILE = """
+import shakedown
+
+class BudgetedTest(shakedown.Test):
+    def test_cheap(self):
+        pass
+    def test_expensive(self):
+        pass
+"""
+
+class _TimeBudgetTestBase(TestCase):
+    def setUp(self):
+        super(_TimeBudgetTestBase, self).setUp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.history_path = os.path.join(self.root, "history.json")
+        self.override_config("time_budget.history_path", self.history_path)
+    def _write_history(self, entries):
+        with open(self.history_path, "w") as f:
+            json.dump(dict((key, {"duration" : duration, "runs" : runs, "failures" : failures})
+                           for key, (duration, runs, failures) in entries.items()), f)
+
+class ParseDurationTest(TestCase):
+    def test_parse_duration(self):
+        self.assertEquals(parse_duration("90"), 90)
+        self.assertEquals(parse_duration("90s"), 90)
+        self.assertEquals(parse_duration("10m"), 600)
+        self.assertEquals(parse_duration("1.5h"), 5400)
+        for invalid in ["", "m", "ten minutes", "-1m"]:
+            with self.assertRaises(ValueError):
+                parse_duration(invalid)
+
+class SelectionTest(_TimeBudgetTestBase):
+    def setUp(self):
+        super(SelectionTest, self).setUp()
+        self.tests = dict((name, NamedTest(name)) for name in ["rarely_failing", "often_failing", "slow", "new"])
+        file_path = os.path.abspath(__file__.replace(".pyc", ".py"))
+        self._write_history({
+            get_test_key(file_path, "rarely_failing") : (1, 98, 0),
+            get_test_key(file_path, "often_failing") : (4, 10, 5),
+            get_test_key(file_path, "slow") : (20, 10, 5),
+        })
+    def test_select(self):
+        selected, deselected = self._select(8)
+        # the new test is assumed to take the median duration (4s), and fail with probability 0.5
+        self.assertEquals(selected, ["often_failing", "new"])
+        self.assertEquals(deselected, ["rarely_failing", "slow"])
+    def test_small_tests_fill_the_remaining_budget(self):
+        selected, _ = self._select(9)
+        self.assertEquals(selected, ["rarely_failing", "often_failing", "new"])
+    def test_budget_too_small(self):
+        self.assertEquals(self._select(0.5), ([], ["rarely_failing", "often_failing", "slow", "new"]))
+    def test_no_history(self):
+        os.unlink(self.history_path)
+        self.assertEquals(self._select(2.5)[0], ["rarely_failing", "often_failing"])
+    def test_time_budget_skips(self):
+        budget = TimeBudget(8, RunHistory(self.history_path))
+        selected = budget.select(self._get_tests())
+        self.assertEquals(list(TimeBudget(1000, None).iter_within_budget(selected)), selected)
+        self.assertEquals(list(budget.iter_within_budget(selected)), selected)
+        exhausted = TimeBudget(0, None)
+        self.assertEquals(list(exhausted.iter_within_budget(selected)), [])
+        self.assertEquals([(repr(metadata), reason) for metadata, reason in budget.skipped + exhausted.skipped], [
+            ("rarely_failing", NOT_SELECTED), ("slow", NOT_SELECTED),
+            ("often_failing", BUDGET_EXHAUSTED), ("new", BUDGET_EXHAUSTED)])
+    def _select(self, budget_seconds):
+        selected, deselected = select_tests(self._get_tests(), budget_seconds, RunHistory(self.history_path))
+        return [test.name for test in selected], [test.name for test in deselected]
+    def _get_tests(self):
+        return [self.tests[name] for name in ["rarely_failing", "often_failing", "slow", "new"]]
+
+class RunHistoryTest(_TimeBudgetTestBase):
+    def test_update(self):
+        for _ in range(2):
+            with Session() as session:
+                run_tests(HistoryTest.generate_tests())
+            history = RunHistory(self.history_path)
+            history.update(session.iter_results())
+            history.save()
+        history = RunHistory(self.history_path)
+        results = dict((result.test_metadata.canonical_name.rsplit(":", 1)[-1], result) for result in session.iter_results())
+        self.assertEquals(history.get_failure_probability(results["test_success"].test_metadata.get_key()), 0.25)
+        self.assertEquals(history.get_failure_probability(results["test_failure"].test_metadata.get_key()), 0.75)
+        self.assertIsNotNone(history.get_duration(results["test_failure"].test_metadata.get_key()))
+        # skipped tests tell nothing about failing
+        self.assertIsNone(history.get_duration(results["test_skip"].test_metadata.get_key()))
+    def test_corrupt_file(self):
+        with open(self.history_path, "w") as f:
+            f.write("{")
+        self.assertEquals(RunHistory(self.history_path).get_failure_probability("bla"), 0.5)
+
+class ShakeRunTimeBudgetTest(_TimeBudgetTestBase):
+    def setUp(self):
+        super(ShakeRunTimeBudgetTest, self).setUp()
+        self.forge.replace_with(site, "load", lambda *args: None)
+        self.path = os.path.join(self.root, "test_budgeted.py")
+        with open(self.path, "w") as f:
+            f.write(_BUDGETED_TEST_FILE)
+    def test_time_budget(self):
+        self._write_history({get_test_key(self.path, "test_budgeted.BudgetedTest:test_expensive") : (100, 1, 0),
+                             get_test_key(self.path, "test_budgeted.BudgetedTest:test_cheap") : (0.1, 1, 0)})
+        report = cStringIO()
+        self.assertEquals(shake_run.shake_run(["--time-budget", "1m", "--no-progress", self.path],
+                                              report_stream=report), 0)
+        self.assertIn("1 tests not run within the time budget (60s):", report.getvalue())
+        self.assertIn("BudgetedTest:test_expensive ({0})".format(NOT_SELECTED), report.getvalue())
+        history = RunHistory(self.history_path)
+        self.assertEquals(history.get_duration(get_test_key(self.path, "test_budgeted.BudgetedTest:test_expensive")), 100)
+        self.assertLess(history.get_duration(get_test_key(self.path, "test_budgeted.BudgetedTest:test_cheap")), 0.1)
+    def test_history_not_recorded_by_default(self):
+        self.assertEquals(shake_run.shake_run(["--no-progress", self.path], report_stream=cStringIO()), 0)
+        self.assertFalse(os.path.exists(self.history_path))
+    def test_record_history(self):
+        self.assertEquals(shake_run.shake_run(["--record-history", "--no-progress", self.path],
+                                              report_stream=cStringIO()), 0)
+        self.assertIsNotNone(RunHistory(self.history_path).get_duration(
+            get_test_key(self.path, "test_budgeted.BudgetedTest:test_cheap")))
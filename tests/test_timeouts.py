@@ -0,0 +1,113 @@
+from .utils import TestCase
+from shakedown.runner import run_tests
+from shakedown.session import Session
+from shakedown.exceptions import TestTimedOut
+from shakedown.timeouts import get_test_timeout
+from shakedown.timeouts import timeout_context
+from six.moves import cStringIO as StringIO
+from tempfile import mkdtemp
+import os
+import shakedown
+import shutil
+import sys
+import threading
+import time
+
+class TimeoutsTest(TestCase):
+    def setUp(self):
+        super(TimeoutsTest, self).setUp()
+        self.log_root = mkdtemp()
+        self.addCleanup(shutil.rmtree, self.log_root)
+        self.override_config("log.root", self.log_root)
+    def test_hung_test_interrupted(self):
+        session = self._run(SleepingTest)
+        results = self._get_results(session)
+        self.assertTrue(results["test_1_sleep"].is_error())
+        self.assertTrue(results["test_1_sleep"].is_timeout())
+        [error] = results["test_1_sleep"].get_errors()
+        self.assertEquals(error.exception_type_name, "TestTimedOut")
+        self.assertTrue(results["test_2_quick"].is_success())
+        self.assertFalse(results["test_2_quick"].is_timeout())
+        self.assertTrue(session.is_complete())
+    def test_stacks_dumped_to_test_log(self):
+        session = self._run(SleepingTest)
+        result = self._get_results(session)["test_1_sleep"]
+        log_path = os.path.join(self.log_root, session.id, str(result.test_metadata.id), "log")
+        with open(log_path) as f:
+            contents = f.read()
+        self.assertIn("timed out after 0.2 seconds", contents)
+        self.assertIn("test_1_sleep", contents)
+    def test_no_timeout_by_default(self):
+        [result] = self._run(SlowTest).iter_results()
+        self.assertTrue(result.is_success())
+    def test_default_timeout(self):
+        self.override_config("run.default_timeout_seconds", 0.1)
+        [result] = self._run(SlowTest).iter_results()
+        self.assertTrue(result.is_timeout())
+    def _run(self, test_class):
+        with Session() as session:
+            run_tests(test_class.generate_tests())
+        return session
+    def _get_results(self, session):
+        return dict((result.test_metadata.canonical_name.rsplit(":", 1)[-1], result) for result in session.iter_results())
+
+class NonMainThreadTimeoutTest(TestCase):
+    def test_busy_test_in_thread_interrupted(self):
+        self.forge.replace_with(sys, "stderr", StringIO())
+        outcomes = []
+        def run():
+            [test] = BusyTest.generate_tests()
+            try:
+                with timeout_context(test):
+                    test.run()
+            except TestTimedOut:
+                outcomes.append("timed out")
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join(10)
+        self.assertFalse(thread.is_alive())
+        self.assertEquals(outcomes, ["timed out"])
+        self.assertIn("most recent call first", sys.stderr.getvalue())
+
+class TimeoutSourcesTest(TestCase):
+    def test_precedence(self):
+        self.override_config("run.default_timeout_seconds", 100)
+        timeouts = dict((test.get_canonical_name().rsplit(":", 1)[-1], get_test_timeout(test))
+                        for test in ClassTimeoutTest.generate_tests())
+        self.assertEquals(timeouts, {"test_class_timeout" : 5, "test_method_timeout" : 1})
+        [test] = SlowTest.generate_tests()
+        self.assertEquals(get_test_timeout(test), 100)
+    def test_class_decorator(self):
+        @shakedown.timeout(3)
+        class DecoratedTest(shakedown.Test):
+            def test(self):
+                pass
+        [test] = DecoratedTest.generate_tests()
+        self.assertEquals(get_test_timeout(test), 3)
+
+class SleepingTest(shakedown.Test):
+    @shakedown.timeout(0.2)
+    def test_1_sleep(self):
+        time.sleep(10)
+    @shakedown.timeout(5)
+    def test_2_quick(self):
+        pass
+
+class BusyTest(shakedown.Test):
+    timeout_seconds = 0.2
+    def test(self):
+        deadline = time.time() + 10
+        while time.time() < deadline:
+            pass
+
+class SlowTest(shakedown.Test):
+    def test(self):
+        time.sleep(0.3)
+
+class ClassTimeoutTest(shakedown.Test):
+    timeout_seconds = 5
+    def test_class_timeout(self):
+        pass
+    @shakedown.timeout(1)
+    def test_method_timeout(self):
+        pass
@@ -0,0 +1,84 @@
+from .utils import TestCase
+from .utils import NullFile
+from shakedown import hooks
+from shakedown import site
+from shakedown.frontend import shake_run
+from shakedown.utils.imports import import_file, unload_file
+from shakedown.utils.watch import FileWatcher
+from tempfile import mkdtemp
+import os
+import shutil
+
+_TEST_TEMPLATE = """
+import shakedown
+
+class WatchedTest(shakedown.Test):
+    def test(self):
+        assert {0}
+"""
+
+class _WatchTestBase(TestCase):
+    def setUp(self):
+        super(_WatchTestBase, self).setUp()
+        self.root = mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+    def _write(self, filename, contents):
+        path = os.path.join(self.root, filename)
+        with open(path, "w") as f:
+            f.write(contents)
+        return path
+
+class FileWatcherTest(_WatchTestBase):
+    def test_poll(self):
+        unchanged = self._write("unchanged.py", "a = 1")
+        changed = self._write("changed.py", "a = 1")
+        self._write("not_python.txt", "a = 1")
+        watcher = FileWatcher([self.root])
+        self.assertEquals(watcher.poll(), [])
+        self._write("changed.py", "a = 12")
+        created = self._write("created.py", "")
+        self._write("not_python.txt", "a = 12")
+        os.unlink(unchanged)
+        self.assertEquals(watcher.poll(), sorted([os.path.abspath(changed), os.path.abspath(created)]))
+        self.assertEquals(watcher.poll(), [])
+
+class UnloadFileTest(_WatchTestBase):
+    def test_reimport(self):
+        path = self._write("reimported.py", "value = 1")
+        other = import_file(self._write("other.py", "value = 1"))
+        self.assertEquals(import_file(path).value, 1)
+        self._write("reimported.py", "value = 2")
+        self.assertEquals(import_file(path).value, 1)
+        self.assertTrue(unload_file(path))
+        self.assertEquals(import_file(path).value, 2)
+        self.assertIs(import_file(os.path.join(self.root, "other.py")), other)
+    def test_not_loaded(self):
+        self.assertFalse(unload_file(self._write("never_imported.py", "")))
+
+class WatchModeTest(_WatchTestBase):
+    def setUp(self):
+        super(WatchModeTest, self).setUp()
+        self.forge.replace_with(site, "load", lambda *args: None)
+        self.ended = []
+        hooks.test_end.register(lambda result: self.ended.append(result.get_status()), "watch-test")
+        self.addCleanup(hooks.test_end.unregister_by_identifier, "watch-test")
+    def test_changed_file_rerun(self):
+        path = self._write("test_watched.py", _TEST_TEMPLATE.format("True"))
+        self._write("test_other.py", _TEST_TEMPLATE.format("True"))
+        def iter_changes(watcher):
+            self._write("test_watched.py", _TEST_TEMPLATE.format("False"))
+            yield [os.path.abspath(path)]
+        self.forge.replace_with(FileWatcher, "iter_changes", iter_changes)
+        self.assertEquals(shake_run.shake_run(["--watch", self.root], report_stream=NullFile()), -1)
+        # both tests ran initially, and only the changed one afterwards
+        self.assertEquals(self.ended, ["success", "success", "error"])
+    def test_broken_file_does_not_stop_watching(self):
+        path = self._write("test_watched.py", _TEST_TEMPLATE.format("True"))
+        def iter_changes(watcher):
+            self._write("test_watched.py", "def (")
+            yield [os.path.abspath(path)]
+            self._write("test_watched.py", _TEST_TEMPLATE.format("True"))
+            yield [os.path.abspath(path)]
+        self.forge.replace_with(FileWatcher, "iter_changes", iter_changes)
+        self.assertEquals(shake_run.shake_run(["--watch", self.root], report_stream=NullFile()), 0)
+        self.assertEquals(self.ended, ["success", "success"])
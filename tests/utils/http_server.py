@@ -0,0 +1,62 @@
+from six.moves import BaseHTTPServer # pylint: disable=F0401
+import threading
+
+class LocalHTTPServer(object):
+    """
+    A minimal HTTP server running in a background thread, standing in for remote services in tests.
+
+    Responses are produced by ``handler(request)``, which returns a tuple of (status, headers, body).
+    All received requests are recorded in ``requests``.
+    """
+    __test__ = False # for nose
+
+    def __init__(self, handler):
+        super(LocalHTTPServer, self).__init__()
+        self.handler = handler
+        self.requests = []
+        self._server = BaseHTTPServer.HTTPServer(("127.0.0.1", 0), _make_request_handler_class(self))
+        self._thread = None
+    def get_url(self, path="/"):
+        return "http://127.0.0.1:{0}{1}".format(self._server.server_address[1], path)
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval" : 0.05})
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+class Request(object):
+    def __init__(self, method, path, headers, body):
+        super(Request, self).__init__()
+        self.method = method
+        self.path = path
+        self.headers = headers
+        self.body = body
+
+def _make_request_handler_class(server):
+    class _RequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+        def do_GET(self):
+            self._handle()
+        def do_POST(self):
+            self._handle()
+        def _handle(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            request = Request(self.command, self.path, dict(self.headers.items()), self.rfile.read(length))
+            server.requests.append(request)
+            status, headers, body = server.handler(request)
+            if not isinstance(body, bytes):
+                body = body.encode("utf-8")
+            self.send_response(status)
+            for header_name, header_value in headers.items():
+                self.send_header(header_name, header_value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        def log_message(self, *_): # pylint: disable=W0221
+            pass
+    return _RequestHandler